@@ -0,0 +1,40 @@
+"""
+Measure the NumPy batch evaluator against scalar HandEvaluator calls.
+
+Run with:
+    python -m benchmarks.bench_batch_evaluator
+"""
+import time
+
+import numpy as np
+
+from models.batch_evaluator import BatchEvaluator, shuffled_decks
+from models.card import Card
+from models.evaluator import HandEvaluator
+
+
+def run(hand_count=10_000_000, scalar_count=200_000):
+    decks = shuffled_decks(hand_count // 10, np.random.default_rng(0), include_joker=True)
+    # Ten 5-card hands per shuffled deck
+    hands = decks[:, :50].reshape(-1, 5)
+    batch = BatchEvaluator()
+    batch.evaluate(hands[:1])  # Build the tables outside the timed region
+
+    start = time.perf_counter()
+    batch.evaluate(hands)
+    batch_rate = len(hands) / (time.perf_counter() - start)
+
+    evaluate = HandEvaluator().evaluate
+    scalar_hands = [[Card.from_id(card_id) for card_id in row] for row in hands[:scalar_count].tolist()]
+    start = time.perf_counter()
+    for hand in scalar_hands:
+        evaluate(hand)
+    scalar_rate = len(scalar_hands) / (time.perf_counter() - start)
+
+    print(f"{'evaluator':<12}{'hands/sec':>16}")
+    print(f"{'scalar':<12}{scalar_rate:>16,.0f}")
+    print(f"{'batch':<12}{batch_rate:>16,.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,49 @@
+"""
+Compare scalar Game.play_game with the vectorized batch engine.
+
+Run with:
+    python -m benchmarks.bench_batch_play
+"""
+import random
+import time
+
+import numpy as np
+
+from models.batch_evaluator import shuffled_decks
+from models.batch_play import deal_hands, play_games, seeded_decks
+from models.events import NullSink
+from models.game import Game
+
+NAMES = ["Player 1", "Player 2", "Player 3", "Player 4"]
+
+
+def _scalar(games):
+    start = time.perf_counter()
+    for seed in range(games):
+        Game(NAMES, rng=random.Random(seed), sink=NullSink()).play_game()
+    return games / (time.perf_counter() - start)
+
+
+def _batch(decks):
+    start = time.perf_counter()
+    play_games(deal_hands(decks, len(NAMES)))
+    return len(decks) / (time.perf_counter() - start)
+
+
+def run():
+    scalar = _scalar(5000)
+    start = time.perf_counter()
+    decks = seeded_decks(range(20000))
+    seeded_shuffle = 20000 / (time.perf_counter() - start)
+    seeded = _batch(decks)
+    generated = _batch(shuffled_decks(200000, np.random.default_rng(0)))
+    print(f"{'engine':<40}{'games/sec':>12}{'speedup':>10}")
+    print(f"{'scalar play_game':<40}{scalar:>12,.0f}{1:>9.1f}x")
+    print(f"{'batch, seeded decks (play only)':<40}{seeded:>12,.0f}{seeded / scalar:>9.1f}x")
+    print(f"{'batch, seeded decks (incl. shuffling)':<40}{1 / (1 / seeded + 1 / seeded_shuffle):>12,.0f}"
+          f"{1 / (1 / seeded + 1 / seeded_shuffle) / scalar:>9.1f}x")
+    print(f"{'batch, NumPy-shuffled decks':<40}{generated:>12,.0f}{generated / scalar:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,40 @@
+"""
+Compare best-of-N hand evaluation against scoring every 5-card subset.
+
+``best_five`` loses to the six lookups of ``naive_best`` on 6-card hands
+(about 0.7x), so ``evaluate_best`` only uses it from ``MIN_BEST_OF_CARDS``
+(7) cards up; the 6-card row therefore shows the two paths at parity. The
+last column times ``best_five`` itself.
+
+Run with:
+    python -m benchmarks.bench_best_hand
+"""
+import random
+import timeit
+
+from models.card import STANDARD_CARDS, JOKERS
+from models.evaluator import HandEvaluator, best_five
+
+
+def _best(stmt, number, repeat=5):
+    """Return the best per-call time in nanoseconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e9
+
+
+def run(hand_count=500):
+    rng = random.Random(0)
+    evaluator = HandEvaluator()
+    evaluator.table(5)
+    cards = list(STANDARD_CARDS + JOKERS)
+
+    print(f"{'cards':<8}{'naive (ns)':>14}{'best-of (ns)':>14}{'speedup':>10}{'best_five (ns)':>16}")
+    for size in (6, 7, 8, 9):
+        hands = [rng.sample(cards, size) for _ in range(hand_count)]
+        naive = _best(lambda: [evaluator.naive_best(hand) for hand in hands], 1) / hand_count
+        direct = _best(lambda: [evaluator.evaluate_best(hand) for hand in hands], 5) / hand_count
+        masks = _best(lambda: [best_five(hand) for hand in hands], 5) / hand_count
+        print(f"{size:<8}{naive:>14.0f}{direct:>14.0f}{naive / direct:>9.1f}x{masks:>16.0f}")
+
+
+if __name__ == "__main__":
+    run()
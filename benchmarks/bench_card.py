@@ -0,0 +1,75 @@
+"""
+Compare the interned Card model against the original string-based one.
+
+Run with:
+    python -m benchmarks.bench_card
+"""
+import random
+import timeit
+
+from models.card import Card
+from models.deck import Deck
+
+
+class LegacyCard:
+    """The original Card implementation, kept here as the "before" baseline."""
+    suits = ["♣", "♦", "♥", "♠", "None"]
+    ranks = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A", "Joker"]
+    rank_values = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "10": 10, "J": 11, "Q": 12, "K": 13, "A": 14}
+
+    def __init__(self, suit, rank):
+        if suit not in LegacyCard.suits or rank not in LegacyCard.ranks:
+            raise ValueError("invalid suit or rank")
+        self.suit = suit
+        self.rank = rank
+
+    def __eq__(self, other):
+        return LegacyCard.suits.index(self.suit) == LegacyCard.suits.index(other.suit) and LegacyCard.rank_values[self.rank] == LegacyCard.rank_values[other.rank]
+
+    def __lt__(self, other):
+        suitScoreLesser = LegacyCard.suits.index(self.suit) < LegacyCard.suits.index(other.suit)
+        suitScoreEqual = LegacyCard.suits.index(self.suit) == LegacyCard.suits.index(other.suit)
+        return True if suitScoreLesser or (suitScoreEqual and LegacyCard.rank_values[self.rank] < LegacyCard.rank_values[other.rank]) else False
+
+    def __gt__(self, other):
+        suitScoreGreater = LegacyCard.suits.index(self.suit) > LegacyCard.suits.index(other.suit)
+        suitScoreEqual = LegacyCard.suits.index(self.suit) == LegacyCard.suits.index(other.suit)
+        return True if suitScoreGreater or (suitScoreEqual and LegacyCard.rank_values[self.rank] > LegacyCard.rank_values[other.rank]) else False
+
+
+def legacy_deck():
+    return [LegacyCard(suit, rank) for suit in LegacyCard.suits[:-1] for rank in LegacyCard.ranks[:-1]]
+
+
+def _best(stmt, number, repeat=5):
+    """Return the best per-call time in nanoseconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e9
+
+
+def run():
+    rng = random.Random(0)
+    legacy = legacy_deck()
+    current = Deck().cards
+    pairs = [(rng.randrange(52), rng.randrange(52)) for _ in range(1000)]
+    legacy_pairs = [(legacy[i], legacy[j]) for i, j in pairs]
+    current_pairs = [(current[i], current[j]) for i, j in pairs]
+    rng.shuffle(legacy)
+    rng.shuffle(current)
+
+    def compare(cards):
+        return lambda: [(a == b, a < b, a > b) for a, b in cards]
+
+    results = [
+        ("compare (==, <, >) x1000", _best(compare(legacy_pairs), 20), _best(compare(current_pairs), 20)),
+        ("sort 52 cards", _best(lambda: sorted(legacy), 200), _best(lambda: sorted(current), 200)),
+        ("build a deck", _best(legacy_deck, 200), _best(Deck, 200)),
+        ("Card('♠', 'A')", _best(lambda: LegacyCard("♠", "A"), 20000), _best(lambda: Card("♠", "A"), 20000)),
+    ]
+
+    print(f"{'benchmark':<28}{'before (ns)':>14}{'after (ns)':>14}{'speedup':>10}")
+    for name, before, after in results:
+        print(f"{name:<28}{before:>14.0f}{after:>14.0f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,54 @@
+"""
+Compare the list-backed Deck with the array-backed CompactDeck.
+
+Run with:
+    python -m benchmarks.bench_deck
+"""
+import random
+import timeit
+
+from models.deck import CompactDeck, Deck
+
+
+def _best(stmt, number, repeat=5):
+    """Return the best per-call time in nanoseconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e9
+
+
+def _deal(deck_class, method="draw_multiple"):
+    def deal():
+        deck = deck_class()
+        draw = getattr(deck, method)
+        for _ in range(4):
+            draw(13)
+    return deal
+
+
+def _shuffle(deck_class):
+    return deck_class(rng=random.Random(0)).shuffle
+
+
+def _return_hand(deck_class):
+    deck = deck_class(rng=random.Random(0))
+    deck.shuffle()
+
+    def return_hand():
+        deck.add_cards(deck.draw_multiple(5))
+    return return_hand
+
+
+def run():
+    results = [
+        ("build a deck", _best(Deck, 5000), _best(CompactDeck, 5000)),
+        ("shuffle", _best(_shuffle(Deck), 2000), _best(_shuffle(CompactDeck), 2000)),
+        ("build + deal 4x13 cards", _best(_deal(Deck), 2000), _best(_deal(CompactDeck), 2000)),
+        ("build + deal 4x13 id views", _best(_deal(Deck), 2000), _best(_deal(CompactDeck, "draw_ids"), 2000)),
+        ("draw and return 5 cards", _best(_return_hand(Deck), 2000), _best(_return_hand(CompactDeck), 2000)),
+    ]
+    print(f"{'benchmark':<30}{'Deck (ns)':>14}{'Compact (ns)':>14}{'speedup':>10}")
+    for name, before, after in results:
+        print(f"{name:<30}{before:>14.0f}{after:>14.0f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run()
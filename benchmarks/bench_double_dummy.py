@@ -0,0 +1,45 @@
+"""
+Measure DoubleDummySolver on 4-player deals of growing size, up to full 13-card deals.
+
+Each row solves every seat of ten seeded deals with a fresh solver and reports
+the mean and slowest time per deal, how many of the deals were solved within
+``TARGET`` seconds, the nodes searched and the transposition table hit rate.
+
+Run with:
+    python -m benchmarks.bench_double_dummy
+"""
+import random
+import time
+
+from models.card import STANDARD_CARDS
+from models.double_dummy import DoubleDummySolver
+
+DEALS = 10
+PLAYERS = 4
+# The time one deal (every seat) should take. Deals of up to nine cards a hand
+# meet it; the larger rows show how far off they are.
+TARGET = 1.0
+
+
+def run():
+    print(f"{'cards':>5}{'mean ms':>10}{'max ms':>10}{f'<= {TARGET:g}s':>8}{'nodes/deal':>12}{'hit rate':>10}")
+    for cards in range(5, 14):
+        times = []
+        nodes = lookups = hits = 0
+        for seed in range(DEALS):
+            dealt = random.Random(seed).sample(STANDARD_CARDS, PLAYERS * cards)
+            hands = [dealt[seat::PLAYERS] for seat in range(PLAYERS)]
+            solver = DoubleDummySolver()
+            start = time.perf_counter()
+            solver.solve(hands)
+            times.append(time.perf_counter() - start)
+            nodes += solver.nodes
+            lookups += solver.tt_lookups
+            hits += solver.tt_hits
+        within = f"{sum(elapsed <= TARGET for elapsed in times)}/{DEALS}"
+        print(f"{cards:>5}{sum(times) / DEALS * 1e3:>10.1f}{max(times) * 1e3:>10.1f}{within:>8}"
+              f"{nodes // DEALS:>12,}{hits / lookups:>10.1%}", flush=True)
+
+
+if __name__ == "__main__":
+    run()
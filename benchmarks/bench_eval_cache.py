@@ -0,0 +1,94 @@
+"""
+Measure the hit rate and speedup of CachedEvaluator on dealt hands.
+
+Each scenario deals hands from freshly shuffled decks, as games do, and times
+scoring them with and without the cache: first with an empty cache, then on a
+second batch of new deals once the cache is warm, as in a long simulation.
+
+Hands of up to five cards are passed straight to the evaluator's lookup
+tables and never reach the cache, so their rows show no hit rate ("table")
+and their speedup is the cost of that pass-through. The game rows time whole
+``Game.reset``, ``deal`` and ``determine_winner`` cycles, the usual way the
+cache is used, with 5-card deals (passed through) and 7-card best-of-five
+deals (cached).
+
+Run with:
+    python -m benchmarks.bench_eval_cache
+"""
+import random
+import time
+
+from models.card import STANDARD_CARDS
+from models.eval_cache import CachedEvaluator
+from models.evaluator import HandEvaluator
+from models.events import NullSink
+from models.game import Game
+
+HANDS = 100_000
+GAMES = 20_000
+
+
+def _deal(rng, size):
+    return [rng.sample(STANDARD_CARDS, size) for _ in range(HANDS)]
+
+
+def _time(function, hands):
+    start = time.perf_counter()
+    for hand in hands:
+        function(hand)
+    return (time.perf_counter() - start) / len(hands) * 1e9
+
+
+def _rate(cached):
+    # Table-sized hands bypass the cache, so they record no lookups
+    return f"{cached.hit_rate:.1%}" if cached.hits + cached.misses else "table"
+
+
+def _time_games(evaluator, cards, best_of_five, seed):
+    game = Game([f"Player {seat + 1}" for seat in range(4)], rng=random.Random(seed), sink=NullSink(),
+                best_of_five=best_of_five, evaluator=evaluator)
+    start = time.perf_counter()
+    for _ in range(GAMES):
+        game.reset()
+        game.deal(cards)
+        game.determine_winner()
+    return (time.perf_counter() - start) / GAMES * 1e9
+
+
+def run():
+    rng = random.Random(0)
+    evaluator = HandEvaluator()
+    scenarios = [
+        ("3-card hands, evaluate", _deal(rng, 3), "evaluate"),
+        ("5-card hands, evaluate", _deal(rng, 5), "evaluate"),
+        ("7-card hands, evaluate", _deal(rng, 7), "evaluate"),
+        ("7-card hands, best of five", _deal(rng, 7), "evaluate_best"),
+        ("10-card hands, best of five", _deal(rng, 10), "evaluate_best"),
+    ]
+    print(f"{'benchmark':<32}{'plain (ns)':>12}{'cold (ns)':>11}{'hit rate':>10}{'warm (ns)':>11}{'hit rate':>10}"
+          f"{'speedup':>10}")
+    for name, hands, method in scenarios:
+        getattr(evaluator, method)(hands[0])  # Build tables outside the timing
+        plain = _time(getattr(evaluator, method), hands)
+        cached = CachedEvaluator(evaluator, capacity=1 << 20)
+        cold = _time(getattr(cached, method), hands)
+        cold_rate = _rate(cached)
+        cached.hits = cached.misses = 0
+        warm = _time(getattr(cached, method), _deal(rng, len(hands[0])))
+        print(f"{name:<32}{plain:>12.0f}{cold:>11.0f}{cold_rate:>10}{warm:>11.0f}{_rate(cached):>10}"
+              f"{plain / warm:>9.1f}x")
+
+    for name, cards, best_of_five in [("4-player games, 5 cards", 5, False),
+                                      ("4-player games, 7 best of five", 7, True)]:
+        plain = _time_games(evaluator, cards, best_of_five, 1)
+        cached = CachedEvaluator(evaluator, capacity=1 << 20)
+        cold = _time_games(cached, cards, best_of_five, 1)
+        cold_rate = _rate(cached)
+        cached.hits = cached.misses = 0
+        warm = _time_games(cached, cards, best_of_five, 2)
+        print(f"{name:<32}{plain:>12.0f}{cold:>11.0f}{cold_rate:>10}{warm:>11.0f}{_rate(cached):>10}"
+              f"{plain / warm:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,67 @@
+"""
+Compare the lookup-table evaluator against the original Game.evaluate_hand.
+
+Run with:
+    python -m benchmarks.bench_evaluator
+"""
+import random
+import timeit
+
+from models.deck import Deck
+from models.evaluator import HAND_RANKINGS, HandEvaluator, reference_evaluate
+
+
+def _best_pair(before, after, rounds=25):
+    """
+    Return the best per-call times of two statements in nanoseconds.
+
+    The two are timed in alternating rounds, so a change in machine load
+    during the run affects both sides alike.
+    """
+    before_times, after_times = [], []
+    for _ in range(rounds):
+        before_times.append(min(timeit.repeat(before, number=1, repeat=2)))
+        after_times.append(min(timeit.repeat(after, number=5, repeat=2)) / 5)
+    return min(before_times) * 1e9, min(after_times) * 1e9
+
+
+def legacy_winner(hands):
+    """Pick the best hand the way Game.determine_winner used to."""
+    best_hand = best_index = best_hand_value = None
+    for index, hand in enumerate(hands):
+        hand_type, hand_value = reference_evaluate(hand)
+        if best_hand is None or HAND_RANKINGS[hand_type] > HAND_RANKINGS[best_hand]:
+            best_hand, best_index, best_hand_value = hand_type, index, hand_value
+        elif HAND_RANKINGS[hand_type] == HAND_RANKINGS[best_hand] and hand_value > best_hand_value:
+            best_hand, best_index, best_hand_value = hand_type, index, hand_value
+    return best_index
+
+
+def run(hand_count=2000, table_size=6):
+    rng = random.Random(0)
+    cards = Deck().cards
+    hands = [rng.sample(cards, 5) for _ in range(hand_count)]
+    evaluator = HandEvaluator()
+    evaluate = evaluator.evaluate
+    evaluate(hands[0])  # Load or build the table outside the timed region
+
+    def new_winner(table):
+        strengths = evaluator.evaluate_hands(table)
+        return strengths.index(max(strengths))
+
+    before, after = _best_pair(lambda: [reference_evaluate(hand) for hand in hands],
+                               lambda: [evaluate(hand) for hand in hands])
+    before, after = before / hand_count, after / hand_count
+
+    tables = [hands[i:i + table_size] for i in range(0, hand_count, table_size)]
+    winner_before, winner_after = _best_pair(lambda: [legacy_winner(table) for table in tables],
+                                             lambda: [new_winner(table) for table in tables])
+    winner_before, winner_after = winner_before / len(tables), winner_after / len(tables)
+
+    print(f"{'benchmark':<28}{'before (ns)':>14}{'after (ns)':>14}{'speedup':>10}")
+    print(f"{'evaluate 5-card hand':<28}{before:>14.0f}{after:>14.0f}{before / after:>9.1f}x")
+    print(f"{f'winner of {table_size} hands':<28}{winner_before:>14.0f}{winner_after:>14.0f}{winner_before / winner_after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    run()
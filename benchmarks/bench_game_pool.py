@@ -0,0 +1,81 @@
+"""
+Compare building a new Game per deal with resetting one pooled Game.
+
+For each mode the benchmark reports the time per game and, under tracemalloc,
+what setting a game up allocates: the memory blocks still held once the next
+game is ready, and the peak bytes allocated while setting it up.
+
+Run with:
+    python -m benchmarks.bench_game_pool
+"""
+import random
+import time
+import tracemalloc
+
+from models.events import NullSink
+from models.game import Game
+
+NAMES = ["Player 1", "Player 2", "Player 3", "Player 4"]
+GAMES = 20000
+TRACED_GAMES = 500
+
+
+def _fresh(rng, sink):
+    return lambda game: Game(NAMES, rng=rng, sink=sink)
+
+
+def _pooled(rng, sink):
+    def reset(game):
+        game.reset()
+        return game
+    return reset
+
+
+def _time(setup, rng, sink, play):
+    game = Game(NAMES, rng=rng, sink=sink)
+    start = time.perf_counter()
+    for _ in range(GAMES):
+        game = setup(game)
+        play(game)
+    return (time.perf_counter() - start) / GAMES * 1e6
+
+
+def _allocations(setup, rng, sink, play):
+    """Return the blocks held and peak bytes allocated per game setup."""
+    game = Game(NAMES, rng=rng, sink=sink)
+    play(game)
+    setup(game)  # Warm up free lists and internal buffers
+    games = []
+    peak = 0
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    for _ in range(TRACED_GAMES):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        game = setup(game)
+        peak += tracemalloc.get_traced_memory()[1] - current
+        games.append(game)  # Keep every game alive so the snapshot counts what each one holds
+        play(game)
+    after = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return blocks / TRACED_GAMES, peak / TRACED_GAMES
+
+
+def run():
+    workloads = {
+        "deal 5 + score": lambda game: (game.deal(5), game.score_hands()),
+        "play_game": lambda game: game.play_game(),
+    }
+    print(f"{'workload':<16}{'mode':<8}{'us/game':>10}{'blocks/game':>13}{'peak B/game':>13}")
+    for workload, play in workloads.items():
+        for mode, make in (("fresh", _fresh), ("pooled", _pooled)):
+            rng = random.Random(0)
+            sink = NullSink()
+            micros = _time(make(rng, sink), rng, sink, play)
+            blocks, peak = _allocations(make(rng, sink), rng, sink, play)
+            print(f"{workload:<16}{mode:<8}{micros:>10.1f}{blocks:>13.1f}{peak:>13,.0f}")
+
+
+if __name__ == "__main__":
+    run()
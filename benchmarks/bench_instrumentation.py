@@ -0,0 +1,50 @@
+"""
+Measure what instrumentation costs per game, installed and after uninstalling.
+
+Run with:
+    python -m benchmarks.bench_instrumentation
+"""
+import random
+import timeit
+
+from models.events import NullSink
+from models.game import Game
+from models.instrumentation import Instrumentation
+
+NAMES = ["Player 1", "Player 2", "Player 3", "Player 4"]
+
+
+def _best(stmt, number, repeat=5):
+    """Return the best per-call time in microseconds."""
+    return min(timeit.repeat(stmt, number=number, repeat=repeat)) / number * 1e6
+
+
+def run(games=2000):
+    game = Game(NAMES, rng=random.Random(0), sink=NullSink())
+
+    def play():
+        game.reset()
+        game.play_game()
+
+    def deal():
+        game.reset()
+        game.deal(5)
+        game.determine_winner()
+
+    print(f"{'mode':<34}{'play_game (us)':>16}{'deal+winner (us)':>18}")
+    rows = [("never installed", None)]
+    rows.append(("installed", Instrumentation()))
+    rows.append(("installed + profiler (1 ms)", Instrumentation(profile_interval=0.001)))
+    rows.append(("uninstalled again", None))
+    for mode, metrics in rows:
+        if metrics is not None:
+            metrics.install()
+        try:
+            print(f"{mode:<34}{_best(play, games // 10):>16.1f}{_best(deal, games):>18.1f}")
+        finally:
+            if metrics is not None:
+                metrics.uninstall()
+
+
+if __name__ == "__main__":
+    run()
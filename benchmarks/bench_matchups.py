@@ -0,0 +1,77 @@
+"""
+Query the precomputed 3-card matchup table against counting a matchup directly.
+
+The direct count scores every pair of disjoint hands from the two classes with
+``HandEvaluator``, which is what answering a matchup costs without the table.
+The table is built into a temporary directory first (a few seconds).
+
+Run with:
+    python -m benchmarks.bench_matchups
+"""
+import os
+import random
+import tempfile
+import time
+import timeit
+
+from models.card import Card
+from models.evaluator import HandEvaluator
+from models.matchups import MatchupTable, build
+
+NUMBER = 20000
+
+
+def _direct(table, first, second, evaluator):
+    members = {first: [], second: []}
+    for hand in _all_hands():
+        index = table.hand_class(hand)
+        if index in members:
+            members[index].append((hand, evaluator.evaluate(hand)))
+    wins = ties = losses = 0
+    for hand, strength in members[first]:
+        for other, other_strength in members[second]:
+            if not set(hand) & set(other):
+                wins += strength > other_strength
+                ties += strength == other_strength
+                losses += strength < other_strength
+    return wins, ties, losses
+
+
+def _all_hands():
+    for high in range(52):
+        for middle in range(high):
+            for low in range(middle):
+                yield [Card.from_id(low), Card.from_id(middle), Card.from_id(high)]
+
+
+def run():
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        path = build(os.path.join(directory, "matchups.bin"), workers=os.cpu_count() or 1)
+        print(f"build: {time.perf_counter() - start:.2f}s, {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+
+        start = time.perf_counter()
+        table = MatchupTable(path)
+        print(f"open: {(time.perf_counter() - start) * 1e6:.0f}us")
+        rng = random.Random(0)
+        deck = [Card.from_id(card_id) for card_id in range(52)]
+        pairs = []
+        while len(pairs) < 100:
+            cards = rng.sample(deck, 6)
+            pairs.append((cards[:3], cards[3:]))
+        queries = iter(pairs * (NUMBER // len(pairs) + 1))
+        seconds = timeit.timeit(lambda: table.matchup(*next(queries)), number=NUMBER)
+        print(f"matchup: {seconds / NUMBER * 1e6:.2f}us per query")
+        seconds = timeit.timeit(lambda: table.against_random(pairs[0][0]), number=NUMBER // 10)
+        print(f"against_random: {seconds / (NUMBER // 10) * 1e6:.1f}us per query")
+
+        first, second = (table.hand_class(hand) for hand in pairs[0])
+        start = time.perf_counter()
+        counts = _direct(table, first, second, HandEvaluator())
+        print(f"direct count: {(time.perf_counter() - start) * 1e3:.0f}ms")
+        assert counts == table.counts(first, second)
+        table.close()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,49 @@
+"""
+Measure the results pipeline's throughput and show that its memory stays flat.
+
+For growing numbers of games the benchmark streams every record through the
+aggregation stages and the columnar writer, and reports records per second
+and the peak memory traced by tracemalloc. The peak should not grow with the
+number of games.
+
+Run with:
+    python -m benchmarks.bench_pipeline
+"""
+import tempfile
+import time
+import tracemalloc
+
+from models.pipeline import (ColumnarWriter, HandFrequencies, QuantileSketch, RunningMoments, SeatWinRates,
+                             game_results, run_pipeline)
+
+GAMES = (1000, 10000, 50000)
+
+
+def _stages():
+    return [HandFrequencies(), SeatWinRates(4), RunningMoments("tiebreak"), QuantileSketch("tiebreak")]
+
+
+def _run(games, traced):
+    with tempfile.TemporaryDirectory() as directory:
+        with ColumnarWriter(directory, batch_size=8192) as writer:
+            if traced:
+                tracemalloc.start()
+            start = time.perf_counter()
+            records = run_pipeline(game_results(games, seed=0), *_stages(), writer)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if traced else 0
+            tracemalloc.stop()
+    return records, elapsed, peak
+
+
+def run():
+    _run(100, False)  # Load the evaluator tables
+    print(f"{'games':>8}{'records/s':>12}{'peak KiB':>10}")
+    for games in GAMES:
+        records, elapsed, _ = _run(games, False)
+        _, _, peak = _run(games, True)
+        print(f"{games:>8}{records / elapsed:>12,.0f}{peak / 1024:>10,.0f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,44 @@
+"""
+Rank very large fields: one 5-card hand for each of up to 100,000 seats, dealt from a Shoe.
+
+Compares ``determine_winner`` (per-player scoring, one winner) with
+``Game.rank`` (batched scoring) followed by a top-10 leaderboard and every
+seat's place and percentile.
+
+Run with:
+    python -m benchmarks.bench_ranking
+"""
+import random
+import time
+
+from models.events import NullSink
+from models.game import Game
+
+CARDS = 5
+FIELDS = (1000, 10000, 100000)
+
+
+def _time(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1e3
+
+
+def run():
+    print(f"{'seats':>8}{'deal (ms)':>11}{'winner (ms)':>13}{'rank (ms)':>11}{'top 10 (ms)':>13}"
+          f"{'standings (ms)':>16}")
+    for seats in FIELDS:
+        decks = -(-seats * CARDS // 52)
+        game = Game([f"Player {seat}" for seat in range(seats)], rng=random.Random(0), decks=decks,
+                    penetration=1.0, sink=NullSink())
+        _, dealing = _time(lambda: game.deal(CARDS))
+        game.evaluator.table(CARDS)  # Build or load the table outside the timings
+        _, winner = _time(game.determine_winner)
+        ranking, ranking_time = _time(game.rank)
+        _, top = _time(lambda: ranking.top(10))
+        _, standings = _time(ranking.standings)
+        print(f"{seats:>8}{dealing:>11.1f}{winner:>13.1f}{ranking_time:>11.1f}{top:>13.1f}{standings:>16.1f}")
+
+
+if __name__ == "__main__":
+    run()
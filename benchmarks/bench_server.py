@@ -0,0 +1,48 @@
+"""
+Load-test the game server over TCP and a Unix socket at several pipeline depths.
+
+The server runs in this process, so the figures include the load generator's
+own work; run ``python -m models.server serve`` and ``python -m models.server
+load`` in separate processes to measure the server alone.
+
+Run with:
+    python -m benchmarks.bench_server
+"""
+import asyncio
+import os
+import tempfile
+
+from models.server import GameClient, GameServer, run_load
+
+REQUESTS = 20000
+CONNECTIONS = 4
+DEPTHS = (1, 8, 64)
+
+
+async def _measure(transport, depth):
+    server = GameServer(workers=0)
+    with tempfile.TemporaryDirectory() as directory:
+        if transport == "unix":
+            path = os.path.join(directory, "server.sock")
+            await server.start_unix(path)
+            connect = lambda: GameClient.connect_unix(path)
+        else:
+            await server.start(port=0)
+            connect = lambda: GameClient.connect(*server.address)
+        try:
+            return await run_load(connect, connections=CONNECTIONS, depth=depth, requests=REQUESTS)
+        finally:
+            await server.close()
+
+
+def run():
+    print(f"{'transport':<11}{'depth':>6}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+    for transport in ("tcp", "unix"):
+        for depth in DEPTHS:
+            report = asyncio.run(_measure(transport, depth))
+            print(f"{transport:<11}{depth:>6}{report['requests_per_second']:>10,.0f}{report['p50_ms']:>10.3f}"
+                  f"{report['p99_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,53 @@
+"""
+Compare a lazily permuted Shoe with shuffling a materialized list of several decks.
+
+Each case reshuffles and deals a number of cards: the list baseline builds and
+shuffles every card of the shoe up front, the Shoe resets its counts and only
+draws the cards it deals. A drawn card costs the Shoe more than popping a
+shuffled list, so the Shoe wins when a deal uses a fraction of the shoe and
+loses when it deals nearly all of it.
+
+Run with:
+    python -m benchmarks.bench_shoe
+"""
+import random
+import timeit
+
+from models.card import STANDARD_CARDS
+from models.deck import Shoe
+
+REPEAT = 5
+NUMBER = 200
+
+
+def _best(function):
+    return min(timeit.repeat(function, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e6
+
+
+def run():
+    print(f"{'decks':>6}{'cards dealt':>13}{'list (us)':>11}{'shoe draw (us)':>16}{'shoe multiple (us)':>20}")
+    for decks in (1, 2, 6, 8):
+        for deal in (20, decks * 52 - 16):
+            rng = random.Random(0)
+
+            def materialized():
+                cards = list(STANDARD_CARDS) * decks
+                rng.shuffle(cards)
+                return [cards.pop() for _ in range(deal)]
+
+            shoe = Shoe(decks, rng=random.Random(0))
+
+            def lazy_draw():
+                shoe.refill()
+                return [shoe.draw() for _ in range(deal)]
+
+            def lazy_multiple():
+                shoe.refill()
+                return shoe.draw_multiple(deal)
+
+            print(f"{decks:>6}{deal:>13}{_best(materialized):>11.1f}{_best(lazy_draw):>16.1f}"
+                  f"{_best(lazy_multiple):>20.1f}")
+
+
+if __name__ == "__main__":
+    run()
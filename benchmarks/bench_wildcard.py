@@ -0,0 +1,50 @@
+"""
+Compare scoring hands with wild Jokers by table lookup and by brute-force substitution.
+
+Hands of three to five cards hold one or two Jokers. The table column times
+``WildcardEvaluator.evaluate``, the brute-force column tries every standard
+card for every Joker, and the original column is the default evaluator, which
+only lets a Joker fill a straight.
+
+Run with:
+    python -m benchmarks.bench_wildcard
+"""
+import random
+import time
+
+from models.card import STANDARD_CARDS, JOKERS
+from models.evaluator import HandEvaluator
+from models.wildcard import WildcardEvaluator, brute_force_evaluate
+
+HANDS = 20_000
+BRUTE_FORCE_HANDS = 200
+
+
+def _deal(rng, size, jokers, count):
+    return [rng.sample(STANDARD_CARDS, size - jokers) + list(JOKERS[:jokers]) for _ in range(count)]
+
+
+def _time(function, hands):
+    start = time.perf_counter()
+    for hand in hands:
+        function(hand)
+    return (time.perf_counter() - start) / len(hands) * 1e9
+
+
+def run():
+    rng = random.Random(0)
+    original = HandEvaluator()
+    wildcard = WildcardEvaluator()
+    print(f"{'hands':<24}{'original (ns)':>15}{'table (ns)':>12}{'brute force (ns)':>18}")
+    for size in (3, 5):
+        for jokers in (1, 2):
+            hands = _deal(rng, size, jokers, HANDS)
+            original.evaluate(hands[0])  # Build tables outside the timing
+            wildcard.evaluate(hands[0])
+            print(f"{f'{size} cards, {jokers} Joker(s)':<24}{_time(original.evaluate, hands):>15,.0f}"
+                  f"{_time(wildcard.evaluate, hands):>12,.0f}"
+                  f"{_time(brute_force_evaluate, hands[:BRUTE_FORCE_HANDS]):>18,.0f}")
+
+
+if __name__ == "__main__":
+    run()
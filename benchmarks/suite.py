@@ -0,0 +1,290 @@
+"""
+The core benchmark suite, with stored results and a regression check.
+
+``run`` times every benchmark and writes the results as JSON, together with
+the Python build and machine they were measured on. ``compare`` checks a
+results file against a baseline (``benchmarks/baseline.json`` by default) and
+exits with status 1 when any benchmark got slower than the threshold allows.
+
+Run with:
+    python -m benchmarks.suite run --output results.json
+    python -m benchmarks.suite compare results.json --threshold 0.25
+
+Refresh the committed baseline, on the machine the gate runs on, with:
+    python -m benchmarks.suite run --output benchmarks/baseline.json
+
+Each benchmark is timed with ``timeit``: the call count is calibrated to take
+at least ``MIN_TIME`` seconds, the timing is repeated ``REPEAT`` times (in turn
+with the other benchmarks), and the best repeat is the reported time per call.
+The median is stored as well, to show how noisy the run was.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+
+from models.card import Card, JOKERS
+from models.deck import Deck
+from models.events import NullSink
+from models.game import Game
+from models.wildcard import WildcardEvaluator
+
+RESULTS_FORMAT = 1
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+REPEAT = 7
+MIN_TIME = 0.1
+# A pure-Python loop timed with every run; ``compare --normalize`` divides by it.
+REFERENCE = "reference.python_loop"
+
+# One 5-card hand per category, as (suit, rank) pairs.
+CATEGORY_HANDS = {
+    "Straight Flush": [("♥", "9"), ("♥", "10"), ("♥", "J"), ("♥", "Q"), ("♥", "K")],
+    "Four of a Kind": [("♣", "7"), ("♦", "7"), ("♥", "7"), ("♠", "7"), ("♠", "2")],
+    "Full House": [("♣", "Q"), ("♦", "Q"), ("♥", "Q"), ("♠", "4"), ("♦", "4")],
+    "Flush": [("♦", "2"), ("♦", "6"), ("♦", "9"), ("♦", "J"), ("♦", "K")],
+    "Straight": [("♣", "5"), ("♦", "6"), ("♥", "7"), ("♠", "8"), ("♣", "9")],
+    "Three of a Kind": [("♣", "3"), ("♦", "3"), ("♥", "3"), ("♠", "9"), ("♣", "K")],
+    "Two Pair": [("♣", "J"), ("♦", "J"), ("♥", "5"), ("♠", "5"), ("♣", "A")],
+    "One Pair": [("♣", "10"), ("♦", "10"), ("♥", "2"), ("♠", "7"), ("♣", "Q")],
+    "High Card": [("♣", "2"), ("♦", "5"), ("♥", "8"), ("♠", "J"), ("♣", "K")],
+}
+
+
+def _game(players: int, rng):
+    return Game([f"Player {seat + 1}" for seat in range(players)], rng=rng, sink=NullSink())
+
+
+def benchmarks():
+    """
+    Return every benchmark as a dict from name to a zero-argument callable.
+
+    Inputs are built here, outside the timed calls, from fixed seeds.
+    """
+    rng = random.Random(0)
+    cards = Deck().cards
+    pairs = [(cards[rng.randrange(52)], cards[rng.randrange(52)]) for _ in range(1000)]
+    deck = Deck(rng=random.Random(1))
+
+    def draw_multiple():
+        deck.reset()
+        return deck.draw_multiple(20)
+
+    cases = {
+        "card.compare[x1000]": lambda: [(a == b, a < b, a > b) for a, b in pairs],
+        "card.sort[52]": lambda: sorted(cards),
+        "deck.construct": Deck,
+        "deck.shuffle": deck.shuffle,
+        "deck.reset+draw_multiple[20]": draw_multiple,
+    }
+
+    dealing = _game(4, random.Random(2))
+
+    def deal():
+        dealing.reset()
+        dealing.deal(5)
+
+    cases["game.reset+deal[4x5]"] = deal
+
+    evaluator_game = _game(2, random.Random(3))
+    hands = {name: [Card(suit, rank) for suit, rank in hand] for name, hand in CATEGORY_HANDS.items()}
+    evaluator_game.evaluate_hand(hands["High Card"])  # Load the 5-card tables outside the timed calls
+    for name, hand in hands.items():
+        cases[f"evaluate_hand[{name}]"] = lambda hand=hand: evaluator_game.evaluate_hand(hand)
+    # Two Pair plus a wild Joker, scored by the wildcard rules (a Full House).
+    wild_game = Game(["Player 1", "Player 2"], include_joker=True, rng=random.Random(3), sink=NullSink(),
+                     evaluator=WildcardEvaluator())
+    wild_hand = hands["Two Pair"][:4] + [JOKERS[0]]
+    wild_game.evaluate_hand(wild_hand)
+    cases["evaluate_hand[Wildcard Hand]"] = lambda: wild_game.evaluate_hand(wild_hand)
+
+    for players in range(2, 11):
+        game = _game(players, random.Random(players))
+        game.deal(5)
+        cases[f"determine_winner[{players} players]"] = game.determine_winner
+
+    playing = _game(4, random.Random(4))
+
+    def play_game():
+        playing.reset()
+        playing.play_game()
+
+    cases["game.reset+play_game[4 players]"] = play_game
+    return cases
+
+
+def _calibrate(timer):
+    """Return how many calls take at least ``MIN_TIME`` seconds."""
+    number = 1
+    while timer.timeit(number) < MIN_TIME:
+        number *= 2
+    return number
+
+
+def _reference():
+    """A fixed pure-Python workload that tracks the speed of the machine and interpreter."""
+    total = 0
+    for value in range(1000):
+        total += value * value % 7
+    return total
+
+
+def environment():
+    """Return a description of the interpreter and machine the benchmarks ran on."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "compiler": platform.python_compiler(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def run_suite(names=None):
+    """
+    Time the benchmarks.
+
+    Args:
+        names (list[str], optional): Only run benchmarks whose name contains one of these strings.
+            Defaults to every benchmark.
+
+    Returns:
+        dict: The results document, with ``format``, ``environment`` and ``results``.
+    """
+    cases = {name: function for name, function in benchmarks().items()
+             if not names or any(part in name for part in names)}
+    cases[REFERENCE] = _reference
+    # Run everything once first, so that no calibration pays for building tables or caches.
+    for function in cases.values():
+        function()
+    timers = {name: timeit.Timer(function) for name, function in cases.items()}
+    numbers = {name: _calibrate(timer) for name, timer in timers.items()}
+    # Repeats are interleaved so that a change in machine load affects every benchmark alike.
+    times = {name: [] for name in cases}
+    for _ in range(REPEAT):
+        for name, timer in timers.items():
+            times[name].append(timer.timeit(numbers[name]) / numbers[name] * 1e9)
+    results = {}
+    for name, samples in times.items():
+        results[name] = {"best_ns": round(min(samples), 1), "median_ns": round(statistics.median(samples), 1),
+                         "number": numbers[name], "repeat": REPEAT}
+    return {"format": RESULTS_FORMAT, "environment": environment(), "results": results}
+
+
+def compare_results(current: dict, baseline: dict, threshold=DEFAULT_THRESHOLD, normalize=False):
+    """
+    Compare two results documents benchmark by benchmark.
+
+    Args:
+        current (dict): The new results.
+        baseline (dict): The results to compare against.
+        threshold (float, optional): The allowed slowdown as a fraction: 0.25 flags a benchmark
+            whose best time grew by more than 25%. Defaults to 0.25.
+        normalize (bool, optional): Scale the current times by how much the reference loop
+            sped up or slowed down, to compare results from machines of different speeds.
+            Defaults to False.
+
+    Returns:
+        list[tuple]: One ``(name, baseline_ns, current_ns, ratio, status)`` row per benchmark,
+        where status is ``"regression"``, ``"improvement"``, ``"ok"``, ``"new"`` or ``"missing"``.
+    """
+    rows = []
+    old = baseline["results"]
+    new = current["results"]
+    scale = 1.0
+    if normalize:
+        if REFERENCE not in old or REFERENCE not in new:
+            raise ValueError("both results need the reference benchmark to normalize")
+        scale = old[REFERENCE]["best_ns"] / new[REFERENCE]["best_ns"]
+    for name in list(old) + [name for name in new if name not in old]:
+        before = old[name]["best_ns"] if name in old else None
+        after = new[name]["best_ns"] * scale if name in new else None
+        if before is None:
+            rows.append((name, None, after, None, "new"))
+        elif after is None:
+            rows.append((name, before, None, None, "missing"))
+        else:
+            ratio = after / before
+            status = ("regression" if ratio > 1 + threshold
+                      else "improvement" if ratio < 1 / (1 + threshold) else "ok")
+            rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as file:
+        document = json.load(file)
+    if document.get("format") != RESULTS_FORMAT:
+        raise ValueError(f"{path} is not a results file of format {RESULTS_FORMAT}")
+    return document
+
+
+def _print_results(document):
+    print(f"{'benchmark':<40}{'best (ns)':>14}{'median (ns)':>14}")
+    for name, result in document["results"].items():
+        print(f"{name:<40}{result['best_ns']:>14,.0f}{result['median_ns']:>14,.0f}")
+
+
+def _print_comparison(rows):
+    print(f"{'benchmark':<40}{'baseline (ns)':>14}{'current (ns)':>14}{'ratio':>8}  status")
+    for name, before, after, ratio, status in rows:
+        before = f"{before:,.0f}" if before is not None else "-"
+        after = f"{after:,.0f}" if after is not None else "-"
+        ratio = f"{ratio:.2f}" if ratio is not None else "-"
+        print(f"{name:<40}{before:>14}{after:>14}{ratio:>8}  {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite or compare results against a baseline.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="time every benchmark")
+    run_parser.add_argument("--output", help="write the results as JSON to this file")
+    run_parser.add_argument("--filter", action="append", help="only run benchmarks whose name contains this")
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("results", help="a results file written by 'run'")
+    compare_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="allowed slowdown as a fraction (default: %(default)s)")
+    compare_parser.add_argument("--normalize", action="store_true",
+                                help="scale by the reference loop, for results from different machines")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        document = run_suite(args.filter)
+        _print_results(document)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(document, file, indent=2, ensure_ascii=False)
+                file.write("\n")
+        return 0
+
+    current = _load(args.results)
+    baseline = _load(args.baseline)
+    if current["environment"].get("python") != baseline["environment"].get("python"):
+        print("warning: the results and the baseline come from different Python versions", file=sys.stderr)
+    rows = compare_results(current, baseline, args.threshold, args.normalize)
+    _print_comparison(rows)
+    regressions = [row for row in rows if row[4] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+import sys
+
+from models.simulate import main
+
+sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Vectorized hand evaluation for large batches of hands.
+
+``BatchEvaluator`` scores an ``(N, k)`` array of card ids (see ``Card.id``) with
+NumPy array operations only. Each row is reduced to two small integers:
+
+    - A rank-multiset index: the row's ranks (Jokers counted as a fourteenth
+      rank) are sorted with a compare-exchange network and ranked in the
+      combinatorial number system, which numbers every multiset of ``k`` ranks
+      densely from zero.
+    - A flush flag: the OR of one suit bit per non-Joker card has exactly one
+      bit set.
+
+Those two values index dense category and tie-break arrays that are filled
+from ``HandEvaluator``, so batch results always agree with the scalar
+evaluator. Rows that cannot come from a single deck (five of a rank, three
+Jokers) are scored one at a time with ``HandEvaluator``.
+
+Hands hold from one to ``MAX_TABLE_CARDS`` (five) cards, the sizes the lookup
+tables cover; ``evaluate`` rejects wider arrays with ``ValueError``. Score
+larger hands with ``HandEvaluator.evaluate`` or ``Game.evaluate_hand``, whose
+full strengths do not fit the 28-bit tie-break scores used here.
+
+This module requires NumPy.
+"""
+import itertools
+from math import comb
+
+import numpy as np
+
+from models.card import Card, STANDARD_CARDS, JOKERS
+from models.evaluator import HandEvaluator, MAX_TABLE_CARDS, TIEBREAK_BITS, VALUE_BITS
+
+# Tie-break scores hold the first seven values of a strength, four bits each.
+# That covers every hand of up to five cards: the longest is Two Pair, whose
+# values are both pairs followed by all five ranks again.
+BATCH_TIEBREAK_SLOTS = 7
+_TIEBREAK_SHIFT = TIEBREAK_BITS - VALUE_BITS * BATCH_TIEBREAK_SLOTS
+_TIEBREAK_MASK = (1 << VALUE_BITS * BATCH_TIEBREAK_SLOTS) - 1
+
+ALL_CARDS = STANDARD_CARDS + JOKERS
+JOKER_SYMBOL = 13
+# Rank symbol (0..12, Jokers 13) and suit bit (Jokers 0) for each card id.
+RANK_SYMBOLS = np.array([JOKER_SYMBOL if card.rank == "Joker" else card.value - 2 for card in ALL_CARDS], dtype=np.int8)
+SUIT_BITS = np.array([0 if card.rank == "Joker" else 1 << card.suit_index for card in ALL_CARDS], dtype=np.int8)
+# BINOMIALS[n, r] == comb(n, r), large enough for any hand in the tables.
+BINOMIALS = np.array([[comb(n, r) for r in range(MAX_TABLE_CARDS + 1)]
+                      for n in range(JOKER_SYMBOL + MAX_TABLE_CARDS + 1)], dtype=np.intp)
+CHUNK_ROWS = 1 << 15
+
+
+def split_strength(strength: int):
+    """
+    Split a scalar strength into the ``(category, tiebreak)`` pair used by batches.
+
+    Args:
+        strength (int): A strength from ``HandEvaluator.evaluate`` for a hand of at most five cards.
+
+    Returns:
+        tuple[int, int]: The hand category and the tie-break score.
+    """
+    return strength >> TIEBREAK_BITS, strength >> _TIEBREAK_SHIFT & _TIEBREAK_MASK
+
+
+def _sort_columns(columns: list):
+    """Sort a list of equal-length arrays element-wise with odd-even transposition."""
+    size = len(columns)
+    for step in range(size):
+        for i in range(step % 2, size - 1, 2):
+            low = np.minimum(columns[i], columns[i + 1])
+            columns[i + 1] = np.maximum(columns[i], columns[i + 1])
+            columns[i] = low
+    return columns
+
+
+class BatchEvaluator:
+    """
+    Score many hands of the same size at once.
+
+    The dense lookup arrays for each hand size are built from the scalar
+    evaluator on first use and shared by every instance.
+    """
+
+    _tables = {}
+
+    def __init__(self, evaluator: HandEvaluator = None):
+        """
+        Initialize a BatchEvaluator.
+
+        Args:
+            evaluator (HandEvaluator, optional): The scalar evaluator to agree with. Defaults to a new HandEvaluator.
+        """
+        self.evaluator = evaluator if evaluator is not None else HandEvaluator()
+
+    def table(self, size: int):
+        """
+        Return the ``(categories, tiebreaks)`` lookup arrays for the given hand size.
+
+        Both arrays have shape ``(2, comb(14 + size - 1, size))``; the first axis
+        is the flush flag and the second the rank-multiset index. Entries for
+        multisets that cannot be dealt from one deck have category -1.
+        """
+        if size in BatchEvaluator._tables:
+            return BatchEvaluator._tables[size]
+        width = comb(JOKER_SYMBOL + size, size)
+        categories = np.full((2, width), -1, dtype=np.int8)
+        tiebreaks = np.zeros((2, width), dtype=np.int32)
+        for symbols in itertools.combinations_with_replacement(range(JOKER_SYMBOL + 1), size):
+            index = sum(comb(symbol + i, i + 1) for i, symbol in enumerate(symbols))
+            counts = [symbols.count(symbol) for symbol in set(symbols)]
+            if max(counts) > 4 or symbols.count(JOKER_SYMBOL) > len(JOKERS):
+                continue
+            ranks = [symbol for symbol in symbols if symbol != JOKER_SYMBOL]
+            jokers = list(JOKERS[:size - len(ranks)])
+            seen = {}
+            mixed = []
+            for rank in ranks:
+                mixed.append(STANDARD_CARDS[seen.get(rank, 0) * 13 + rank])
+                seen[rank] = seen.get(rank, 0) + 1
+            if len(mixed) > 1 and all(card.suit_index == 0 for card in mixed):
+                mixed[-1] = STANDARD_CARDS[13 + ranks[-1]]
+            hands = [(0, mixed + jokers)]
+            if len(set(ranks)) == len(ranks) and ranks:
+                hands.append((1, [STANDARD_CARDS[rank] for rank in ranks] + jokers))
+            for flush, hand in hands:
+                categories[flush, index], tiebreaks[flush, index] = split_strength(self.evaluator.evaluate(hand))
+        BatchEvaluator._tables[size] = (categories, tiebreaks)
+        return categories, tiebreaks
+
+    def evaluate(self, card_ids):
+        """
+        Score a batch of hands.
+
+        Args:
+            card_ids (array-like): An ``(N, k)`` integer array of card ids with ``1 <= k <= 5``.
+
+        Returns:
+            tuple[numpy.ndarray, numpy.ndarray]: The ``(N,)`` hand categories (values of
+            ``models.evaluator.HAND_RANKINGS``) and the ``(N,)`` tie-break scores. Hands compare by category,
+            then by tie-break score.
+
+        Raises:
+            ValueError: If the array is not two-dimensional or ``k`` is out of range.
+        """
+        card_ids = np.asarray(card_ids)
+        if card_ids.ndim != 2 or not 1 <= card_ids.shape[1] <= MAX_TABLE_CARDS:
+            raise ValueError(f"expected an (N, k) array with 1 <= k <= {MAX_TABLE_CARDS}")
+        size = card_ids.shape[1]
+        categories, tiebreaks = self.table(size)
+        categories, tiebreaks = categories.T.ravel(), tiebreaks.T.ravel()
+        binomials = [BINOMIALS[i:, i + 1] * 2 for i in range(size)]
+
+        result_categories = np.empty(len(card_ids), dtype=np.int8)
+        result_tiebreaks = np.empty(len(card_ids), dtype=np.int32)
+        # Work in cache-sized chunks; the temporaries stay small and hot.
+        for start in range(0, len(card_ids), CHUNK_ROWS):
+            chunk = card_ids[start:start + CHUNK_ROWS].astype(np.intp)
+            columns = [chunk[:, i] for i in range(size)]
+            symbols = _sort_columns([RANK_SYMBOLS.take(column) for column in columns])
+            suits = SUIT_BITS.take(columns[0])
+            for column in columns[1:]:
+                suits |= SUIT_BITS.take(column)
+            # Index into the flattened tables: multiset index * 2 + flush flag
+            index = ((suits & (suits - 1)) == 0) & (suits != 0)
+            index = index.astype(np.intp)
+            for binomial, column in zip(binomials, symbols):
+                index += binomial.take(column)
+            categories.take(index, out=result_categories[start:start + CHUNK_ROWS])
+            tiebreaks.take(index, out=result_tiebreaks[start:start + CHUNK_ROWS])
+
+        for row in np.flatnonzero(result_categories < 0):
+            strength = self.evaluator.evaluate([Card.from_id(card_id) for card_id in card_ids[row]])
+            result_categories[row], result_tiebreaks[row] = split_strength(strength)
+        return result_categories, result_tiebreaks
+
+
+def shuffled_decks(count: int, rng: np.random.Generator = None, include_joker=False):
+    """
+    Return ``count`` independently shuffled decks as an array of card ids.
+
+    Args:
+        count (int): The number of decks.
+        rng (numpy.random.Generator, optional): The random generator. Defaults to ``numpy.random.default_rng()``.
+        include_joker (bool, optional): Include the two Jokers. Defaults to False.
+
+    Returns:
+        numpy.ndarray: A ``(count, 52)`` or ``(count, 54)`` array of card ids.
+    """
+    rng = rng or np.random.default_rng()
+    deck_size = len(ALL_CARDS) if include_joker else len(STANDARD_CARDS)
+    return rng.random((count, deck_size)).argsort(axis=1).astype(np.int8)
+
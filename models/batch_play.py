@@ -0,0 +1,169 @@
+"""
+Vectorized trick-taking for large batches of ``Game.play_game`` simulations.
+
+Every game in a batch is one row of a ``(games, players, cards)`` array of
+card ids, in the order each player received them. Each step of a round plays
+one seat in every game at once, with the same rules as the scalar engine:
+
+    - The leader plays the first card left in their hand.
+    - Everyone else plays the first card they received in the leading suit, or
+      the first card left in their hand if they have none (``Player.play``).
+    - The highest card in the leading suit wins, and its player leads the next
+      round (``Game.determine_round_winner``).
+
+Padding slots (ids of -1) mark hands that received fewer cards when the deck
+does not divide evenly between the players.
+
+This module requires NumPy.
+"""
+import random
+from typing import NamedTuple
+
+import numpy as np
+
+from models.card import Card, STANDARD_CARDS, JOKERS
+
+ALL_CARDS = STANDARD_CARDS + JOKERS
+# Suit index and rank value for each card id, with a trailing entry for padding.
+CARD_SUITS = np.array([card.suit_index for card in ALL_CARDS] + [-1], dtype=np.int8)
+CARD_VALUES = np.array([card.value for card in ALL_CARDS] + [-1], dtype=np.int8)
+CHUNK_GAMES = 1 << 14
+
+
+class BatchPlayResult(NamedTuple):
+    """
+    The outcome of a batch of games.
+
+    Attributes:
+        tricks: ``(games, players)`` rounds won by each seat.
+        plays: ``(games, rounds, players)`` card ids in the order they were played.
+        leaders: ``(games, rounds)`` the seat that led each round.
+        winners: ``(games, rounds)`` the seat that won each round.
+    """
+    tricks: np.ndarray
+    plays: np.ndarray
+    leaders: np.ndarray
+    winners: np.ndarray
+
+
+def seeded_decks(seeds, include_joker=False):
+    """
+    Return the deck order a ``Game`` seeded with each seed would deal from.
+
+    ``Game(names, rng=random.Random(seed))`` shuffles its deck once; this repeats
+    that shuffle, so the batch plays exactly the scalar engine's games.
+
+    Args:
+        seeds (iterable[int]): One seed per game.
+        include_joker (bool, optional): Include the two Jokers. Defaults to False.
+
+    Returns:
+        numpy.ndarray: A ``(games, deck_size)`` array of card ids, bottom card first.
+    """
+    ordered = list(range(len(ALL_CARDS) if include_joker else len(STANDARD_CARDS)))
+    decks = []
+    for seed in seeds:
+        deck = list(ordered)
+        random.Random(seed).shuffle(deck)
+        decks.append(deck)
+    return np.array(decks, dtype=np.int8).reshape(-1, len(ordered))
+
+
+def deal_hands(decks, player_count: int):
+    """
+    Deal whole decks round-robin, as ``Game.deal()`` does with no count.
+
+    Cards come off the end of each deck, one to each player in turn.
+
+    Args:
+        decks (array-like): A ``(games, deck_size)`` array of card ids, bottom card first.
+        player_count (int): The number of players.
+
+    Returns:
+        numpy.ndarray: A ``(games, players, cards)`` array of card ids in the order each
+        player received them, padded with -1.
+    """
+    decks = np.asarray(decks, dtype=np.int8)
+    games, deck_size = decks.shape
+    cards = -(-deck_size // player_count)
+    dealt = np.full((games, cards * player_count), -1, dtype=np.int8)
+    dealt[:, :deck_size] = decks[:, ::-1]
+    return dealt.reshape(games, cards, player_count).transpose(0, 2, 1).copy()
+
+
+def play_games(hands, rounds=13):
+    """
+    Play ``rounds`` rounds of every game in a batch.
+
+    Seat 0 leads the first round.
+
+    Args:
+        hands (array-like): A ``(games, players, cards)`` array of card ids, see ``deal_hands``.
+        rounds (int, optional): The number of rounds. Defaults to 13.
+
+    Returns:
+        BatchPlayResult: The tricks won and every card played.
+
+    Raises:
+        ValueError: If some player holds fewer than ``rounds`` cards, or more than 62.
+    """
+    hands = np.asarray(hands, dtype=np.int8)
+    games, players, cards = hands.shape
+    if cards > 62:
+        raise ValueError("hands of more than 62 cards are not supported")
+    if rounds > cards or (rounds and (hands[:, :, :rounds] < 0).any()):
+        raise ValueError("every player needs a card for each round")
+    result = BatchPlayResult(
+        tricks=np.zeros((games, players), dtype=np.int16),
+        plays=np.empty((games, rounds, players), dtype=np.int8),
+        leaders=np.empty((games, rounds), dtype=np.int8),
+        winners=np.empty((games, rounds), dtype=np.int8),
+    )
+    for start in range(0, games, CHUNK_GAMES):
+        chunk = slice(start, start + CHUNK_GAMES)
+        _play_chunk(hands[chunk], rounds, *(field[chunk] for field in result))
+    return result
+
+
+def _play_chunk(hands, rounds, tricks, plays, leaders, winners):
+    """Play one chunk of games, writing into the result arrays."""
+    games, players, cards = hands.shape
+    ids = hands.astype(np.intp)
+    values = CARD_VALUES.take(ids)
+    suits = CARD_SUITS.take(ids)
+    # Each hand is a bitmask of the slots still holding a card, plus one mask per suit.
+    slot_bits = np.left_shift(1, np.arange(cards, dtype=np.int64))
+    remaining = ((hands >= 0) * slot_bits).sum(axis=2)
+    suit_slots = np.stack([((suits == suit) * slot_bits).sum(axis=2) for suit in range(len(Card.suits))], axis=2)
+
+    rows = np.arange(games)
+    leader = np.zeros(games, dtype=np.intp)
+    for round_number in range(rounds):
+        leaders[:, round_number] = leader
+        for offset in range(players):
+            seat = (leader + offset) % players if offset else leader
+            held = remaining[rows, seat]
+            if offset == 0:
+                chosen = held & -held  # The first card left in the hand
+                slot = _bit_index(chosen)
+                lead_suit = suits[rows, seat, slot]
+                best_value = values[rows, seat, slot]
+                best_seat = seat
+            else:
+                follow = held & suit_slots[rows, seat, lead_suit]
+                chosen = np.where(follow != 0, follow & -follow, held & -held)
+                slot = _bit_index(chosen)
+                value = values[rows, seat, slot]
+                better = (follow != 0) & (value > best_value)
+                best_value = np.where(better, value, best_value)
+                best_seat = np.where(better, seat, best_seat)
+            remaining[rows, seat] = held ^ chosen
+            plays[:, round_number, offset] = hands[rows, seat, slot]
+        winners[:, round_number] = best_seat
+        tricks[rows, best_seat] += 1
+        leader = best_seat
+
+
+def _bit_index(bits):
+    """Return the position of the single set bit in each element."""
+    return np.log2(bits).astype(np.intp)
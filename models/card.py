@@ -1,11 +1,38 @@
 class Card:
+    """
+    An immutable playing card.
+
+    Cards are interned flyweights: the 52 standard cards and the two Jokers are
+    built once when this module is imported, and ``Card(suit, rank)`` returns the
+    cached instance instead of allocating a new object. Each card carries
+    precomputed integers so that comparisons, hashing and sorting never touch
+    the string tables:
+
+        - id: A unique index in ``0..53``. Standard cards are numbered
+          ``suit_index * 13 + (value - 2)``; the two Jokers are 52 and 53.
+        - value: The rank value (2..14, Jokers are 15).
+        - suit_index: The position of the suit in ``Card.suits``.
+        - mask: ``1 << id``, so a set of cards can be held in one integer.
+        - key: The ordering key ``suit_index << 4 | value``. Both Jokers share
+          the same key, so they compare equal to each other.
+        - code: The card's lookup code for ``models.evaluator``: bit
+          ``3 * (value - 2)`` for its rank plus bit ``42 + 4 * suit_index`` for
+          its suit, or bit 39 for a Joker. A hand's codes sum to its table key.
+    """
+
     suits = ["♣", "♦", "♥", "♠", "None"]
     ranks = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A", "Joker"]
     rank_values = {"2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "10": 10, "J": 11, "Q": 12, "K": 13, "A": 14}
+    joker_value = 15
 
-    def __init__(self, suit: str, rank: str):
+    __slots__ = ("suit", "rank", "id", "value", "suit_index", "mask", "key", "code")
+
+    _by_id = []
+    _lookup = {}
+
+    def __new__(cls, suit: str, rank: str):
         """
-        Initialize a Card object with a given suit and rank.
+        Return the interned card with the given suit and rank.
 
         Args:
             suit (str): The suit of the card. Must be one of the following:
@@ -22,11 +49,53 @@ class Card:
         Raises:
             ValueError: If the given suit or rank is invalid.
         """
-        if suit not in Card.suits or rank not in Card.ranks:
-            raise ValueError("invalid suit or rank")
+        try:
+            return cls._lookup[suit, rank]
+        except (KeyError, TypeError):
+            raise ValueError("invalid suit or rank") from None
+
+    @classmethod
+    def _intern(cls, card_id: int, suit: str, rank: str):
+        """Build the card with the given id. Only used while populating the cache."""
+        card = object.__new__(cls)
+        suit_index = Card.suits.index(suit)
+        value = Card.rank_values.get(rank, Card.joker_value)
+        code = 1 << 39 if value == Card.joker_value else 1 << 3 * (value - 2) | 1 << 42 + 4 * suit_index
+        for name, field in (("suit", suit), ("rank", rank), ("id", card_id), ("value", value),
+                            ("suit_index", suit_index), ("mask", 1 << card_id),
+                            ("key", suit_index << 4 | value), ("code", code)):
+            object.__setattr__(card, name, field)
+        cls._by_id.append(card)
+        cls._lookup.setdefault((suit, rank), card)
+        return card
+
+    @classmethod
+    def from_id(cls, card_id: int):
+        """
+        Return the interned card with the given id.
+
+        Args:
+            card_id (int): A card id in ``0..53``.
+
+        Returns:
+            Card: The card with that id.
+        """
+        return cls._by_id[card_id]
 
-        self.suit = suit
-        self.rank = rank
+    def __setattr__(self, name, value):
+        raise AttributeError("Card objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Card objects are immutable")
+
+    def __reduce__(self):
+        return (Card.from_id, (self.id,))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def __repr__(self):
         """
@@ -39,13 +108,23 @@ class Card:
             return "Joker"
         return f'{self.rank}{self.suit}'
 
+    def __hash__(self):
+        return self.key
+
     def __eq__(self, other):
         """
         Return True if the given card is equal to this card, False otherwise.
 
         Two cards are equal if and only if they have the same suit and rank.
         """
-        return Card.suits.index(self.suit) == Card.suits.index(other.suit) and Card.rank_values[self.rank] == Card.rank_values[other.rank]
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.key == other.key
+
+    def __ne__(self, other):
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.key != other.key
 
     def __lt__(self, other):
         """
@@ -54,17 +133,39 @@ class Card:
         A card is considered less than another if its suit is less than the other's suit, or
         if its suit is equal to the other's suit and its rank is less than the other's rank.
         """
-        suitScoreLesser = Card.suits.index(self.suit) < Card.suits.index(other.suit)
-        suitScoreEqual = Card.suits.index(self.suit) == Card.suits.index(other.suit)
-        return True if suitScoreLesser or (suitScoreEqual and Card.rank_values[self.rank] < Card.rank_values[other.rank]) else False
-    
-    def __gt__(self, other): 
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.key < other.key
+
+    def __gt__(self, other):
         """
         Return True if this card is greater than the given card, False otherwise.
 
         A card is considered greater than another if its suit is greater than the other's suit, or
         if its suit is equal to the other's suit and its rank is greater than the other's rank.
         """
-        suitScoreGreater = Card.suits.index(self.suit) > Card.suits.index(other.suit)
-        suitScoreEqual = Card.suits.index(self.suit) == Card.suits.index(other.suit)
-        return True if suitScoreGreater or (suitScoreEqual and Card.rank_values[self.rank] > Card.rank_values[other.rank]) else False
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.key > other.key
+
+    def __le__(self, other):
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.key <= other.key
+
+    def __ge__(self, other):
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.key >= other.key
+
+
+for _suit in Card.suits[:-1]:
+    for _rank in Card.ranks[:-1]:
+        Card._intern(len(Card._by_id), _suit, _rank)
+Card._intern(52, "None", "Joker")
+Card._intern(53, "None", "Joker")
+del _suit, _rank
+
+# The standard 52-card deck and the two Jokers, in id order.
+STANDARD_CARDS = tuple(Card._by_id[:52])
+JOKERS = tuple(Card._by_id[52:])
@@ -1,19 +1,32 @@
 import random
-from models.card import Card
+from array import array
+from models.card import Card, STANDARD_CARDS, JOKERS
+
+# The cards of a new deck, in order, without and with the Jokers.
+_FULL_DECKS = {False: STANDARD_CARDS, True: STANDARD_CARDS + JOKERS}
 
 class Deck:
-    def __init__(self, include_joker=False):
+    def __init__(self, include_joker=False, rng=None):
         """
         Initialize a Deck object with a given set of cards.
 
         Args:
             include_joker (bool, optional): Include two Jokers in the deck. Defaults to False.
+            rng (random.Random, optional): The random generator used for shuffling. Defaults to the global ``random`` module.
         """
-        self.cards = [Card(suit, rank) for suit in Card.suits[:-1] for rank in Card.ranks[:-1]]
+        self.rng = rng or random
+        self.include_joker = include_joker
+        self.cards = list(STANDARD_CARDS)
 
         # Add Jokers separately with the correct "None" suit
         if include_joker:
-            self.cards.extend([Card("None", "Joker"), Card("None", "Joker")])
+            self.cards.extend(JOKERS)
+
+    def __len__(self):
+        """
+        Return the number of cards left in the deck.
+        """
+        return len(self.cards)
 
     def shuffle(self):
         """
@@ -21,7 +34,16 @@ class Deck:
 
         This uses the Fisher-Yates shuffle algorithm to ensure that every possible permutation of cards is equally likely.
         """
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
+
+    def reset(self):
+        """
+        Return every card to the deck in its original order, reusing the card list.
+
+        Call ``shuffle`` afterwards to start a new game; the result is the same as
+        shuffling a new Deck with the same generator state.
+        """
+        self.cards[:] = _FULL_DECKS[self.include_joker]
 
     def draw(self):
         """
@@ -61,3 +83,313 @@ class Deck:
         if num > len(self.cards):
             return "over flow"
         return [self.draw() for _ in range(min(num, len(self.cards)))]
+
+
+# Every card id in order; CompactDeck copies a prefix of it instead of rebuilding.
+_ORDERED_IDS = array("b", range(len(STANDARD_CARDS) + len(JOKERS)))
+_FULL_IDS = {include_joker: _ORDERED_IDS[:len(cards)] for include_joker, cards in _FULL_DECKS.items()}
+
+
+class CompactDeck(Deck):
+    def __init__(self, include_joker=False, rng=None):
+        """
+        Initialize a CompactDeck, a Deck stored as a byte array of card ids.
+
+        The remaining cards are ``ids[:top]`` with the top of the deck at the end,
+        matching the order ``Deck.cards`` pops from. Dealing moves the ``top``
+        cursor instead of popping, so ``draw_ids`` hands out a zero-copy view.
+        Returned cards are swapped into random positions rather than triggering
+        a full reshuffle. Shuffling with the same generator state gives the same
+        card order as a plain Deck.
+
+        Args:
+            include_joker (bool, optional): Include two Jokers in the deck. Defaults to False.
+            rng (random.Random, optional): The random generator used for shuffling. Defaults to the global ``random`` module.
+        """
+        self.rng = rng or random
+        self.include_joker = include_joker
+        self.ids = _FULL_IDS[include_joker][:]
+        self.top = len(self.ids)
+
+    @property
+    def cards(self):
+        """
+        list[Card]: A snapshot of the remaining cards, bottom to top. Changing it does not change the deck.
+        """
+        return [Card.from_id(card_id) for card_id in self.ids[:self.top]]
+
+    def __len__(self):
+        return self.top
+
+    def reset(self):
+        """
+        Return every card to the deck in its original order, reusing the id array.
+        """
+        self.ids[:] = _FULL_IDS[self.include_joker]
+        self.top = len(self.ids)
+
+    def shuffle(self):
+        """
+        Shuffle the remaining cards in place.
+        """
+        # Shuffling a list is faster than shuffling through a memoryview
+        remaining = self.ids[:self.top].tolist()
+        self.rng.shuffle(remaining)
+        self.ids[:self.top] = array("b", remaining)
+
+    def draw(self):
+        """
+        Draw a single card from the deck.
+
+        Returns:
+            Card: The drawn card if the deck is not empty; otherwise, None.
+        """
+        if not self.top:
+            return None
+        self.top -= 1
+        return Card.from_id(self.ids[self.top])
+
+    def draw_ids(self, num: int):
+        """
+        Draw ``num`` cards as a read-only view of their ids, without copying.
+
+        The view lists the cards bottom to top, so the first card drawn is last.
+        It stays valid until cards are added back to the deck.
+
+        Args:
+            num (int): The number of cards to draw. Must be between 0 and ``len(self)``.
+
+        Returns:
+            memoryview: The ids of the drawn cards.
+
+        Raises:
+            ValueError: If the count is invalid.
+        """
+        if not 0 <= num <= self.top:
+            raise ValueError("invalid count")
+        self.top -= num
+        return memoryview(self.ids)[self.top:self.top + num].toreadonly()
+
+    def draw_multiple(self, num: int):
+        """
+        Draw multiple cards from the deck.
+
+        Args:
+            num (int): The number of cards to draw.
+
+        Returns:
+            list[Card] or str: A list of the drawn cards, or an error message if the count is invalid.
+        """
+        if num <= 0:
+            return "Invalid count"
+        if num > self.top:
+            return "over flow"
+        return [Card.from_id(card_id) for card_id in reversed(self.draw_ids(num))]
+
+    def add_cards(self, cards: list[Card]):
+        """
+        Return cards to the deck, each at a uniformly random position.
+
+        Every card is placed on top and then swapped with a random position,
+        which is one step of an inside-out Fisher-Yates shuffle.
+
+        Args:
+            cards (list[Card]): A list of Card objects to add to the deck.
+        """
+        ids = self.ids
+        for card in cards:
+            if self.top == len(ids):
+                ids.append(card.id)
+            else:
+                ids[self.top] = card.id
+            position = self.rng.randrange(self.top + 1)
+            ids[self.top], ids[position] = ids[position], ids[self.top]
+            self.top += 1
+
+
+_ALL_CARDS = STANDARD_CARDS + JOKERS
+
+
+class Shoe(Deck):
+    def __init__(self, decks=6, include_joker=False, rng=None, penetration=0.75):
+        """
+        Initialize a Shoe, several decks shuffled together, as dealt at large tables.
+
+        The shoe never builds its ordered card list. It keeps how many copies of
+        each card id are left, and a lazily generated permutation: position ``p``
+        of the shoe holds card ``p % deck_size`` unless a draw has swapped another
+        card there, and only swapped positions are stored. Each draw picks a
+        uniformly random remaining position (one step of Fisher-Yates), so
+        drawing is O(1) and a fresh shoe costs nothing to shuffle.
+
+        Once ``penetration`` of the shoe has been dealt the cut card is out, and
+        the next ``reset`` refills and reshuffles it. Until then ``reset`` keeps
+        the remaining cards, so consecutive games deal from the same shoe.
+
+        Args:
+            decks (int, optional): The number of decks. Defaults to 6.
+            include_joker (bool, optional): Include two Jokers in every deck. Defaults to False.
+            rng (random.Random, optional): The random generator used for shuffling. Defaults to the global ``random`` module.
+            penetration (float, optional): The fraction of the shoe dealt before it is reshuffled,
+                between 0 and 1. Defaults to 0.75.
+
+        Raises:
+            ValueError: If there are no decks or the penetration is out of range.
+        """
+        if decks < 1:
+            raise ValueError("a shoe needs at least one deck")
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be in (0, 1]")
+        self.rng = rng or random
+        self.include_joker = include_joker
+        self.decks = decks
+        self.deck_size = len(_FULL_DECKS[include_joker])
+        self.size = decks * self.deck_size
+        self.penetration = penetration
+        self.cut = max(1, int(self.size * penetration))
+        self.counts = array("H", [decks]) * self.deck_size
+        self.remaining = self.size
+        self._swapped = {}
+        self.shuffles = 0
+
+    @property
+    def cards(self):
+        """
+        list[Card]: A snapshot of the remaining cards, bottom to top. Changing it does not change the shoe.
+        """
+        swapped, size = self._swapped, self.deck_size
+        return [Card.from_id(swapped.get(position, position % size)) for position in range(self.remaining)]
+
+    def __len__(self):
+        return self.remaining
+
+    @property
+    def dealt(self):
+        """The number of cards dealt since the last refill."""
+        return self.size - self.remaining
+
+    @property
+    def needs_shuffle(self):
+        """True once the cut card has been dealt."""
+        return self.dealt >= self.cut
+
+    def count(self, card: Card):
+        """Return how many copies of ``card`` are left in the shoe."""
+        return self.counts[card.id] if card.id < self.deck_size else 0
+
+    def refill(self):
+        """Return every card to the shoe and reshuffle it, which only resets the counts and the permutation."""
+        self.counts[:] = array("H", [self.decks]) * self.deck_size
+        self.remaining = self.size
+        self._swapped.clear()
+        self.shuffles += 1
+
+    def reset(self):
+        """
+        Start a new game: refill the shoe if the cut card is out, otherwise keep dealing from it.
+        """
+        if self.needs_shuffle:
+            self.refill()
+
+    def reserve(self, count: int):
+        """
+        Refill the shoe if fewer than ``count`` cards are left, so the next deal is not cut short.
+
+        Call it between games only: a refill takes back every card, including
+        any still held by players.
+
+        Args:
+            count (int): The number of cards the next deal needs.
+
+        Raises:
+            ValueError: If even a full shoe holds fewer than ``count`` cards.
+        """
+        if count > self.size:
+            raise ValueError(f"a {self.size}-card shoe cannot deal {count} cards")
+        if count > self.remaining:
+            self.refill()
+
+    def shuffle(self):
+        """
+        Do nothing: every draw already takes a uniformly random remaining card.
+        """
+
+    def draw(self):
+        """
+        Draw a single card from the shoe.
+
+        Returns:
+            Card: The drawn card if the shoe is not empty; otherwise, None.
+        """
+        last = self.remaining - 1
+        if last < 0:
+            return None
+        swapped = self._swapped
+        position = int(self.rng.random() * self.remaining)
+        card_id = swapped.pop(position, position % self.deck_size)
+        if position != last:
+            swapped[position] = swapped.pop(last, last % self.deck_size)
+        self.remaining = last
+        self.counts[card_id] -= 1
+        return _ALL_CARDS[card_id]
+
+    def _draw(self, num: int):
+        swapped = self._swapped
+        pop = swapped.pop
+        counts = self.counts
+        size = self.deck_size
+        uniform = self.rng.random
+        last = self.remaining
+        drawn = []
+        for _ in range(num):
+            # random() has 53 bits, so the bias of scaling it is negligible next to randrange's cost
+            position = int(uniform() * last)
+            last -= 1
+            card_id = pop(position, position % size)
+            if position != last:
+                swapped[position] = pop(last, last % size)
+            counts[card_id] -= 1
+            drawn.append(_ALL_CARDS[card_id])
+        self.remaining = last
+        return drawn
+
+    def draw_multiple(self, num: int):
+        """
+        Draw multiple cards from the shoe.
+
+        Args:
+            num (int): The number of cards to draw.
+
+        Returns:
+            list[Card] or str: A list of the drawn cards, or an error message if the count is invalid.
+        """
+        if num <= 0:
+            return "Invalid count"
+        if num > self.remaining:
+            return "over flow"
+        return self._draw(num)
+
+    def add_cards(self, cards: list[Card]):
+        """
+        Return cards to the shoe, each at a uniformly random position.
+
+        Args:
+            cards (list[Card]): Cards that were drawn from this shoe.
+
+        Raises:
+            ValueError: If a card would exceed the shoe's copies of it.
+        """
+        swapped = self._swapped
+        for card in cards:
+            if card.id >= self.deck_size or self.counts[card.id] >= self.decks:
+                raise ValueError(f"{card} was not drawn from this shoe")
+            position = self.rng.randrange(self.remaining + 1)
+            # Put the card on top, then swap it with a random position (inside-out Fisher-Yates)
+            top = self.remaining
+            if position == top:
+                swapped[top] = card.id
+            else:
+                swapped[top] = swapped.get(position, position % self.deck_size)
+                swapped[position] = card.id
+            self.remaining += 1
+            self.counts[card.id] += 1
@@ -0,0 +1,660 @@
+"""
+Double-dummy analysis of the trick-taking rounds played by ``Game``.
+
+With every hand visible, ``DoubleDummySolver`` finds the most rounds (tricks)
+each seat can be sure to win, assuming everyone else plays to stop it. The
+rules are those of ``Game.play_round``: the leader plays any card, the others
+must follow the leading suit when they can, the highest card of the leading
+suit wins (the first of two Jokers when both are played) and the winner leads
+the next round.
+
+For each seat the search answers "can this seat take at least ``t`` more
+tricks?", starting from the tricks the count game below guarantees and
+counting ``t`` up until the answer is no. The yes/no searches use:
+
+    - Alpha-beta cut-offs: a branch stops as soon as one move settles it.
+    - Move ordering: the solved seat cashes its winners and wins tricks as
+      cheaply as it can; the other seats lead suits it is void in or that a
+      later seat covers, beat its cards with their cheapest cards that do
+      unless a later seat can, and otherwise play low.
+    - Equivalent cards: cards of one suit in one hand with no other remaining
+      card between them play the same, so only one of them is tried. Once a
+      card's answer is known, the other cards of its suit below the lowest
+      card that answer depended on are skipped as well.
+    - Quick tricks: the top cards the leader can cash in a row bound the
+      result at the start of each round without searching.
+    - A transposition table of bounds at the start of each round (partition
+      search). Every result records the cards whose rank decided a trick, and
+      its entry only keys on who holds the cards of each suit down to the
+      lowest of those; the lower cards of a suit only count per hand. So a
+      bound found once also answers positions that differ in the low cards,
+      whichever hands hold them.
+    - The count game: a much smaller game that only keeps how many cards of
+      each suit every seat holds, and which of the solved seat's cards are
+      sure winners. Its rules favour the other seats, so when the solved seat
+      reaches ``t`` there it does in the real game too, without searching.
+      Such an answer only depends on those winners and the next card of each
+      suit, so its table entry covers many positions.
+    - Exact positions: every answer is also kept under the exact hands, which
+      is cheaper to look up than a table pattern and catches the positions
+      that transpose within one search.
+
+The search runs in plain Python at some 20 microseconds a node. Deals of up
+to nine cards a hand solve in under a second, and most ten-card deals do.
+Full 13-card deals still search about half a million nodes a deal and take
+some ten seconds on average, up to about 20 for the hardest, so solving them
+within a second is out of reach of this implementation. Pass ``tricks`` to
+look only a few rounds ahead: six rounds of a full deal take a few hundredths
+of a second. ``python -m benchmarks.bench_double_dummy`` measures deals of
+every size.
+"""
+from itertools import product
+
+from models.card import Card, STANDARD_CARDS, JOKERS
+
+ALL_CARDS = STANDARD_CARDS + JOKERS
+SUIT_COUNT = len(Card.suits)
+SUIT_MASKS = [sum(card.mask for card in ALL_CARDS if card.suit_index == suit) for suit in range(SUIT_COUNT)]
+SUIT_SHIFTS = [13 * suit for suit in range(SUIT_COUNT)]
+_VALUES = [card.value for card in ALL_CARDS]
+_SUITS = [card.suit_index for card in ALL_CARDS]
+JOKER_SUIT = JOKERS[0].suit_index
+
+
+class DoubleDummySolver:
+    """
+    Find the most tricks each seat can take with perfect play and every hand visible.
+
+    The transposition table is shared between the seats and between calls,
+    since its keys do not depend on the concrete cards. It holds at most
+    ``tt_capacity`` entries in two generations: when the newer one fills up,
+    the older one is dropped. Answers for exact positions are kept apart, up
+    to ``tt_capacity`` of them, and dropped all at once when full.
+    """
+
+    def __init__(self, tt_capacity=1 << 20):
+        """
+        Initialize a DoubleDummySolver.
+
+        Args:
+            tt_capacity (int, optional): The most transposition table entries to keep. Defaults to 2**20.
+
+        Raises:
+            ValueError: If the capacity is less than 2.
+        """
+        if tt_capacity < 2:
+            raise ValueError("tt_capacity must be at least 2")
+        self.tt_capacity = tt_capacity
+        self._table = {}
+        self._old_table = {}
+        self._size = self._old_size = 0
+        self._codes = {}
+        self._count_table = {}
+        self._exact = {}
+        self.nodes = 0
+        self.tt_lookups = 0
+        self.tt_hits = 0
+
+    def solve_game(self, game, tricks=None):
+        """
+        Return the most tricks each player can take from a game's current position.
+
+        The player who won the last round leads, or the first player in turn order
+        before any round has been played, as in ``Game.play_round``.
+
+        Args:
+            game (Game): The game, after dealing.
+            tricks (int, optional): Rounds left to play. Defaults to the size of the smallest hand.
+
+        Returns:
+            dict[str, int]: The most tricks each player can be sure to take, keyed by name.
+        """
+        names = game.turn_order
+        leader = names.index(game.round_winner) if game.round_winner in game.players else 0
+        result = self.solve([game.players[name].hand for name in names], leader, tricks=tricks)
+        return dict(zip(names, result))
+
+    def solve(self, hands: list, leader=0, seats=None, tricks=None):
+        """
+        Return the most tricks each seat can take against the others' best defence.
+
+        Args:
+            hands (list[list[Card]]): Each seat's cards, in turn order.
+            leader (int, optional): The seat that leads the first trick. Defaults to 0.
+            seats (iterable[int], optional): Only solve these seats. Defaults to every seat.
+            tricks (int, optional): Rounds left to play. Defaults to the size of the smallest hand.
+
+        Returns:
+            list[int]: The tricks for each requested seat, in the order requested.
+
+        Raises:
+            ValueError: If a card is held twice, or some seat holds fewer than ``tricks`` cards.
+        """
+        masks = []
+        held = 0
+        for hand in hands:
+            mask = 0
+            for card in hand:
+                mask |= card.mask
+            if mask & held or bin(mask).count("1") != len(hand):
+                raise ValueError("every card must be held at most once")
+            held |= mask
+            masks.append(mask)
+        if tricks is None:
+            tricks = min(map(len, hands), default=0)
+        if any(len(hand) < tricks for hand in hands):
+            raise ValueError("every seat needs a card for each trick")
+        seats = range(len(hands)) if seats is None else seats
+        return [self.solve_seat(masks, leader, seat, tricks) for seat in seats]
+
+    def solve_seat(self, masks: list[int], leader: int, seat: int, tricks: int):
+        """
+        Return the most tricks one seat can take, with hands given as card masks.
+
+        Args:
+            masks (list[int]): Each seat's cards as a ``Card.mask`` union, in turn order.
+            leader (int): The seat that leads the first trick.
+            seat (int): The seat to solve for.
+            tricks (int): Rounds left to play.
+
+        Returns:
+            int: The most tricks the seat can be sure to take.
+        """
+        # Rotate so the solved seat is seat 0; the search is the same from every chair.
+        players = len(masks)
+        hands = tuple(masks[seat:] + masks[:seat])
+        leader = (leader - seat) % players
+        # Start from what the count game guarantees and count up: the answer is usually close to it.
+        state = self._count_state(self._position(hands, leader, tricks)[1])
+        low = 0
+        while low < tricks and self._count_at_least(tricks, leader, *state, low + 1):
+            low += 1
+        while low < tricks and self._at_least(hands, leader, tricks, low + 1)[0]:
+            low += 1
+        return low
+
+    def _position(self, hands, leader, tricks):
+        """
+        Return a position's table key and what the search needs to know of each suit.
+
+        The key holds the leader, the tricks left and how many cards of each
+        suit each hand holds. Each suit comes with its code, which lists the
+        owner of each of its cards, highest first, in a fixed number of bits per
+        owner behind a leading 1 bit, so the owners of the top cards are a shift
+        away; with each hand's cards of the suit; and with how many of the top
+        cards each hand holds in a row.
+        """
+        suits = []
+        key = [len(hands), leader, tricks]
+        known = self._codes
+        for shift in SUIT_SHIFTS:
+            segments = tuple([hand >> shift & 0x1FFF for hand in hands])
+            entry = known.get(segments)
+            if entry is None:
+                entry = self._suit_code(segments)
+            suits.append(entry)
+            key.append(entry[1])
+        return tuple(key), suits
+
+    def _suit_code(self, segments):
+        union = 0
+        for segment in segments:
+            union |= segment
+        lengths = tuple([bin(segment).count("1") for segment in segments])
+        runs = [0] * len(segments)
+        bits = max(len(segments) - 1, 1).bit_length()
+        code = 1
+        leading = -1
+        while union:
+            top = 1 << union.bit_length() - 1
+            union ^= top
+            for owner, segment in enumerate(segments):
+                if segment & top:
+                    code = code << bits | owner
+                    break
+            if leading < 0:
+                leading = owner
+            if owner == leading:
+                runs[owner] += 1
+            else:
+                leading = len(segments)
+        if len(self._codes) >= self.tt_capacity:
+            self._codes.clear()
+        self._codes[segments] = entry = (code, lengths, tuple(runs))
+        return entry
+
+    @staticmethod
+    def _pattern(relevant, union, codes, bits):
+        """
+        Return the suit prefixes a result depends on: each suit's owners down to its lowest relevant card.
+
+        The pattern comes as its shape, the suits and how many of their low cards
+        it leaves out, and the owner prefixes themselves, so the entries of one
+        shape are found with a dictionary lookup.
+        """
+        shape = []
+        prefixes = []
+        for suit, suit_mask in enumerate(SUIT_MASKS):
+            cards = relevant & suit_mask
+            if cards:
+                lower = bin(union & suit_mask & (cards & -cards) - 1).count("1")
+                shape.append((suit, lower * bits, lower))
+                prefixes.append(codes[suit] >> lower * bits)
+        return tuple(shape), tuple(prefixes)
+
+    @staticmethod
+    def _pattern_cards(shape, union):
+        """Return the cards of a position that a pattern of this shape fixes."""
+        cards = 0
+        for suit, _, lower in shape:
+            suit_cards = union & SUIT_MASKS[suit]
+            for _ in range(lower):
+                suit_cards &= suit_cards - 1
+            cards |= suit_cards
+        return cards
+
+    def _at_least(self, hands, leader, tricks, target):
+        """
+        Return whether seat 0 can take at least ``target`` of the remaining ``tricks``.
+
+        Returns:
+            tuple[bool, int]: The answer and the mask of cards whose rank it depends on.
+        """
+        if target <= 0:
+            return True, 0
+        if target > tricks:
+            return False, 0
+        # Exact positions come back often within one search, and are cheaper to look up than their pattern.
+        exact = self._exact.get((hands, leader, tricks))
+        if exact is not None:
+            if exact[0] >= target:
+                return True, exact[2]
+            if exact[1] < target:
+                return False, exact[3]
+        key, suits = self._position(hands, leader, tricks)
+        # Quick tricks: the leader can cash the cards it holds above every other card of their suit.
+        cashable = 0
+        for entry in suits:
+            cashable += entry[2][leader]
+        if cashable and (cashable >= target if leader == 0 else tricks - cashable < target):
+            return leader == 0, self._top_cards(hands, [entry[2][leader] for entry in suits])
+        codes = [entry[0] for entry in suits]
+        self.tt_lookups += 1
+        for table in (self._table, self._old_table):
+            bucket = table.get(key)
+            if bucket:
+                for shape, entries in bucket.items():
+                    bounds = entries.get(tuple([codes[suit] >> shift for suit, shift, _ in shape]))
+                    if bounds is not None and (bounds[0] >= target or bounds[1] < target):
+                        self.tt_hits += 1
+                        cards = self._pattern_cards(shape, self._union(hands))
+                        self._remember(hands, leader, tricks, target, bounds[0] >= target, cards)
+                        return bounds[0] >= target, cards
+
+        union = self._union(hands)
+        state = self._count_state(suits)
+        # Seat 0 can only reach the target in the count game with at least as many sure winners.
+        if sum(state[1]) >= target and self._count_at_least(tricks, leader, *state, target):
+            result = True
+            # The count game only sees seat 0's winners and whether it has a card below them,
+            # so the answer holds while those and the next card of each suit stay where they are.
+            relevant = self._top_cards(hands, [run + (count > run) if suit != JOKER_SUIT or count == sum(entry[1]) else 0
+                                               for suit, (count, run, entry) in enumerate(zip(state[0], state[1], suits))])
+        else:
+            result, relevant = self._play(list(hands), union, leader, tricks, 0, 0, -1, 0, 0, target)
+        shape, prefixes = self._pattern(relevant, union, codes, max(len(hands) - 1, 1).bit_length())
+        bucket = self._table.get(key)
+        entries = bucket.get(shape) if bucket else None
+        bounds = entries.get(prefixes) if entries else None
+        if bounds is None:
+            if self._size >= self.tt_capacity // 2:
+                self._old_table, self._old_size = self._table, self._size
+                self._table, self._size = {}, 0
+                bucket = entries = None
+            if bucket is None:
+                bucket = self._table[key] = {}
+            if entries is None:
+                entries = bucket[shape] = {}
+            entries[prefixes] = bounds = [0, tricks]
+            self._size += 1
+        if result:
+            bounds[0] = max(bounds[0], target)
+        else:
+            bounds[1] = min(bounds[1], target - 1)
+        self._remember(hands, leader, tricks, target, result, relevant)
+        return result, relevant
+
+    @staticmethod
+    def _union(hands):
+        union = 0
+        for hand in hands:
+            union |= hand
+        return union
+
+    def _top_cards(self, hands, counts):
+        """Return the ``counts[suit]`` highest remaining cards of each suit."""
+        union = self._union(hands)
+        cards = 0
+        for suit_mask, count in zip(SUIT_MASKS, counts):
+            suit_cards = union & suit_mask
+            while count and suit_cards:
+                top = 1 << suit_cards.bit_length() - 1
+                cards |= top
+                suit_cards ^= top
+                count -= 1
+        return cards
+
+    def _remember(self, hands, leader, tricks, target, result, relevant):
+        """Record an answer for the exact position, with the cards it depends on."""
+        key = (hands, leader, tricks)
+        exact = self._exact.get(key)
+        if exact is None:
+            if len(self._exact) >= self.tt_capacity:
+                self._exact.clear()
+            exact = self._exact[key] = [0, tricks, 0, 0]
+        if result:
+            if target > exact[0]:
+                exact[0] = target
+                exact[2] = relevant
+        elif target - 1 < exact[1]:
+            exact[1] = target - 1
+            exact[3] = relevant
+
+    @staticmethod
+    def _count_state(suits):
+        """
+        Return a position's state in the count game from what ``_position`` finds of its suits.
+
+        The state is seat 0's cards per suit, its winners per suit (the cards
+        above every other seat's card of the suit) and the other seats' cards
+        per suit, in seat order. It depends on the lengths of the suits and
+        on who holds each suit's cards down to the first card below seat 0's
+        winners.
+        """
+        counts = tuple([entry[1][0] for entry in suits])
+        # The first Joker played wins, so a Joker only wins for sure if seat 0 holds both.
+        runs = tuple([0 if suit == JOKER_SUIT and entry[1][0] < sum(entry[1]) else entry[2][0]
+                      for suit, entry in enumerate(suits)])
+        others = tuple(zip(*[entry[1][1:] for entry in suits]))
+        return counts, runs, others
+
+    def _count_at_least(self, tricks, leader, counts, runs, others, target):
+        """
+        Return whether seat 0 can take at least ``target`` tricks in the count game.
+
+        The count game drops the ranks: seat 0 wins a trick exactly when it plays
+        one of its winners to a trick of that suit, and the other seats, who play
+        as one side with sight of seat 0's card, beat its other cards with
+        whichever of their cards of the suit they like and pick which of them
+        wins the trick. Seat 0's other cards only become winners once the other
+        seats hold no card of their suit. Each of these rules only helps the
+        other side, so whatever seat 0 takes in the count game it takes in the
+        real one, and the game is far smaller to search.
+
+        Args:
+            tricks (int): Rounds left to play.
+            leader (int): The seat that leads.
+            counts (tuple[int, ...]): Seat 0's cards per suit.
+            runs (tuple[int, ...]): Seat 0's winners per suit.
+            others (tuple[tuple[int, ...], ...]): The other seats' cards per suit.
+            target (int): The tricks seat 0 needs.
+        """
+        if target <= 0:
+            return True
+        if target > tricks:
+            return False
+        key = (tricks, leader, counts, runs, others)
+        table = self._count_table
+        bounds = table.get(key)
+        if bounds is None:
+            if len(table) >= self.tt_capacity:
+                table.clear()
+            bounds = table[key] = [0, tricks]
+        elif bounds[0] >= target or bounds[1] < target:
+            return bounds[0] >= target
+        reply = self._count_reply
+        if not leader:
+            result = False
+            for suit in range(SUIT_COUNT):
+                if runs[suit] and reply(tricks, leader, counts, runs, others, suit, suit, True, target):
+                    result = True
+                    break
+                if counts[suit] > runs[suit] and reply(tricks, leader, counts, runs, others, suit, suit, False, target):
+                    result = True
+                    break
+        else:
+            result = True
+            for suit in range(SUIT_COUNT):
+                if not others[leader - 1][suit]:
+                    continue
+                # Seat 0 answers the lead: a winner or another card of the suit, or any discard when void.
+                if counts[suit]:
+                    answered = (runs[suit] and reply(tricks, leader, counts, runs, others, suit, suit, True, target)
+                                or counts[suit] > runs[suit]
+                                and reply(tricks, leader, counts, runs, others, suit, suit, False, target))
+                else:
+                    answered = any(counts[discard] > runs[discard]
+                                   and reply(tricks, leader, counts, runs, others, suit, discard, False, target)
+                                   or runs[discard]
+                                   and reply(tricks, leader, counts, runs, others, suit, discard, True, target)
+                                   for discard in range(SUIT_COUNT))
+                if not answered:
+                    result = False
+                    break
+        if result:
+            bounds[0] = max(bounds[0], target)
+        else:
+            bounds[1] = min(bounds[1], target - 1)
+        return result
+
+    def _count_reply(self, tricks, leader, counts, runs, others, suit, played, winner, target):
+        """
+        Play seat 0's card of suit ``played`` (a winner or not) to a trick in ``suit``.
+
+        Returns whether seat 0 still reaches ``target`` however the other seats
+        follow or discard, and whichever of those that followed suit takes the
+        trick when seat 0 does not.
+        """
+        counts = list(counts)
+        counts[played] -= 1
+        counts = tuple(counts)
+        if winner:
+            runs = list(runs)
+            runs[played] -= 1
+            runs = tuple(runs)
+        won = winner and played == suit
+        choices = []
+        for hand in others:
+            options = [suit] if hand[suit] else [discard for discard in range(SUIT_COUNT) if hand[discard]]
+            choices.append([hand[:option] + (hand[option] - 1,) + hand[option + 1:] for option in options])
+        # Seat 0's card can only be beaten by a seat that follows suit, but let any
+        # seat take the trick when none does.
+        winners = [0] if won else [seat for seat, hand in enumerate(others, 1) if hand[suit]] or range(1, len(others) + 1)
+        for replies in product(*choices):
+            # Once the other seats run out of a suit, all of seat 0's cards in it are winners.
+            after = runs
+            for other in range(SUIT_COUNT):
+                if after[other] < counts[other] and not any(hand[other] for hand in replies):
+                    after = after[:other] + (counts[other],) + after[other + 1:]
+            for next_leader in winners:
+                if not self._count_at_least(tricks - 1, next_leader, counts, after, replies, target - won):
+                    return False
+        return True
+
+    def _play(self, hands, remaining, leader, tricks, position, table, lead_suit, best, best_seat, target):
+        """
+        Search the rest of a trick from the ``position``-th player.
+
+        ``table`` holds the cards played to the trick so far and ``best`` the
+        id of the card winning it. Returns whether seat 0 reaches ``target``,
+        and the mask of cards whose rank the answer depends on.
+        """
+        self.nodes += 1
+        players = len(hands)
+        if position == players:
+            result, relevant = self._at_least(tuple(hands), best_seat, tricks - 1, target - (best_seat == 0))
+            # The winning card only matters if it beat another card of the suit.
+            if table & SUIT_MASKS[lead_suit] != 1 << best:
+                relevant |= 1 << best
+            return result, relevant
+        seat = (leader + position) % players
+        hand = hands[seat]
+        candidates = hand
+        if position:
+            following = hand & SUIT_MASKS[lead_suit]
+            if following:
+                candidates = following
+
+        # One card from each run of cards with nothing left between them.
+        out = remaining | table
+        moves = []
+        suits = _SUITS
+        cards = candidates
+        previous = -1
+        while cards:
+            bit = cards & -cards
+            cards ^= bit
+            card = bit.bit_length() - 1
+            if previous >= 0 and suits[previous] == suits[card] and not (out & bit - 1) >> previous + 1:
+                moves[-1] = card
+            else:
+                moves.append(card)
+            previous = card
+
+        values = _VALUES
+        maximizing = seat == 0
+        last = players - 1
+        if len(moves) > 1:
+            moves.sort(key=self._ordering(hands, remaining, leader, position, lead_suit, best, best_seat))
+
+        relevant = 0
+        # The cards tried so far, each with the lowest card of its suit that its answer depended on.
+        tried = []
+        for card in moves:
+            suit = suits[card]
+            # Another card of the suit below that lowest card leads to the same answer.
+            if tried and any(suits[other] == suit and card < limit and other < limit for other, limit in tried):
+                continue
+            bit = 1 << card
+            hands[seat] = hand ^ bit
+            if position == last:
+                # The trick is complete: its winner leads the next one.
+                self.nodes += 1
+                if suit == lead_suit and values[card] > values[best]:
+                    winner, top = seat, card
+                else:
+                    winner, top = best_seat, best
+                result, found = self._at_least(tuple(hands), winner, tricks - 1, target - (winner == 0))
+                if (table | bit) & SUIT_MASKS[lead_suit] != 1 << top:
+                    found |= 1 << top
+            elif not position:
+                result, found = self._play(hands, remaining ^ bit, leader, tricks, 1, bit, suits[card], card, seat,
+                                           target)
+            elif suits[card] == lead_suit and values[card] > values[best]:
+                result, found = self._play(hands, remaining ^ bit, leader, tricks, position + 1, table | bit,
+                                           lead_suit, card, seat, target)
+            else:
+                result, found = self._play(hands, remaining ^ bit, leader, tricks, position + 1, table | bit,
+                                           lead_suit, best, best_seat, target)
+            hands[seat] = hand
+            if result == maximizing:
+                return result, found
+            relevant |= found
+            found &= SUIT_MASKS[suit]
+            tried.append((card, (found & -found).bit_length() - 1 if found else 64))
+        return not maximizing, relevant
+
+    @staticmethod
+    def _ordering(hands, remaining, leader, position, lead_suit, best, best_seat):
+        """Return a sort key that puts the most promising moves of the seat to play first."""
+        players = len(hands)
+        seat = (leader + position) % players
+        solved = hands[0]
+        values = _VALUES
+        suits = _SUITS
+        following = position and hands[seat] & SUIT_MASKS[lead_suit]
+        if following:
+            best_value = values[best]
+            # The cards of the led suit still to come after this seat's.
+            later = 0
+            for step in range(position + 1, players):
+                later |= hands[(leader + step) % players]
+            later &= SUIT_MASKS[lead_suit]
+            if seat == 0:
+                # Win with the cheapest card no later seat can beat, else play low.
+                return lambda card: values[card] + (
+                    0 if values[card] <= best_value else -32 if not later >> card else 32)
+            # Beat seat 0's card, or its best card when it is still to play, as cheaply as possible,
+            # unless a seat after both can beat it anyway.
+            solved_position = (players - leader) % players
+            if solved_position < position:
+                threat = best if best_seat == 0 else -1
+                cover = later
+            else:
+                top = (solved & SUIT_MASKS[lead_suit]).bit_length() - 1
+                threat = top if top > best else -1
+                cover = 0
+                for step in range(solved_position + 1, players):
+                    cover |= hands[(leader + step) % players]
+            if threat < 0 or (cover & SUIT_MASKS[lead_suit]) >> threat + 1:
+                return values.__getitem__
+            return lambda card: values[card] - (32 if card > threat else 0)
+        opponents = remaining & ~solved
+        # Per suit: seat 0's highest card, and whether it is above every other seat's.
+        tops = []
+        masters = []
+        for suit_mask in SUIT_MASKS:
+            top = (solved & suit_mask).bit_length() - 1
+            tops.append(top)
+            masters.append(top >= 0 and top >= (opponents & suit_mask).bit_length())
+        if not position:
+            if seat == 0:
+                # Cash the winners, highest first, then lead low.
+                return lambda card: -values[card] if masters[suits[card]] else values[card]
+            # Lead the suits seat 0 cannot win: ones it is void in, then ones a seat after it
+            # can beat it in (leading low), then ones this seat beats it in.
+            after = 0
+            for other in range(1, seat):
+                after |= hands[other]
+            covered = [(after & suit_mask) >> top + 1 if top >= 0 else 0
+                       for suit_mask, top in zip(SUIT_MASKS, tops)]
+            return lambda card: values[card] + (
+                -64 if tops[suits[card]] < 0 else
+                64 if masters[suits[card]] else
+                -48 if covered[suits[card]] else
+                -32 if card > tops[suits[card]] else 0)
+        if seat == 0:
+            # Keep the winners; throw the cards of suits that can never win first, else the lowest card.
+            hopeless = [top >= 0 and bin((opponents & suit_mask) >> top).count("1") >= bin(solved & suit_mask).count("1")
+                        for suit_mask, top in zip(SUIT_MASKS, tops)]
+            return lambda card: values[card] + (
+                64 if masters[suits[card]] else -32 if hopeless[suits[card]] else 0)
+        # Throw the cards that cannot stop seat 0 first, and keep the suits it is void in for leads.
+        return lambda card: values[card] + (
+            -64 if masters[suits[card]] else
+            64 if tops[suits[card]] < 0 else
+            -32 if card < tops[suits[card]] else 0)
+
+    @property
+    def hit_rate(self):
+        return self.tt_hits / self.tt_lookups if self.tt_lookups else 0.0
+
+    def stats(self):
+        """
+        Return the search counters.
+
+        Returns:
+            dict: ``nodes``, ``tt_lookups``, ``tt_hits``, ``tt_size`` and ``hit_rate``.
+        """
+        return {"nodes": self.nodes, "tt_lookups": self.tt_lookups, "tt_hits": self.tt_hits,
+                "tt_size": self._size + self._old_size, "hit_rate": self.hit_rate}
+
+    def clear(self):
+        """Empty the transposition table and reset the counters."""
+        self._table = {}
+        self._old_table = {}
+        self._size = self._old_size = 0
+        self._codes.clear()
+        self._count_table.clear()
+        self._exact.clear()
+        self.nodes = self.tt_lookups = self.tt_hits = 0
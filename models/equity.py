@@ -0,0 +1,289 @@
+"""
+Win probabilities for a partly dealt game.
+
+Given every player's current hand and the cards left in the deck, the
+remaining deal hands each player a uniformly random set of the undealt cards.
+``EquityCalculator`` computes each player's chance of holding the winning hand
+once every hand has ``cards_per_hand`` cards:
+
+    - Exactly, by enumerating every way to complete the hands, when there are
+      at most ``max_exact`` completions. Completions that differ only by a suit
+      permutation that leaves every hand and the deck unchanged are evaluated
+      once and weighted, and each player's hand strength is memoized per set of
+      added cards, so each distinct hand is evaluated once.
+    - Otherwise by Monte Carlo sampling, with enough samples for the requested
+      95% error bound.
+
+Results are kept in a bounded LRU cache under a suit-canonical form of the
+game state, so repeating a query, or asking about a state that differs only by
+relabelling suits, is a dictionary lookup. Hands scored in card order (more
+than ``MAX_TABLE_CARDS`` cards without ``best_of_five``) are the exception:
+relabelling suits changes the order of the card ids, so those states are
+neither relabelled for the cache key nor reduced by suit symmetry.
+"""
+import itertools
+import math
+import random
+from collections import OrderedDict
+from math import comb
+from typing import NamedTuple
+
+from models.card import Card, STANDARD_CARDS, JOKERS
+from models.evaluator import CARD_CODES, MAX_TABLE_CARDS, HandEvaluator
+
+# Card id mapping for each of the 24 ways to relabel the four suits; Jokers stay put.
+SUIT_PERMUTATIONS = [
+    tuple([perm[card_id // 13] * 13 + card_id % 13 for card_id in range(len(STANDARD_CARDS))]
+          + [joker.id for joker in JOKERS])
+    for perm in itertools.permutations(range(4))
+]
+Z_95 = 1.96
+
+
+class EquityResult(NamedTuple):
+    """
+    Win probabilities for each player, keyed by name.
+
+    ``wins`` applies the ``Game.determine_winner`` rule, where a tie goes to the
+    player listed first; ``equity`` splits tied pots evenly instead.
+    """
+    wins: dict
+    equity: dict
+    exact: bool
+    completions: int
+    error: float
+
+
+def completion_count(needed: list[int], remaining: int):
+    """
+    Return the number of ways to deal ``needed[i]`` cards to each player from ``remaining`` cards.
+    """
+    count = 1
+    for cards in needed:
+        count *= comb(remaining, cards)
+        remaining -= cards
+    return count
+
+
+def canonical_state(hands: list[tuple], deck: tuple, ordered=False):
+    """
+    Return the smallest relabelling of a game state over every suit permutation.
+
+    Args:
+        hands (list[tuple[int]]): Each player's card ids, in seat order.
+        deck (tuple[int]): The ids of the undealt cards.
+        ordered (bool, optional): Keep the order of the cards within each hand. Defaults to False.
+
+    Returns:
+        tuple: A hashable key shared by every suit relabelling of the state.
+    """
+    arrange = tuple if ordered else sorted
+    best = None
+    for perm in SUIT_PERMUTATIONS:
+        key = (tuple(tuple(arrange(perm[card_id] for card_id in hand)) for hand in hands),
+               tuple(sorted(perm[card_id] for card_id in deck)))
+        if best is None or key < best:
+            best = key
+    return best
+
+
+class EquityCalculator:
+    """Compute and cache win probabilities for partly dealt games."""
+
+    def __init__(self, evaluator: HandEvaluator = None, max_exact=1_000_000, error=0.01, rng=None,
+                 cache_size=4096):
+        """
+        Initialize an EquityCalculator.
+
+        Args:
+            evaluator (HandEvaluator, optional): Scores the final hands. Defaults to a new HandEvaluator.
+            max_exact (int, optional): The most completions to enumerate before sampling. Defaults to 1,000,000.
+            error (float, optional): The 95% error bound for sampled probabilities. Defaults to 0.01.
+            rng (random.Random, optional): The generator for sampling. Defaults to ``random.Random(0)``,
+                so sampled results are repeatable.
+            cache_size (int, optional): The most results to keep; the least recently used is
+                dropped first. Defaults to 4096.
+
+        Raises:
+            ValueError: If the cache size is not positive.
+        """
+        if cache_size <= 0:
+            raise ValueError("cache_size must be positive")
+        self.evaluator = evaluator if evaluator is not None else HandEvaluator()
+        self.max_exact = max_exact
+        self.error = error
+        self.rng = rng or random.Random(0)
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+
+    def game_equity(self, game, cards_per_hand: int):
+        """
+        Return the win probabilities for a game's current hands and deck.
+
+        Hands are scored as ``Game.score_hands`` would: by their best five cards when
+        ``game.best_of_five`` is set, otherwise as a whole. Hands that end up with more
+        than five cards are scored with the added cards in id order, because the
+        original rules depend on card order for such hands.
+
+        Args:
+            game (Game): The game, after some cards have been dealt.
+            cards_per_hand (int): The number of cards each hand will hold.
+
+        Returns:
+            EquityResult: The probabilities for each player.
+        """
+        hands = {name: player.hand for name, player in game.players.items()}
+        return self.equity(hands, game.deck.cards, cards_per_hand, game.best_of_five)
+
+    def equity(self, hands: dict, deck: list, cards_per_hand: int, best_of_five=False):
+        """
+        Return the win probabilities for the given hands once each holds ``cards_per_hand`` cards.
+
+        Args:
+            hands (dict[str, list[Card]]): Each player's current cards, in seat order.
+            deck (list[Card]): The undealt cards the hands are completed from.
+            cards_per_hand (int): The final hand size.
+            best_of_five (bool, optional): Score hands by their best five cards. Defaults to False.
+
+        Returns:
+            EquityResult: The probabilities for each player.
+
+        Raises:
+            ValueError: If a hand already holds more cards than ``cards_per_hand`` or the
+                deck is too small to complete every hand.
+        """
+        names = list(hands)
+        hand_ids = [tuple(card.id for card in hands[name]) for name in names]
+        deck_ids = tuple(card.id for card in deck)
+        needed = [cards_per_hand - len(hand) for hand in hand_ids]
+        if any(count < 0 for count in needed):
+            raise ValueError("a hand already holds more than cards_per_hand cards")
+        if sum(needed) > len(deck_ids):
+            raise ValueError("not enough cards left to complete every hand")
+
+        # Large hands score differently depending on card order, see ``HandEvaluator.evaluate``,
+        # and relabelling suits reorders the card ids, so those states keep their own suits.
+        ordered = cards_per_hand > MAX_TABLE_CARDS and not best_of_five
+        if ordered:
+            state = (tuple(hand_ids), tuple(sorted(deck_ids)))
+        else:
+            state = canonical_state(hand_ids, deck_ids)
+        key = (state, cards_per_hand, best_of_five)
+        cache = self.cache
+        result = cache.get(key)
+        if result is None:
+            result = self._compute(hand_ids, deck_ids, needed, best_of_five, ordered)
+            cache[key] = result
+            if len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        wins, shares, exact, completions, error = result
+        return EquityResult(dict(zip(names, wins)), dict(zip(names, shares)), exact, completions, error)
+
+    def _strength_function(self, hand_ids, best_of_five):
+        """Return a memoized function from a tuple of added card ids to the hand's strength."""
+        evaluator = self.evaluator
+        base = [Card.from_id(card_id) for card_id in hand_ids]
+        base_code = sum(CARD_CODES[card_id] for card_id in hand_ids)
+        memo = {}
+
+        def strength(added):
+            value = memo.get(added)
+            if value is None:
+                hand = base + [Card.from_id(card_id) for card_id in added]
+                if best_of_five:
+                    value = evaluator.evaluate_best(hand)
+                else:
+                    value = evaluator.evaluate_code(base_code + sum(CARD_CODES[card_id] for card_id in added), hand)
+                memo[added] = value
+            return value
+
+        return strength
+
+    def _compute(self, hand_ids, deck_ids, needed, best_of_five, ordered=False):
+        strengths = [self._strength_function(hand, best_of_five) for hand in hand_ids]
+        total = completion_count(needed, len(deck_ids))
+        if total <= self.max_exact:
+            wins, shares = self._enumerate(hand_ids, sorted(deck_ids), needed, strengths, ordered)
+            exact, completions, error = True, total, 0.0
+        else:
+            completions = math.ceil((Z_95 / (2 * self.error)) ** 2)  # Worst case, p = 0.5
+            wins, shares = self._sample(deck_ids, needed, strengths, completions)
+            exact, error = False, self.error
+            total = completions
+        return [count / total for count in wins], [share / total for share in shares], exact, completions, error
+
+    def _symmetries(self, hand_ids, deck_ids):
+        """Return the suit permutations that map every hand and the deck onto themselves."""
+        # Compare sorted lists, not sets, so that the copies of a card in a multi-deck shoe count.
+        groups = [sorted(hand) for hand in hand_ids] + [sorted(deck_ids)]
+        return [perm for perm in SUIT_PERMUTATIONS
+                if all(sorted([perm[card_id] for card_id in cards]) == cards for cards in groups)]
+
+    def _enumerate(self, hand_ids, deck_ids, needed, strengths, ordered=False):
+        seats = len(needed)
+        wins = [0] * seats
+        shares = [0.0] * seats
+
+        def deal(seat, remaining, best, tied, weight):
+            if seat == seats:
+                wins[tied[0]] += weight
+                for winner in tied:
+                    shares[winner] += weight / len(tied)
+                return
+            strength = strengths[seat]
+            last = seat + 1 == seats
+            # Pick positions rather than ids, so each copy of a card in a multi-deck shoe is dealt once.
+            for picked in itertools.combinations(range(len(remaining)), needed[seat]):
+                added = tuple([remaining[index] for index in picked])
+                value = strength(added)
+                if best is None or value > best:
+                    next_best, next_tied = value, (seat,)
+                elif value == best:
+                    next_best, next_tied = best, tied + (seat,)
+                else:
+                    next_best, next_tied = best, tied
+                if last:
+                    rest = ()
+                else:
+                    rest = list(remaining)
+                    for index in reversed(picked):
+                        del rest[index]
+                deal(seat + 1, rest, next_best, next_tied, weight)
+
+        # The first player's completions that are suit relabellings of each other
+        # lead to the same outcomes, so only one of each class is expanded. That
+        # does not hold for hands scored in card order.
+        symmetries = [] if ordered else self._symmetries(hand_ids, deck_ids)
+        if len(symmetries) > 1 and seats and needed[0]:
+            classes = {}
+            for added in itertools.combinations(deck_ids, needed[0]):
+                canonical = min(tuple(sorted(perm[card_id] for card_id in added)) for perm in symmetries)
+                classes[canonical] = classes.get(canonical, 0) + 1
+            value_of = strengths[0]
+            for added, weight in classes.items():
+                rest = list(deck_ids)
+                for card_id in added:
+                    rest.remove(card_id)
+                deal(1, rest, value_of(added), (0,), weight)
+        else:
+            deal(0, list(deck_ids), None, (), 1)
+        return wins, shares
+
+    def _sample(self, deck_ids, needed, strengths, samples):
+        seats = len(needed)
+        wins = [0] * seats
+        shares = [0.0] * seats
+        dealt = sum(needed)
+        bounds = list(itertools.accumulate([0] + needed))
+        sample = self.rng.sample
+        for _ in range(samples):
+            cards = sample(deck_ids, dealt)
+            values = [strengths[seat](tuple(sorted(cards[bounds[seat]:bounds[seat + 1]]))) for seat in range(seats)]
+            best = max(values)
+            tied = [seat for seat, value in enumerate(values) if value == best]
+            wins[tied[0]] += 1
+            for winner in tied:
+                shares[winner] += 1 / len(tied)
+        return wins, shares
@@ -0,0 +1,264 @@
+"""
+A bounded, thread-safe memo in front of a ``HandEvaluator``.
+
+Many simulated hands are the same hand up to card order or a relabelling of
+suits. ``CachedEvaluator`` stores strengths under a canonical key that
+forgets exactly what the wrapped evaluator ignores. The keys depend on the
+evaluator's rules, so each supported evaluator type has its own pair of key
+functions in ``KEY_FUNCTIONS``, and other evaluators are refused:
+
+    - ``HandEvaluator.evaluate``: the original rules only look at the ranks
+      and at whether every non-Joker card shares a suit, see ``hand_key``.
+    - ``WildcardEvaluator.evaluate``: Jokers are substituted after the other
+      cards, so large hands also keep the order of every other card, see
+      ``wildcard_hand_key``.
+    - ``evaluate_best`` of either: if no suit can fill a 5-card flush, even
+      with the Jokers, suits are dropped and the key is the rank multiset.
+      Otherwise the key keeps the ranks of each suit, with the suits
+      themselves sorted away.
+
+Hands of up to ``MAX_TABLE_CARDS`` cards, the usual ``Game`` deal, are not
+cached. The evaluator's lookup tables are already a complete memo under the
+same key (the summed card codes), so a cache could at best repeat that one
+dictionary lookup. Such hands are passed straight through, which costs one
+extra method call: ``python -m benchmarks.bench_eval_cache`` measures it at
+about 0.8x of the bare evaluator per call, and much less per game, since the
+game's other work dominates. The cache pays off from six cards up.
+"""
+import threading
+from collections import OrderedDict
+
+from models.evaluator import CARD_CODES, MAX_TABLE_CARDS, RANK_BITS, RANK_KEY_BITS, RANK_KEY_MASK, _ONE_SUIT, \
+    HandEvaluator
+from models.wildcard import WildcardEvaluator
+
+EVICTION_POLICIES = ("lru", "fifo")
+
+# Summed card codes hold three bits per rank, so they identify the rank multiset
+# of any hand of up to seven cards; larger hands use explicit tuples.
+MAX_CODE_KEY_CARDS = 7
+_FLUSH_FLAG = 1 << RANK_KEY_BITS
+_BEST_FLAG = 1 << RANK_KEY_BITS + 1
+_JOKER_SHIFT = RANK_BITS * 13
+# One bit per rank held at least twice (for counts up to five)
+_REPEATED_MASK = sum(0b110 << RANK_BITS * rank for rank in range(13))
+
+
+def _flush_flag(hand):
+    """
+    Return ``_FLUSH_FLAG`` if every non-Joker card of a hand shares a suit, else 0.
+
+    The four-bit suit counts of a summed code overflow from sixteen cards of a
+    suit, which a shoe hand can hold, so large hands count suits explicitly.
+    """
+    suits = {card.suit_index for card in hand if card.value != 15}
+    return _FLUSH_FLAG if len(suits) == 1 else 0
+
+
+def hand_key(hand):
+    """
+    Return the cache key for ``HandEvaluator.evaluate``.
+
+    The key is the rank multiset plus the flush flag. For hands larger than
+    ``MAX_TABLE_CARDS`` it also records, in order of first appearance, the ranks
+    held more than once: the original rules pick the first such rank when a
+    hand has several trips or pairs, and nothing else depends on card order.
+    Hands with equal keys have equal strengths.
+    """
+    if len(hand) > MAX_CODE_KEY_CARDS:
+        return _flush_flag(hand), tuple(card.value for card in hand)
+    code = 0
+    for card in hand:
+        code += CARD_CODES[card.id]
+    rank_key = code & RANK_KEY_MASK
+    if code >> RANK_KEY_BITS in _ONE_SUIT:
+        rank_key |= _FLUSH_FLAG
+    if len(hand) <= MAX_TABLE_CARDS:
+        return rank_key
+    repeated = code & _REPEATED_MASK
+    if not repeated & (repeated - 1):
+        return rank_key  # At most one repeated rank, so order cannot matter
+    order = []
+    for card in hand:
+        if card.value not in order:
+            order.append(card.value)
+    return rank_key, tuple(value for value in order if value != 15 and code >> RANK_BITS * (value - 2) & 6)
+
+
+def wildcard_hand_key(hand):
+    """
+    Return the cache key for ``WildcardEvaluator.evaluate``.
+
+    Up to ``MAX_TABLE_CARDS`` cards this is ``hand_key``. Larger hands are
+    scored by appending substitutes for the Jokers to the other cards, and a
+    substitute can repeat any rank, so the key keeps the order of every
+    non-Joker card. Hands with equal keys have equal strengths.
+    """
+    if len(hand) <= MAX_TABLE_CARDS:
+        return hand_key(hand)
+    if len(hand) > MAX_CODE_KEY_CARDS:
+        return _flush_flag(hand), tuple(card.value for card in hand if card.value != 15)
+    code = 0
+    for card in hand:
+        code += CARD_CODES[card.id]
+    rank_key = code & RANK_KEY_MASK
+    if code >> RANK_KEY_BITS in _ONE_SUIT:
+        rank_key |= _FLUSH_FLAG
+    return rank_key, tuple(card.value for card in hand if card.value != 15)
+
+
+def best_key(hand):
+    """
+    Return the cache key for ``HandEvaluator.evaluate_best``.
+
+    Hands with equal keys have equal strengths.
+    """
+    if len(hand) <= 5:
+        return hand_key(hand)
+    if len(hand) <= MAX_CODE_KEY_CARDS:
+        code = 0
+        for card in hand:
+            code += CARD_CODES[card.id]
+        suits = code >> RANK_KEY_BITS
+        longest = max(suits & 15, suits >> 4 & 15, suits >> 8 & 15, suits >> 12 & 15)
+        if longest + (code >> _JOKER_SHIFT & 7) < 5:
+            return code & RANK_KEY_MASK | _BEST_FLAG
+    jokers = sum(card.value == 15 for card in hand)
+    by_suit = ([], [], [], [])
+    for card in hand:
+        if card.value != 15:
+            by_suit[card.suit_index].append(card.value)
+    if max(map(len, by_suit)) + jokers < 5:
+        return "best", tuple(sorted(card.value for card in hand))
+    return "best-suited", jokers, tuple(sorted(tuple(sorted(values)) for values in by_suit))
+
+
+# The key functions for ``evaluate`` and ``evaluate_best`` of each evaluator type.
+KEY_FUNCTIONS = {
+    HandEvaluator: (hand_key, best_key),
+    WildcardEvaluator: (wildcard_hand_key, best_key),
+}
+
+
+class CachedEvaluator:
+    """
+    Wrap an evaluator with a bounded cache of hand strengths.
+
+    The wrapper has the same interface as ``HandEvaluator``; methods it does
+    not cache are passed through to the wrapped evaluator. It is safe to share
+    one instance between threads and between games.
+    """
+
+    def __init__(self, evaluator: HandEvaluator = None, capacity=65536, policy="lru"):
+        """
+        Initialize a CachedEvaluator.
+
+        Args:
+            evaluator (HandEvaluator, optional): The evaluator to wrap, a ``HandEvaluator`` or a
+                ``WildcardEvaluator``. Defaults to a new HandEvaluator.
+            capacity (int, optional): The most strengths to keep. Defaults to 65536.
+            policy (str, optional): Which entry to evict when full: ``"lru"`` drops the least
+                recently used, ``"fifo"`` the oldest. Defaults to ``"lru"``.
+
+        Raises:
+            ValueError: If the capacity is not positive or the policy is unknown.
+            TypeError: If the evaluator is of a type without key functions in ``KEY_FUNCTIONS``;
+                keys built for other rules could give wrong strengths.
+        """
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"policy must be one of {EVICTION_POLICIES}")
+        evaluator = evaluator if evaluator is not None else HandEvaluator()
+        keys = KEY_FUNCTIONS.get(type(evaluator))
+        if keys is None:
+            raise TypeError(f"no cache keys for {type(evaluator).__name__}; "
+                            f"supported: {', '.join(cls.__name__ for cls in KEY_FUNCTIONS)}")
+        self.evaluator = evaluator
+        self._hand_key, self._best_key = keys
+        self.capacity = capacity
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __getattr__(self, name):
+        return getattr(self.evaluator, name)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key, compute, *args):
+        entries = self._entries
+        with self._lock:
+            strength = entries.get(key)
+            if strength is not None:
+                self.hits += 1
+                if self.policy == "lru":
+                    entries.move_to_end(key)
+                return strength
+            self.misses += 1
+        # Evaluate outside the lock; two threads may race to store the same value.
+        strength = compute(*args)
+        with self._lock:
+            if key not in entries:
+                entries[key] = strength
+                if len(entries) > self.capacity:
+                    entries.popitem(last=False)
+                    self.evictions += 1
+        return strength
+
+    def evaluate(self, hand):
+        """Return ``HandEvaluator.evaluate(hand)``, from the cache when possible."""
+        if len(hand) <= MAX_TABLE_CARDS:
+            return self.evaluator.evaluate(hand)
+        return self._lookup(self._hand_key(hand), self.evaluator.evaluate, hand)
+
+    def evaluate_code(self, code: int, hand):
+        """Return ``HandEvaluator.evaluate_code(code, hand)``, from the cache when possible."""
+        if len(hand) <= MAX_TABLE_CARDS:
+            return self.evaluator.evaluate_code(code, hand)
+        return self._lookup(self._hand_key(hand), self.evaluator.evaluate_code, code, hand)
+
+    def evaluate_codes(self, codes, hands):
+        """Return ``HandEvaluator.evaluate_codes(codes, hands)``, using the cache for large hands."""
+        if all(len(hand) <= MAX_TABLE_CARDS for hand in hands):
+            return self.evaluator.evaluate_codes(codes, hands)
+        return list(map(self.evaluate_code, codes, hands))
+
+    def evaluate_hands(self, hands):
+        """Return ``HandEvaluator.evaluate_hands(hands)``, using the cache for large hands."""
+        hands = list(hands)
+        if all(len(hand) <= MAX_TABLE_CARDS for hand in hands):
+            return self.evaluator.evaluate_hands(hands)
+        return list(map(self.evaluate, hands))
+
+    def evaluate_best(self, hand):
+        """Return ``HandEvaluator.evaluate_best(hand)``, from the cache when possible."""
+        if len(hand) <= MAX_TABLE_CARDS:
+            return self.evaluator.evaluate(hand)
+        return self._lookup(self._best_key(hand), self.evaluator.evaluate_best, hand)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``evictions``, ``size``, ``capacity`` and ``hit_rate``.
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "size": len(self._entries), "capacity": self.capacity, "hit_rate": self.hit_rate}
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,677 @@
+"""
+Table-driven hand evaluation.
+
+For hands of up to five cards, ``Game.evaluate_hand`` only looks at two things:
+the multiset of ranks (with Jokers counted separately) and whether every
+non-Joker card shares a suit.
+``HandEvaluator`` precomputes the result for every such combination once per hand
+size, caches the tables on disk, and reduces each hand to a single integer
+strength. Comparing two strengths gives the same answer as the original
+``(hand_type, values)`` comparison in ``Game.determine_winner``.
+
+Run ``python -m models.evaluator verify`` to check the tables against the
+reference evaluator on every 5-card hand (add ``--jokers`` to include Jokers).
+"""
+import itertools
+import json
+import os
+import sys
+from collections import Counter
+
+from models.card import Card, STANDARD_CARDS, JOKERS
+
+HAND_RANKINGS = {
+    "Straight Flush": 8,
+    "Four of a Kind": 7,
+    "Full House": 6,
+    "Flush": 5,
+    "Straight": 4,
+    "Three of a Kind": 3,
+    "Two Pair": 2,
+    "One Pair": 1,
+    "High Card": 0,
+    "Wildcard Hand": 9  # Joker cases get the highest priority
+}
+CATEGORY_NAMES = {category: name for name, category in HAND_RANKINGS.items()}
+
+# A strength is the hand category followed by the tie-break values, four bits
+# per value, left-aligned so that shorter value lists compare like Python lists.
+VALUE_BITS = 4
+TIEBREAK_SLOTS = 54
+TIEBREAK_BITS = VALUE_BITS * TIEBREAK_SLOTS
+
+# Per-card lookup codes. Summing the codes of a hand gives a rank histogram
+# (three bits per rank, Jokers last) and, above it, a per-suit card count.
+# Flush classes are stored under the full code, everything else under the
+# rank histogram alone, so a lookup never has to inspect the suit counts.
+# ``Card.code`` holds the same value on each card, which saves hot paths the
+# tuple lookup.
+RANK_BITS = 3
+RANK_KEY_BITS = RANK_BITS * 14
+RANK_KEY_MASK = (1 << RANK_KEY_BITS) - 1
+SUIT_BITS = 4
+CARD_CODES = tuple(
+    (1 << RANK_BITS * 13) if card.rank == "Joker"
+    else (1 << RANK_BITS * (card.value - 2)) | (1 << (RANK_KEY_BITS + SUIT_BITS * card.suit_index))
+    for card in STANDARD_CARDS + JOKERS
+)
+
+# Up to five cards the original rules only depend on the rank multiset and the
+# flush flag. With six or more cards, hands such as three pairs or two trips
+# are resolved by card order, so those sizes use the reference evaluator.
+MAX_TABLE_CARDS = 5
+TABLE_FORMAT = 3
+
+# Lookup tables by hand size, shared by every HandEvaluator.
+_tables = {}
+
+# Codes whose suit counts are all in one suit, i.e. flush candidates.
+_ONE_SUIT = frozenset(count << SUIT_BITS * suit for suit in range(4) for count in range(1, 1 << SUIT_BITS))
+
+# ``_tables[5]`` once it is loaded, and its rank-histogram entries on their
+# own. The 5-card path goes straight to these: a hand that is not a flush
+# candidate is one lookup in the smaller table, which stays in cache.
+_five_card_table = {}
+_five_card_ranks = {}
+
+# Tables from the same keys straight to ``(hand_name, values)``, by table name
+# and hand size. Built from the strength tables on first use.
+_described_tables = {}
+
+
+def reference_evaluate(hand):
+    """
+    Evaluate a hand with the original rules and return ``(hand_name, values)``.
+
+    This is the algorithm ``Game.evaluate_hand`` used before the lookup tables
+    existed. It is kept as the ground truth the tables are built from and
+    verified against.
+    """
+    if not hand:
+        return ("No Cards", [])
+
+    # Separate out Joker and non-Joker cards
+    non_joker_cards = [card for card in hand if card.rank != "Joker"]
+    joker_count = sum(1 for card in hand if card.rank == "Joker")
+
+    ranks = [card.rank for card in non_joker_cards]
+    suits = [card.suit for card in non_joker_cards]
+    rank_counts = Counter(ranks)
+    unique_ranks = sorted([Card.rank_values[r] for r in ranks])
+
+    is_flush = len(set(suits)) == 1
+    is_straight = all(unique_ranks[i] + 1 == unique_ranks[i + 1] for i in range(len(unique_ranks) - 1))
+
+    # Handle Joker used for completing a Straight or other combinations
+    if joker_count > 0:
+        # Try to form a Straight by adding the Joker if possible
+        if not is_straight:  # If it's not already a straight
+            # Sort the unique ranks
+            unique_ranks = sorted([Card.rank_values[r] for r in ranks])
+
+            # Look for gaps in the sequence
+            for i in range(1, len(unique_ranks)):
+                if unique_ranks[i] != unique_ranks[i-1] + 1:
+                    # If there's a gap, use the Joker to complete the sequence
+                    # The Joker can fill the gap by assuming the missing rank
+                    missing_rank = unique_ranks[i-1] + 1
+                    unique_ranks.append(missing_rank)
+                    unique_ranks.sort()
+                    break  # Joker has been used, no need to continue
+
+            # Re-check if the hand forms a straight after the modification
+            is_straight = all(unique_ranks[i] + 1 == unique_ranks[i + 1] for i in range(len(unique_ranks) - 1))
+
+    # Now handle hand evaluations based on the updated ranks
+    if is_flush and is_straight:
+        return ("Straight Flush", unique_ranks)
+    elif 4 in rank_counts.values():
+        four_kind = [rank for rank, count in rank_counts.items() if count == 4]
+        kicker = sorted([Card.rank_values[rank] for rank in ranks if rank != four_kind[0]], reverse=True)
+        return ("Four of a Kind", [Card.rank_values[four_kind[0]]] + kicker)
+    elif 3 in rank_counts.values() and 2 in rank_counts.values():
+        three_kind = [rank for rank, count in rank_counts.items() if count == 3]
+        pair = [rank for rank, count in rank_counts.items() if count == 2]
+        return ("Full House", [Card.rank_values[three_kind[0]], Card.rank_values[pair[0]]])
+    elif is_flush:
+        return ("Flush", sorted(unique_ranks, reverse=True))
+    elif is_straight:
+        return ("Straight", unique_ranks)
+    elif 3 in rank_counts.values():
+        three_kind = [rank for rank, count in rank_counts.items() if count == 3]
+        kicker = sorted([Card.rank_values[rank] for rank in ranks if rank != three_kind[0]], reverse=True)
+        return ("Three of a Kind", [Card.rank_values[three_kind[0]]] + kicker)
+    elif list(rank_counts.values()).count(2) == 2:
+        pairs = sorted([Card.rank_values[rank] for rank, count in rank_counts.items() if count == 2], reverse=True)
+        kicker = sorted([Card.rank_values[rank] for rank in ranks if rank not in pairs], reverse=True)
+        return ("Two Pair", pairs + kicker)
+    elif 2 in rank_counts.values():
+        pair = [rank for rank, count in rank_counts.items() if count == 2]
+        kicker = sorted([Card.rank_values[rank] for rank in ranks if rank != pair[0]], reverse=True)
+        return ("One Pair", [Card.rank_values[pair[0]]] + kicker)
+    else:
+        return ("High Card", sorted([Card.rank_values[rank] for rank in ranks], reverse=True))
+
+
+def pack(hand_name: str, values: list[int]):
+    """
+    Encode a ``(hand_name, values)`` result as a single integer strength.
+
+    Raises:
+        ValueError: If the hand name is unknown or there are too many values.
+    """
+    if hand_name not in HAND_RANKINGS or len(values) > TIEBREAK_SLOTS:
+        raise ValueError(f"cannot encode {hand_name} with values {values}")
+    strength = HAND_RANKINGS[hand_name]
+    for value in values:
+        strength = strength << VALUE_BITS | value
+    return strength << VALUE_BITS * (TIEBREAK_SLOTS - len(values))
+
+
+def describe(strength: int):
+    """
+    Decode a strength produced by ``pack`` back into ``(hand_name, values)``.
+    """
+    values = []
+    tiebreak = strength & ((1 << TIEBREAK_BITS) - 1)
+    shift = TIEBREAK_BITS - VALUE_BITS
+    while shift >= 0 and tiebreak:
+        values.append(tiebreak >> shift & 0xF)
+        tiebreak &= (1 << shift) - 1
+        shift -= VALUE_BITS
+    return CATEGORY_NAMES[strength >> TIEBREAK_BITS], values
+
+
+def cache_dir():
+    """Return the directory used for on-disk lookup tables."""
+    return os.environ.get("CARD_GAME_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "card-game-simulator")
+
+
+def _representatives(size: int):
+    """
+    Yield ``(table_key, hand)`` for every distinct evaluation class of the given size.
+
+    A class is a rank multiset (at most four of each rank and two Jokers) plus
+    whether all non-Joker cards share a suit. Flush classes are yielded once per
+    suit, keyed by the full card code, including those with a repeated rank: a
+    shoe of several decks can deal the same card twice.
+    """
+    for jokers in range(min(size, len(JOKERS)) + 1):
+        for ranks in itertools.combinations_with_replacement(range(13), size - jokers):
+            counts = Counter(ranks)
+            if not size or counts and max(counts.values()) > 4:
+                continue
+            rank_key = sum(1 << RANK_BITS * rank for rank in ranks) + jokers * (1 << RANK_BITS * 13)
+            seen = Counter()
+            mixed = []
+            for rank in ranks:
+                mixed.append(STANDARD_CARDS[seen[rank] * 13 + rank])
+                seen[rank] += 1
+            if len(mixed) > 1 and all(card.suit_index == 0 for card in mixed):
+                mixed[-1] = STANDARD_CARDS[13 + ranks[-1]]
+            if len(mixed) != 1:
+                yield rank_key, mixed + list(JOKERS[:jokers])
+            if ranks:
+                flush = [STANDARD_CARDS[rank] for rank in ranks] + list(JOKERS[:jokers])
+                for suit in range(4):
+                    yield rank_key | len(ranks) << (RANK_KEY_BITS + SUIT_BITS * suit), flush
+
+
+class HandEvaluator:
+    """
+    Map hands to integer strengths through precomputed lookup tables.
+
+    Tables exist for hands of up to ``MAX_TABLE_CARDS`` cards and are shared by
+    every instance. They are built on first use and stored under ``cache_dir()``
+    so later processes can load them instead of rebuilding. Larger hands, and
+    hands that cannot come from a single deck, are scored with the reference
+    evaluator instead.
+    """
+
+    def __init__(self, use_disk_cache=True):
+        """
+        Initialize a HandEvaluator.
+
+        Args:
+            use_disk_cache (bool, optional): Read and write tables under ``cache_dir()``. Defaults to True.
+        """
+        self.use_disk_cache = use_disk_cache
+
+    # Where built tables are kept in memory and the file name prefix they are stored under.
+    _table_cache = _tables
+    _table_name = "hand_table"
+
+    def table(self, size: int):
+        """
+        Return the lookup table for hands with the given number of cards.
+
+        Args:
+            size (int): The number of cards in the hand.
+
+        Returns:
+            dict[int, int]: A mapping from table key to strength.
+        """
+        table = self._table_cache.get(size)
+        if table is None:
+            table = self._load(size) if self.use_disk_cache else None
+            if table is None:
+                table = self._build(size)
+                if self.use_disk_cache:
+                    self._store(size, table)
+            self._table_cache[size] = table
+            if size == 5 and self._table_cache is _tables:
+                global _five_card_table, _five_card_ranks
+                _five_card_table = table
+                _five_card_ranks = {key: strength for key, strength in table.items() if key <= RANK_KEY_MASK}
+        return table
+
+    def _build(self, size: int):
+        return {key: pack(*reference_evaluate(hand)) for key, hand in _representatives(size)}
+
+    def _path(self, size: int):
+        return os.path.join(cache_dir(), f"{self._table_name}_v{TABLE_FORMAT}_{size}.json")
+
+    def _load(self, size: int):
+        try:
+            with open(self._path(size)) as handle:
+                return {int(key): strength for key, strength in json.load(handle).items()}
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, size: int, table: dict):
+        path = self._path(size)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as handle:
+                json.dump(table, handle)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # The cache is an optimization; an unwritable directory is not an error.
+
+    def evaluate(self, hand):
+        """
+        Return the strength of a hand as a single integer.
+
+        Higher strengths are better hands; equal strengths are exact ties.
+
+        Args:
+            hand (list[Card]): The cards to evaluate. Must not be empty.
+
+        Returns:
+            int: The hand strength.
+        """
+        if len(hand) == 5:
+            # Unrolled for the common poker hand size, straight into its table
+            a, b, c, d, e = hand
+            code = a.code + b.code + c.code + d.code + e.code
+            if code >> RANK_KEY_BITS in _ONE_SUIT:
+                strength = _five_card_table.get(code)
+            else:
+                strength = _five_card_ranks.get(code & RANK_KEY_MASK)
+            if strength:
+                return strength
+        size = len(hand)
+        table = _tables.get(size)
+        if table is None and size <= MAX_TABLE_CARDS:
+            table = self.table(size)
+        if table:
+            code = 0
+            for card in hand:
+                code += card.code
+            strength = table.get(code) or table.get(code & RANK_KEY_MASK)
+            if strength:
+                return strength
+        return pack(*reference_evaluate(hand))
+
+    def evaluate_code(self, code: int, hand):
+        """
+        Return the strength of a hand whose summed ``CARD_CODES`` are already known.
+
+        ``Player`` keeps this sum up to date as cards come and go, which makes
+        scoring a player's hand a single table lookup.
+
+        Args:
+            code (int): The sum of ``CARD_CODES`` over the hand.
+            hand (list[Card]): The cards, used when the hand is too large for the tables.
+
+        Returns:
+            int: The hand strength.
+        """
+        table = _tables.get(len(hand))
+        if table is None and len(hand) <= MAX_TABLE_CARDS:
+            table = self.table(len(hand))
+        if table:
+            strength = table.get(code) or table.get(code & RANK_KEY_MASK)
+            if strength:
+                return strength
+        return pack(*reference_evaluate(hand))
+
+    def evaluate_codes(self, codes, hands):
+        """
+        Score many hands at once from their summed ``CARD_CODES``.
+
+        When every hand has the same size and that size has a table, the whole
+        batch is one pass of dictionary lookups with no per-hand method call;
+        only hands the table misses go through ``evaluate_code``. Mixed or large
+        hand sizes are scored one by one.
+
+        Args:
+            codes (list[int]): The sum of ``CARD_CODES`` over each hand.
+            hands (list[list[Card]]): The cards of each hand, in the same order.
+
+        Returns:
+            list[int]: The strength of each hand, in order.
+        """
+        sizes = set(map(len, hands))
+        size = sizes.pop() if len(sizes) == 1 else None
+        if size is None or not 0 < size <= MAX_TABLE_CARDS:
+            return list(map(self.evaluate_code, codes, hands))
+        get = self.table(size).get
+        strengths = [get(code) or get(code & RANK_KEY_MASK) for code in codes]
+        if not all(strengths):
+            evaluate_code = self.evaluate_code
+            for index, strength in enumerate(strengths):
+                if not strength:
+                    strengths[index] = evaluate_code(codes[index], hands[index])
+        return strengths
+
+    def evaluate_hands(self, hands):
+        """
+        Score many hands at once.
+
+        5-card hands are summed and looked up inline, exactly as ``evaluate``
+        does, without a method call per hand. Other sizes, and evaluators with
+        their own tables, go through ``evaluate``.
+
+        Args:
+            hands (Iterable[list[Card]]): The hands to score. None may be empty.
+
+        Returns:
+            list[int]: The strength of each hand, in order.
+        """
+        evaluate = self.evaluate
+        if self._table_cache is not _tables:
+            return list(map(evaluate, hands))
+        table, ranks = _five_card_table, _five_card_ranks
+        strengths = []
+        append = strengths.append
+        for hand in hands:
+            if len(hand) == 5:
+                a, b, c, d, e = hand
+                code = a.code + b.code + c.code + d.code + e.code
+                if code >> RANK_KEY_BITS in _ONE_SUIT:
+                    strength = table.get(code)
+                else:
+                    strength = ranks.get(code & RANK_KEY_MASK)
+                if strength:
+                    append(strength)
+                    continue
+            append(evaluate(hand))
+        return strengths
+
+    def evaluate_best(self, hand):
+        """
+        Return the strength of the best five-card hand that can be made from ``hand``.
+
+        Hands of up to five cards are scored as they are. ``MIN_BEST_OF_CARDS`` to
+        ``MAX_BEST_OF_CARDS`` cards are scored directly from rank and suit bitmasks
+        by ``best_five``; anything else enumerates every 5-card subset. Six cards
+        have only six subsets, and six table lookups beat ``best_five``.
+
+        Args:
+            hand (list[Card]): The cards to choose from.
+
+        Returns:
+            int: The strength of the best 5-card subset.
+        """
+        if len(hand) <= 5:
+            return self.evaluate(hand)
+        result = best_five(hand) if MIN_BEST_OF_CARDS <= len(hand) <= MAX_BEST_OF_CARDS else None
+        if result is None:
+            return self.naive_best(hand)
+        return pack(*result)
+
+    def naive_best(self, hand):
+        """
+        Return the best 5-card strength by evaluating every subset.
+
+        This is the reference for ``evaluate_best``.
+        """
+        return max(map(self.evaluate, itertools.combinations(hand, 5)))
+
+    def describe(self, strength: int):
+        """Decode a strength into ``(hand_name, values)``."""
+        return describe(strength)
+
+    def hand_name(self, strength: int):
+        """Return the name of the hand category a strength belongs to."""
+        return CATEGORY_NAMES[strength >> TIEBREAK_BITS]
+
+    def describe_hand(self, hand):
+        """
+        Return ``(hand_name, values)`` for a hand.
+
+        Gives the same result as ``describe(evaluate(hand))``, but for hands the
+        tables cover the description is a single lookup by the hand's code,
+        with nothing to decode.
+
+        Args:
+            hand (list[Card]): The cards to evaluate. Must not be empty.
+
+        Returns:
+            tuple[str, list[int]]: The hand name and its tie-break values.
+        """
+        described = _described_tables.get((self._table_name, len(hand)))
+        if described is None and len(hand) <= MAX_TABLE_CARDS:
+            described = self._described(len(hand))
+        if described:
+            code = 0
+            for card in hand:
+                code += card.code
+            result = described.get(code) or described.get(code & RANK_KEY_MASK)
+            if result:
+                return result[0], list(result[1])
+        return self.describe(self.evaluate(hand))
+
+    def _described(self, size: int):
+        table = self.table(size)
+        descriptions = {}
+        for strength in table.values():
+            if strength not in descriptions:
+                name, values = describe(strength)
+                descriptions[strength] = name, tuple(values)
+        described = {key: descriptions[strength] for key, strength in table.items()}
+        _described_tables[self._table_name, size] = described
+        return described
+
+
+# Hand sizes evaluate_best scores with best_five; see benchmarks/bench_best_hand.py.
+MIN_BEST_OF_CARDS = 7
+MAX_BEST_OF_CARDS = 9
+
+
+def _best_run(mask: int, jokers: int):
+    """
+    Return the best straight a set of ranks can make under the original Joker rules.
+
+    Without Jokers only five consecutive ranks count. With a Joker in the
+    subset, the remaining four cards count if they are consecutive (and the Joker
+    is not added to the values) or if exactly one inner rank is missing (and the
+    Joker fills it). Two Jokers work the same way with three cards. Values are
+    compared as lists, so the highest starting rank wins and then the longest run.
+
+    Args:
+        mask (int): The ranks available, as bits ``1 << value``.
+        jokers (int): The number of Jokers available.
+
+    Returns:
+        tuple[int, int] or None: The starting rank and length of the values, or None.
+    """
+    for start in range(14, 1, -1):
+        if not mask >> start & 1:
+            continue
+        window5 = mask >> start & 0b11111 if start <= 10 else 0
+        window4 = mask >> start & 0b1111 if start <= 11 else 0
+        if window5 == 0b11111:
+            return start, 5
+        if jokers >= 1 and window5 & 0b10000 and bin(window5).count("1") == 4:
+            return start, 5
+        if jokers >= 1 and window4 == 0b1111:
+            return start, 4
+        if jokers >= 2 and window4 & 0b1000 and bin(window4).count("1") == 3:
+            return start, 4
+        if jokers >= 2 and start <= 12 and mask >> start & 0b111 == 0b111:
+            return start, 3
+    return None
+
+
+# Lookup tables over the 2**13 rank bitmasks (bit ``value - 2``), built on first
+# use: the ranks present from highest to lowest, and the best run for 0-2 Jokers.
+_RANKS_BY_MASK = []
+_RUNS_BY_MASK = []
+
+
+def _build_mask_tables():
+    for mask in range(1 << 13):
+        _RANKS_BY_MASK.append(tuple(value for value in range(14, 1, -1) if mask >> (value - 2) & 1))
+    for jokers in range(3):
+        runs = [_best_run(mask << 2, jokers) for mask in range(1 << 13)]
+        _RUNS_BY_MASK.append([list(range(run[0], run[0] + run[1])) if run else None for run in runs])
+
+
+def best_five(hand):
+    """
+    Find the best 5-card result in a hand of six or more cards without enumerating subsets.
+
+    Categories are tried from the top. For each one, the best values any
+    subset could reach are built directly from the rank counts and the per-suit
+    rank bitmasks, following the original rules, Joker quirks included. The
+    first category that some subset reaches is the answer.
+
+    Args:
+        hand (list[Card]): Six or more cards.
+
+    Returns:
+        tuple[str, list[int]] or None: The best ``(hand_name, values)``, or None for
+        hands this shortcut does not cover (more than two Jokers, or the same card twice).
+    """
+    if not _RANKS_BY_MASK:
+        _build_mask_tables()
+    counts = [0] * 15
+    suit_masks = [0, 0, 0, 0]
+    jokers = 0
+    for card in hand:
+        if card.value == 15:
+            jokers += 1
+        else:
+            counts[card.value] += 1
+            suit_masks[card.suit_index] |= 1 << (card.value - 2)
+    if jokers > 2:
+        return None
+    suit_sizes = [len(_RANKS_BY_MASK[mask]) for mask in suit_masks]
+    if sum(suit_sizes) != len(hand) - jokers:
+        return None
+    runs = _RUNS_BY_MASK[jokers]
+
+    # Straight flush: a run inside one suit
+    best_run = None
+    for mask, size in zip(suit_masks, suit_sizes):
+        if size >= 5 - jokers:
+            run = runs[mask]
+            if run and (best_run is None or run > best_run):
+                best_run = run
+    if best_run:
+        return "Straight Flush", best_run
+
+    singles, pairs, trips, quads = [], [], [], []
+    for value in range(14, 1, -1):
+        count = counts[value]
+        if count:
+            singles.append(value)
+            if count >= 2:
+                pairs.append(value)
+                if count >= 3:
+                    trips.append(value)
+                    if count >= 4:
+                        quads.append(value)
+
+    if quads:
+        quad = quads[0]
+        return "Four of a Kind", [quad] + [value for value in singles if value != quad][:1]
+
+    if trips:
+        full = [value for value in pairs if value != trips[0]]
+        if full:
+            return "Full House", [trips[0], full[0]]
+
+    best_flush = None
+    for mask, size in zip(suit_masks, suit_sizes):
+        if size < 5 - jokers:
+            continue
+        ranks = _RANKS_BY_MASK[mask]
+        options = [list(ranks[:5])] if size >= 5 else []
+        for used in range(1, jokers + 1):
+            if size >= 5 - used:
+                chosen = list(ranks[:5 - used])
+                filled = chosen[-1] + 1  # The Joker fills the first gap above the lowest card
+                while filled in chosen:
+                    filled += 1
+                options.append(sorted(chosen + [filled], reverse=True))
+        for option in options:
+            if best_flush is None or option > best_flush:
+                best_flush = option
+    if best_flush:
+        return "Flush", best_flush
+
+    run = runs[suit_masks[0] | suit_masks[1] | suit_masks[2] | suit_masks[3]]
+    if run:
+        return "Straight", run
+
+    if trips:
+        return "Three of a Kind", [trips[0]] + [value for value in singles if value != trips[0]][:2]
+
+    if len(pairs) >= 2:
+        top_pairs = pairs[:2]
+        kicker = [value for value in singles if value not in top_pairs][:1]
+        # The original rules list every rank of the subset after the two pairs
+        return "Two Pair", top_pairs + sorted(top_pairs * 2 + kicker, reverse=True)
+
+    if pairs:
+        return "One Pair", [pairs[0]] + [value for value in singles if value != pairs[0]][:3]
+
+    return "High Card", singles[:5]
+
+
+
+def verify(evaluator=None, include_joker=False):
+    """
+    Compare the lookup tables with the reference evaluator on every 5-card hand.
+
+    Args:
+        evaluator (HandEvaluator, optional): The evaluator to check. Defaults to a new one.
+        include_joker (bool, optional): Also check hands containing Jokers. Defaults to False.
+
+    Returns:
+        int: The number of hands checked.
+
+    Raises:
+        AssertionError: On the first hand where the two disagree.
+    """
+    evaluator = evaluator or HandEvaluator()
+    checked = 0
+    cards = STANDARD_CARDS + JOKERS if include_joker else STANDARD_CARDS
+    for hand in itertools.combinations(cards, 5):
+        expected = pack(*reference_evaluate(hand))
+        assert evaluator.evaluate(hand) == expected, f"mismatch for {hand}"
+        checked += 1
+    return checked
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["verify"] and sys.argv[2:] in ([], ["--jokers"]):
+        print(f"verified {verify(include_joker=sys.argv[2:] == ['--jokers'])} hands")
+    else:
+        print("usage: python -m models.evaluator verify [--jokers]")
+        sys.exit(2)
@@ -0,0 +1,168 @@
+"""
+Typed game events and the sinks that receive them.
+
+``Game`` reports what happens through an event sink instead of printing. Every
+sink has an ``enabled`` flag; when it is False, ``Game`` skips building the
+event altogether, so a ``NullSink`` costs one attribute check per event.
+"""
+import json
+import pprint
+from collections import deque
+from typing import NamedTuple
+
+
+class DealEvent(NamedTuple):
+    """Cards were dealt to a player by one call to ``Game.deal``."""
+    player: str
+    cards: list
+    kind = "deal"
+
+
+class HandsShownEvent(NamedTuple):
+    """Every player's hand was shown."""
+    hands: dict
+    kind = "hands_shown"
+
+
+class HandEvaluatedEvent(NamedTuple):
+    """A player's hand was evaluated while determining the winner."""
+    player: str
+    hand_type: str
+    values: list
+    kind = "hand_evaluated"
+
+
+class WinnerEvent(NamedTuple):
+    """The single-hand winner was determined."""
+    player: str
+    hand_type: str
+    kind = "winner"
+
+
+class RoundStartedEvent(NamedTuple):
+    """A new round of play started."""
+    kind = "round_started"
+
+
+class PlayEvent(NamedTuple):
+    """A player played a card in the current round."""
+    player: str
+    card: object
+    kind = "play"
+
+
+class RoundWonEvent(NamedTuple):
+    """A player won the current round."""
+    player: str
+    kind = "round_won"
+
+
+def event_to_dict(event):
+    """
+    Convert an event to a JSON-serializable dict.
+
+    Cards are written as their string representation, e.g. ``"K♠"``.
+    """
+    def plain(value):
+        if isinstance(value, dict):
+            return {key: plain(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [plain(item) for item in value]
+        if isinstance(value, (str, int, float, bool)) or value is None:
+            return value
+        return repr(value)
+
+    return {"event": event.kind, **{field: plain(value) for field, value in event._asdict().items()}}
+
+
+class NullSink:
+    """Discard every event."""
+    enabled = False
+
+    def emit(self, event):
+        pass
+
+    def close(self):
+        pass
+
+
+class ConsoleSink:
+    """Print events the way the game always has."""
+    enabled = True
+
+    def emit(self, event):
+        kind = event.kind
+        if kind == "play":
+            print(f"{event.player} plays {event.card}")
+        elif kind == "round_started":
+            print("\n--- New Round ---")
+        elif kind == "round_won":
+            print(f"🏆 {event.player} wins the round!\n")
+        elif kind == "hand_evaluated":
+            print(f"{event.player} has {event.hand_type} with value {event.values}")
+        elif kind == "hands_shown":
+            pprint.pprint(event.hands)
+
+    def close(self):
+        pass
+
+
+class RingBufferSink:
+    """Keep the most recent events in memory."""
+    enabled = True
+
+    def __init__(self, capacity=1024):
+        """
+        Initialize a RingBufferSink.
+
+        Args:
+            capacity (int, optional): The number of events to keep. Defaults to 1024.
+        """
+        self.events = deque(maxlen=capacity)
+
+    def emit(self, event):
+        self.events.append(event)
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink:
+    """Write events as JSON lines, buffered in memory between writes."""
+    enabled = True
+
+    def __init__(self, path: str, buffer_size=4096):
+        """
+        Initialize a JsonLinesSink.
+
+        Args:
+            path (str): The file to append events to.
+            buffer_size (int, optional): Events to collect before writing. Defaults to 4096.
+        """
+        self.file = open(path, "a", encoding="utf-8")
+        self.buffer_size = buffer_size
+        self.buffer = []
+
+    def emit(self, event):
+        self.buffer.append(json.dumps(event_to_dict(event), ensure_ascii=False))
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered events to the file."""
+        if self.buffer:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        """Flush buffered events and close the file."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
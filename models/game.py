@@ -1,23 +1,70 @@
-from collections import Counter
-from models.card import Card
+from models.equity import EquityCalculator
+from models.evaluator import HandEvaluator
 from models.player import Player
-from models.deck import Deck
-import pprint
+from models.ranking import Ranking
+from models.deck import CompactDeck, Deck, Shoe
+from models.events import (ConsoleSink, DealEvent, HandEvaluatedEvent, HandsShownEvent, PlayEvent,
+                           RoundStartedEvent, RoundWonEvent, WinnerEvent)
 
 class Game:
-    def __init__(self, player_names: list[str], include_joker=False):
+    def __init__(self, player_names: list[str], include_joker=False, rng=None, compact=False, sink=None,
+                 best_of_five=False, evaluator=None, decks=1, penetration=0.75):
         """
         Initialize a Game object with a given set of players.
 
         Args:
             player_names (list[str]): A list of player names.
             include_joker (bool, optional): Include two Jokers in the deck. Defaults to False.
+            rng (random.Random, optional): The random generator used for shuffling. Defaults to the global ``random`` module.
+            compact (bool, optional): Use an array-backed CompactDeck. Defaults to False.
+            sink (optional): Receives game events, see ``models.events``. Defaults to a ConsoleSink,
+                which prints them. Pass a NullSink for headless runs.
+            best_of_five (bool, optional): Score each hand by its best 5-card subset instead of as
+                a whole, for variants that deal more than five cards. Defaults to False.
+            evaluator (optional): Scores hands, e.g. a ``CachedEvaluator`` shared between games.
+                Defaults to a new HandEvaluator.
+            decks (int, optional): Deal from a ``Shoe`` of this many decks when more than one.
+                Defaults to 1.
+            penetration (float, optional): The fraction of a shoe dealt before it is reshuffled.
+                Defaults to 0.75.
         """
-        self.deck = Deck(include_joker=include_joker)
+        if decks > 1:
+            self.deck = Shoe(decks, include_joker=include_joker, rng=rng, penetration=penetration)
+        else:
+            deck_class = CompactDeck if compact else Deck
+            self.deck = deck_class(include_joker=include_joker, rng=rng)
         self.deck.shuffle()
         self.players = {name: Player(name) for name in player_names}
         self.turn_order = list(self.players.keys())  # Order of play
         self.round_winner = None
+        self.evaluator = evaluator if evaluator is not None else HandEvaluator()
+        self.sink = sink if sink is not None else ConsoleSink()
+        self.best_of_five = best_of_five
+        self.equity_calculator = None
+
+    def reset(self, rng=None):
+        """
+        Start a new game with the same players, reusing this game's deck and players.
+
+        Every card goes back to the deck, which is reshuffled, every hand is emptied
+        in place and the round winner is cleared. The new game deals exactly like a
+        new ``Game`` whose deck is shuffled with the same generator state, but
+        without building a new deck, new players or new hand storage, so one game
+        can be pooled and reused for millions of deals. A ``Shoe`` is refilled once
+        its cut card is out, or by ``deal`` when too few cards are left for the
+        next deal; until then new games deal on from it.
+
+        Args:
+            rng (random.Random, optional): A generator to shuffle with from now on.
+                Defaults to the deck's current one.
+        """
+        if rng is not None:
+            self.deck.rng = rng
+        self.deck.reset()
+        self.deck.shuffle()
+        for player in self.players.values():
+            player.reset()
+        self.round_winner = None
 
     def deal(self, num_cards: int=None):
         """
@@ -28,23 +75,39 @@ class Game:
 
         Returns:
             None
+
+        Raises:
+            ValueError: If the game deals from a ``Shoe`` that cannot cover the deal
+                without a refill while players still hold cards.
         """
-        
-        for _ in range(num_cards) if num_cards else range(len(self.deck.cards)):
+        if num_cards and isinstance(self.deck, Shoe):
+            needed = num_cards * len(self.players)
+            if needed > len(self.deck) and any(player.hand for player in self.players.values()):
+                raise ValueError(f"{len(self.deck)} cards left in the shoe cannot deal {needed}")
+            self.deck.reserve(needed)
+        if self.sink.enabled:
+            dealt_from = {name: len(player.hand) for name, player in self.players.items()}
+
+        for _ in range(num_cards) if num_cards else range(len(self.deck)):
             for player in self.players.values():
                 player.draw(self.deck)
 
+        if self.sink.enabled:
+            for name, player in self.players.items():
+                self.sink.emit(DealEvent(name, player.hand[dealt_from[name]:]))
+
     def show_hands(self):
         """
         Display the current hands of all players in the game.
 
-        Retrieves each player's hand and prints it in a readable format using
-        pretty print.
+        Retrieves each player's hand and sends it to the game's event sink, which
+        by default prints it in a readable format using pretty print.
 
         No arguments are required, and the function does not return any values.
         """
-        hands = {player.name: player.show_hand() for player in self.players.values()}
-        pprint.pprint(hands)
+        if self.sink.enabled:
+            hands = {player.name: player.show_hand() for player in self.players.values()}
+            self.sink.emit(HandsShownEvent(hands))
 
     def remove_player(self, player_name: str):
         """
@@ -58,6 +121,7 @@ class Game:
         if player_name in self.players:
             self.deck.add_cards(self.players[player_name].hand)
             del self.players[player_name]
+            self.turn_order.remove(player_name)
 
     def evaluate_hand(self, hand):
         """
@@ -86,132 +150,116 @@ class Game:
         """
         if not hand:
             return ("No Cards", [])
-        
-        # Separate out Joker and non-Joker cards
-        non_joker_cards = [card for card in hand if card.rank != "Joker"]
-        joker_count = sum(1 for card in hand if card.rank == "Joker")
-        
-        ranks = [card.rank for card in non_joker_cards]
-        suits = [card.suit for card in non_joker_cards]
-        rank_counts = Counter(ranks)
-        unique_ranks = sorted([Card.rank_values[r] for r in ranks])
-        
-        is_flush = len(set(suits)) == 1
-        is_straight = all(unique_ranks[i] + 1 == unique_ranks[i + 1] for i in range(len(unique_ranks) - 1))
-        
-        # Handle Joker used for completing a Straight or other combinations
-        if joker_count > 0:
-            # Try to form a Straight by adding the Joker if possible
-            if not is_straight:  # If it's not already a straight
-                # Sort the unique ranks
-                unique_ranks = sorted([Card.rank_values[r] for r in ranks])
-                
-                # Look for gaps in the sequence
-                for i in range(1, len(unique_ranks)):
-                    if unique_ranks[i] != unique_ranks[i-1] + 1:
-                        # If there's a gap, use the Joker to complete the sequence
-                        # The Joker can fill the gap by assuming the missing rank
-                        missing_rank = unique_ranks[i-1] + 1
-                        unique_ranks.append(missing_rank)
-                        unique_ranks.sort()
-                        break  # Joker has been used, no need to continue
-
-                # Re-check if the hand forms a straight after the modification
-                is_straight = all(unique_ranks[i] + 1 == unique_ranks[i + 1] for i in range(len(unique_ranks) - 1))
-
-        # Now handle hand evaluations based on the updated ranks
-        if is_flush and is_straight:
-            return ("Straight Flush", unique_ranks)
-        elif 4 in rank_counts.values():
-            four_kind = [rank for rank, count in rank_counts.items() if count == 4]
-            kicker = sorted([Card.rank_values[rank] for rank in ranks if rank != four_kind[0]], reverse=True)
-            return ("Four of a Kind", [Card.rank_values[four_kind[0]]] + kicker)
-        elif 3 in rank_counts.values() and 2 in rank_counts.values():
-            three_kind = [rank for rank, count in rank_counts.items() if count == 3]
-            pair = [rank for rank, count in rank_counts.items() if count == 2]
-            return ("Full House", [Card.rank_values[three_kind[0]], Card.rank_values[pair[0]]])
-        elif is_flush:
-            return ("Flush", sorted(unique_ranks, reverse=True))
-        elif is_straight:
-            return ("Straight", unique_ranks)
-        elif 3 in rank_counts.values():
-            three_kind = [rank for rank, count in rank_counts.items() if count == 3]
-            kicker = sorted([Card.rank_values[rank] for rank in ranks if rank != three_kind[0]], reverse=True)
-            return ("Three of a Kind", [Card.rank_values[three_kind[0]]] + kicker)
-        elif list(rank_counts.values()).count(2) == 2:
-            pairs = sorted([Card.rank_values[rank] for rank, count in rank_counts.items() if count == 2], reverse=True)
-            kicker = sorted([Card.rank_values[rank] for rank in ranks if rank not in pairs], reverse=True)
-            return ("Two Pair", pairs + kicker)
-        elif 2 in rank_counts.values():
-            pair = [rank for rank, count in rank_counts.items() if count == 2]
-            kicker = sorted([Card.rank_values[rank] for rank in ranks if rank != pair[0]], reverse=True)
-            return ("One Pair", [Card.rank_values[pair[0]]] + kicker)
-        else:
-            return ("High Card", sorted([Card.rank_values[rank] for rank in ranks], reverse=True))
+        return self.evaluator.describe_hand(hand)
+
+    def score_hands(self):
+        """
+        Score every player's hand with the game's evaluator.
+
+        With ``best_of_five`` set, each hand scores as its best 5-card subset.
+
+        Returns:
+            dict[str, int]: The hand strength of each player, keyed by name. Higher is better.
+        """
+        if self.best_of_five:
+            evaluate = self.evaluator.evaluate_best
+            return {name: evaluate(player.hand) for name, player in self.players.items()}
+        evaluate = self.evaluator.evaluate_code
+        return {name: evaluate(player.code, player.hand) for name, player in self.players.items()}
+
+    def win_probabilities(self, cards_per_hand: int):
+        """
+        Return each player's chance of winning once every hand holds ``cards_per_hand`` cards.
+
+        The rest of each hand is assumed to come from the cards left in the deck.
+        Results are exact when the number of ways to finish the deal is small and
+        sampled otherwise; see ``models.equity``. Repeated queries are cached.
+
+        Args:
+            cards_per_hand (int): The final hand size.
+
+        Returns:
+            EquityResult: The probabilities, keyed by player name.
+        """
+        if self.equity_calculator is None:
+            self.equity_calculator = EquityCalculator(self.evaluator)
+        return self.equity_calculator.game_equity(self, cards_per_hand)
 
     def determine_winner(self):
-        """Determine the player with the best hand."""
-        hand_rankings = {
-            "Straight Flush": 8,
-            "Four of a Kind": 7,
-            "Full House": 6,
-            "Flush": 5,
-            "Straight": 4,
-            "Three of a Kind": 3,
-            "Two Pair": 2,
-            "One Pair": 1,
-            "High Card": 0,
-            "Wildcard Hand": 9  # Joker cases get the highest priority
-        }
-
-        best_hand = None
-        best_player = None
-        best_hand_value = None
+        """
+        Determine the player with the best hand.
 
-        for player in self.players.values():
-            hand_type, hand_value = self.evaluate_hand(player.hand)
-            print(f"{player.name} has {hand_type} with value {hand_value}")
-
-            if best_hand is None or hand_rankings[hand_type] > hand_rankings[best_hand]:
-                best_hand = hand_type
-                best_player = player.name
-                best_hand_value = hand_value
-            elif hand_rankings[hand_type] == hand_rankings[best_hand]:
-                # If hands are the same type, break the tie by comparing hand values
-                if hand_value > best_hand_value:
-                    best_hand = hand_type
-                    best_player = player.name
-                    best_hand_value = hand_value
-        
+        Every hand is reduced to an integer strength by the game's evaluator, so
+        picking the winner is a single integer comparison per player. Only the
+        winner's hand category is decoded, and the tie-break values only when
+        events are being emitted.
+
+        Returns:
+            tuple[str, str]: The winning player's name and hand type.
+        """
+        strengths = self.score_hands()
+        if self.sink.enabled:
+            for name, strength in strengths.items():
+                self.sink.emit(HandEvaluatedEvent(name, *self.evaluator.describe(strength)))
+
+        # max keeps the first player found on ties
+        best_player = max(strengths, key=strengths.get) if strengths else None
+        best_hand = self.evaluator.hand_name(strengths[best_player]) if strengths else None
+        if self.sink.enabled:
+            self.sink.emit(WinnerEvent(best_player, best_hand))
         return best_player, best_hand
 
+    def rank(self):
+        """
+        Rank every player's hand without emitting events.
+
+        All hands are scored in one batch (see ``HandEvaluator.evaluate_codes``),
+        so this scales to fields of many thousands of players dealt from a
+        ``Shoe``. Unlike ``determine_winner``, ties are kept: tied winners split
+        the pot and tied players share a place.
+
+        Returns:
+            Ranking: The winners, a top-k leaderboard and each player's place and percentile.
+        """
+        hands = [player.hand for player in self.players.values()]
+        if self.best_of_five:
+            strengths = list(map(self.evaluator.evaluate_best, hands))
+        else:
+            strengths = self.evaluator.evaluate_codes([player.code for player in self.players.values()], hands)
+        return Ranking(self.players, strengths)
+
     def play_round(self):
         """Each player plays one card, and the highest card in the leading suit wins."""
-        print("\n--- New Round ---")
+        if self.sink.enabled:
+            self.sink.emit(RoundStartedEvent())
         played_cards = {}
 
-        first_player = self.round_winner if self.round_winner else self.turn_order[0]
+        first_player = self.round_winner if self.round_winner in self.players else self.turn_order[0]
+        start = self.turn_order.index(first_player)
         leading_suit = None
 
-        for i, player_name in enumerate(self.turn_order):
+        # The previous round's winner leads, then play continues in turn order
+        for player_name in self.turn_order[start:] + self.turn_order[:start]:
             player = self.players[player_name]
             card_played = player.play(leading_suit)
             played_cards[player_name] = card_played
 
-            if i == 0:
+            if leading_suit is None:
                 leading_suit = card_played.suit  # Set the suit for the round
 
-            print(f"{player_name} plays {card_played}")
+            if self.sink.enabled:
+                self.sink.emit(PlayEvent(player_name, card_played))
 
         self.determine_round_winner(played_cards, leading_suit)
 
     def determine_round_winner(self, played_cards: dict, leading_suit: str):
         """Determines the winner based on the highest-ranked card in the leading suit."""
         valid_cards = {p: c for p, c in played_cards.items() if c.suit == leading_suit}
-        winner = max(valid_cards, key=lambda p: Card.rank_values[valid_cards[p].rank])
+        winner = max(valid_cards, key=lambda p: valid_cards[p].value)
         self.round_winner = winner  # Winner starts the next round
 
-        print(f"🏆 {winner} wins the round!\n")
+        if self.sink.enabled:
+            self.sink.emit(RoundWonEvent(winner))
 
     def play_game(self):
         """Plays 13 rounds of the game."""
@@ -0,0 +1,315 @@
+"""
+Record games to a compact binary log and replay them.
+
+A log file is a short header followed by fixed-width game records, so game
+``k`` starts at ``header_size + k * record_size`` and can be read without
+touching the rest of the file. ``GameLog`` memory-maps the file for reading.
+
+Header (little-endian):
+    - magic ``b"CGLG"`` and format version (uint16)
+    - seats per game, rounds per game, deck size and cards dealt to each
+      player, 0 for the whole deck (uint8 each)
+    - player names as UTF-8 JSON, preceded by its length (uint16)
+
+Record (every id is one signed byte):
+    - seed (uint64)
+    - the shuffled deck as card ids, bottom first (the last id is dealt first)
+    - the turn order, as indices into the header's player names
+    - the card ids played in each round, in the order they were played
+    - the seat (index into the turn order) that won each round
+    - the overall winner's seat: the winner of the last round
+"""
+import json
+import mmap
+import os
+import random
+import struct
+from array import array
+from typing import NamedTuple
+
+from models.card import Card
+from models.deck import Deck
+from models.game import Game
+
+MAGIC = b"CGLG"
+# Version 2 added the deal size. Version 1 logs were also recorded when the
+# first seat led every round, before the round winner led the next one.
+LOG_FORMAT = 2
+_HEADER = struct.Struct("<4sHBBBBH")
+_SEED = struct.Struct("<Q")
+
+
+class GameRecord(NamedTuple):
+    """One recorded game."""
+    seed: int
+    deck: tuple
+    turn_order: tuple
+    plays: tuple
+    round_winners: tuple
+    winner: int
+    cards_per_player: int = 0  # 0 deals the whole deck
+
+
+class GameRecorder:
+    """An event sink that collects the plays and round winners of one game."""
+    enabled = True
+
+    def __init__(self):
+        self.plays = []
+        self.round_winners = []
+
+    def emit(self, event):
+        if event.kind == "play":
+            self.plays.append(event.card.id)
+        elif event.kind == "round_won":
+            self.round_winners.append(event.player)
+
+    def close(self):
+        pass
+
+
+def record_game(player_names: list[str], seed: int, rounds=13, include_joker=False, cards_per_player=None):
+    """
+    Play a game with a seeded shuffle and record it.
+
+    The game deals ``cards_per_player`` cards (the whole deck by default) and
+    plays ``rounds`` rounds, like ``Game.play_game`` with the default arguments.
+
+    Args:
+        player_names (list[str]): The players, in turn order.
+        seed (int): The seed for the shuffle, between 0 and 2**64 - 1.
+        rounds (int, optional): Rounds to play. Defaults to 13.
+        include_joker (bool, optional): Include two Jokers in the deck. Defaults to False.
+        cards_per_player (int, optional): Cards to deal to each player. Defaults to the whole deck.
+
+    Returns:
+        tuple[Game, GameRecord]: The finished game and its record, with the turn order as
+        indices into ``player_names``.
+
+    Raises:
+        ValueError: If the deal leaves the players fewer cards than ``rounds``.
+    """
+    recorder = GameRecorder()
+    game = Game(player_names, include_joker=include_joker, rng=random.Random(seed), sink=recorder)
+    deck = tuple(card.id for card in game.deck.cards)
+    if (cards_per_player or len(deck) // len(player_names)) < rounds:
+        raise ValueError("every player needs a card for each round")
+    return game, _play(game, recorder, seed, deck, list(player_names), rounds, cards_per_player or 0)
+
+
+def _play(game, recorder, seed, deck, names, rounds, cards_per_player):
+    game.deal(cards_per_player or None)
+    for _ in range(rounds):
+        game.play_round()
+    seats = {name: seat for seat, name in enumerate(game.turn_order)}
+    round_winners = tuple(seats[name] for name in recorder.round_winners)
+    return GameRecord(
+        seed=seed,
+        deck=deck,
+        turn_order=tuple(names.index(name) for name in game.turn_order),
+        plays=tuple(tuple(recorder.plays[i:i + len(seats)]) for i in range(0, len(recorder.plays), len(seats))),
+        round_winners=round_winners,
+        winner=round_winners[-1] if round_winners else -1,
+        cards_per_player=cards_per_player,
+    )
+
+
+def replay(record: GameRecord, player_names: list[str]):
+    """
+    Play a recorded game again from its deck order, turn order and deal size.
+
+    The deck is restored card for card instead of being shuffled from the seed,
+    so the replay does not depend on the random generator.
+
+    Args:
+        record (GameRecord): The game to replay.
+        player_names (list[str]): The names the record's turn order refers to.
+
+    Returns:
+        tuple[Game, GameRecord]: The replayed game and a fresh record of it, which equals
+        ``record`` when the game engine reproduces the original outcome.
+    """
+    recorder = GameRecorder()
+    game = Game([player_names[index] for index in record.turn_order], rng=random.Random(record.seed), sink=recorder)
+    game.deck = Deck(rng=game.deck.rng)
+    game.deck.cards = [Card.from_id(card_id) for card_id in record.deck]
+    return game, _play(game, recorder, record.seed, record.deck, player_names, len(record.plays),
+                       record.cards_per_player)
+
+
+def _layout(seats: int, rounds: int, deck_size: int):
+    """Return the byte offsets of the id fields in a record and the record size."""
+    deck_end = _SEED.size + deck_size
+    order_end = deck_end + seats
+    plays_end = order_end + rounds * seats
+    winners_end = plays_end + rounds
+    return deck_end, order_end, plays_end, winners_end, winners_end + 1
+
+
+class GameLogWriter:
+    """Append game records to a log file, buffered in memory between writes."""
+
+    def __init__(self, path: str, player_names: list[str], rounds=13, deck_size=52, cards_per_player=0,
+                 buffer_size=1024):
+        """
+        Open a log for appending, writing the header if the file is new or empty.
+
+        Args:
+            path (str): The log file.
+            player_names (list[str]): The players every record refers to.
+            rounds (int, optional): Rounds per game. Defaults to 13.
+            deck_size (int, optional): Cards per deck, 52 or 54. Defaults to 52.
+            cards_per_player (int, optional): Cards dealt to each player; 0 deals the whole deck.
+                Defaults to 0.
+            buffer_size (int, optional): Records to collect before writing. Defaults to 1024.
+
+        Raises:
+            ValueError: If an existing log was written with a different layout.
+        """
+        self.player_names = list(player_names)
+        self.seats = len(self.player_names)
+        self.rounds = rounds
+        self.deck_size = deck_size
+        self.cards_per_player = cards_per_player
+        *_, self.record_size = _layout(self.seats, rounds, deck_size)
+        header = _encode_header(self.player_names, rounds, deck_size, cards_per_player)
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(header)
+        else:
+            with open(path, "rb") as existing:
+                if existing.read(len(header)) != header:
+                    self.file.close()
+                    raise ValueError("the log was written with different players, rounds, deck size or deal size")
+        self.buffer_size = buffer_size
+        self.buffer = []
+
+    def write(self, record: GameRecord):
+        """
+        Append one record.
+
+        Raises:
+            ValueError: If the record does not fit this log's layout or the seed is out of range.
+        """
+        if not 0 <= record.seed < 1 << 64:
+            raise ValueError("seed must fit in 64 bits")
+        if (len(record.deck) != self.deck_size or len(record.turn_order) != self.seats
+                or len(record.plays) != self.rounds or len(record.round_winners) != self.rounds
+                or record.cards_per_player != self.cards_per_player):
+            raise ValueError("record does not match the log layout")
+        ids = array("b", record.deck)
+        ids.extend(record.turn_order)
+        for round_plays in record.plays:
+            if len(round_plays) != self.seats:
+                raise ValueError("record does not match the log layout")
+            ids.extend(round_plays)
+        ids.extend(record.round_winners)
+        ids.append(record.winner)
+        self.buffer.append(_SEED.pack(record.seed) + ids.tobytes())
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records to the file."""
+        if self.buffer:
+            self.file.write(b"".join(self.buffer))
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        """Flush buffered records and close the file."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _encode_header(player_names, rounds, deck_size, cards_per_player):
+    names = json.dumps(player_names, ensure_ascii=False).encode("utf-8")
+    return _HEADER.pack(MAGIC, LOG_FORMAT, len(player_names), rounds, deck_size, cards_per_player,
+                        len(names)) + names
+
+
+class GameLog:
+    """A read-only, memory-mapped view of a game log."""
+
+    def __init__(self, path: str):
+        """
+        Open a log for reading.
+
+        Args:
+            path (str): The log file.
+
+        Raises:
+            ValueError: If the file is not a game log of a supported format.
+        """
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(self.file.fileno()).st_size else b""
+        if len(self.map) < _HEADER.size:
+            self.close()
+            raise ValueError("not a game log")
+        magic, version, self.seats, self.rounds, self.deck_size, self.cards_per_player, names_size = \
+            _HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != LOG_FORMAT:
+            self.close()
+            raise ValueError("not a game log or unsupported format")
+        self.header_size = _HEADER.size + names_size
+        self.player_names = json.loads(bytes(self.map[_HEADER.size:self.header_size]).decode("utf-8"))
+        self._layout = _layout(self.seats, self.rounds, self.deck_size)
+        self.record_size = self._layout[-1]
+
+    def __len__(self):
+        return (len(self.map) - self.header_size) // self.record_size
+
+    def __getitem__(self, index: int):
+        """
+        Decode game ``index``; negative indices count from the end.
+
+        Raises:
+            IndexError: If there is no such game.
+        """
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("game index out of range")
+        start = self.header_size + index * self.record_size
+        return self._decode(start)
+
+    def _decode(self, start):
+        deck_end, order_end, plays_end, winners_end, size = self._layout
+        (seed,) = _SEED.unpack_from(self.map, start)
+        ids = array("b", self.map[start + _SEED.size:start + size]).tolist()
+        base = _SEED.size
+        seats = self.seats
+        plays = ids[order_end - base:plays_end - base]
+        return GameRecord(
+            seed=seed,
+            deck=tuple(ids[:deck_end - base]),
+            turn_order=tuple(ids[deck_end - base:order_end - base]),
+            plays=tuple(tuple(plays[i:i + seats]) for i in range(0, len(plays), seats)),
+            round_winners=tuple(ids[plays_end - base:winners_end - base]),
+            winner=ids[-1],
+            cards_per_player=self.cards_per_player,
+        )
+
+    def __iter__(self):
+        for start in range(self.header_size, self.header_size + len(self) * self.record_size, self.record_size):
+            yield self._decode(start)
+
+    def close(self):
+        """Release the memory map and close the file."""
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,398 @@
+"""
+Optional call counters, latency histograms and sampling profiles for the hot paths.
+
+Nothing here touches the game classes until an ``Instrumentation`` is
+installed: it then replaces the instrumented methods with timing wrappers,
+and puts the originals back when it is uninstalled. Code that never installs
+one runs exactly the original methods, so disabled instrumentation costs
+nothing.
+
+    metrics = Instrumentation(profile_interval=0.005)
+    with metrics:
+        run_simulation()
+    print(metrics.prometheus())
+    metrics.write_json("metrics.json")
+
+While installed, every call to an instrumented method is counted and its
+wall-clock time is added to a histogram with power-of-two buckets from one
+microsecond to about one second. Calls that raise are counted as errors.
+Nested calls are timed separately, so ``Game.play_game`` includes the time
+of the ``play_round`` calls it makes.
+
+With ``profile_interval`` set, a ``SamplingProfiler`` thread also records the
+installing thread's stack at that interval. Long-running jobs can serve the
+Prometheus text format over HTTP with ``serve_prometheus`` or dump JSON
+snapshots periodically with ``write_json``.
+
+Counters are updated without locking, so counts from several threads calling
+the same method at once may be slightly low.
+"""
+import bisect
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from models.deck import CompactDeck, Deck, Shoe
+from models.evaluator import HandEvaluator
+from models.game import Game
+from models.player import Player
+from models.wildcard import WildcardEvaluator
+
+# (class, method names) wrapped by default.
+DEFAULT_TARGETS = (
+    (Game, ("deal", "reset", "evaluate_hand", "score_hands", "determine_winner", "rank", "play_round",
+            "play_game", "determine_round_winner")),
+    (Deck, ("shuffle", "reset", "draw_multiple", "add_cards")),
+    (CompactDeck, ("shuffle", "reset", "draw_multiple", "draw_ids", "add_cards")),
+    (Shoe, ("shuffle", "reset", "refill", "draw_multiple", "add_cards")),
+    (Player, ("draw", "draw_multiple", "take", "play")),
+    (HandEvaluator, ("evaluate", "evaluate_code", "evaluate_codes", "evaluate_hands", "evaluate_best")),
+    (WildcardEvaluator, ("evaluate", "evaluate_code", "evaluate_best")),
+)
+# Histogram bucket upper bounds in seconds: 1us, 2us, 4us, ... about 1s.
+BUCKET_BOUNDS = tuple(1e-6 * 2 ** power for power in range(21))
+METRIC_PREFIX = "card_game"
+
+_install_lock = threading.Lock()
+_installed = None
+
+
+class MethodStats:
+    """Call count, error count and latency histogram of one method."""
+
+    __slots__ = ("calls", "errors", "total", "max", "buckets")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)  # The last bucket is +Inf
+        self.clear()
+
+    def clear(self):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets[:] = [0] * len(self.buckets)
+
+    def observe(self, seconds: float):
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+
+    def quantile(self, q: float):
+        """
+        Estimate a latency quantile from the histogram.
+
+        Returns the upper bound of the bucket holding the quantile, so the estimate
+        is at most twice the true value; calls beyond the last bucket report ``max``.
+        """
+        if not self.calls:
+            return 0.0
+        rank = q * self.calls
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def to_dict(self):
+        return {"calls": self.calls, "errors": self.errors, "total_seconds": self.total,
+                "mean_seconds": self.total / self.calls if self.calls else 0.0, "max_seconds": self.max,
+                "p50_seconds": self.quantile(0.5), "p99_seconds": self.quantile(0.99),
+                "buckets": dict(zip([*map(str, BUCKET_BOUNDS), "+Inf"], self.buckets))}
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """
+    A statistical profiler: a background thread records another thread's stack at a fixed interval.
+
+    Samples are stored as collapsed stacks (outermost frame first, joined by
+    ``;``), the input format of common flame graph tools.
+    """
+
+    def __init__(self, interval=0.005, thread_id=None, hook=None, max_depth=64):
+        """
+        Initialize a SamplingProfiler.
+
+        Args:
+            interval (float, optional): Seconds between samples. Defaults to 0.005.
+            thread_id (int, optional): The thread to sample. Defaults to the thread that calls ``start``.
+            hook (callable, optional): Called with each sampled stack, a tuple of frame names
+                with the outermost first, from the profiler thread.
+            max_depth (int, optional): The most frames kept per sample, innermost first. Defaults to 64.
+        """
+        self.interval = interval
+        self.thread_id = thread_id
+        self.hook = hook
+        self.max_depth = max_depth
+        self.samples = Counter()
+        self.sample_count = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling."""
+        if self._thread is not None:
+            raise RuntimeError("the profiler is already running")
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the profiler thread to finish."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                if frame.f_code is not _WRAPPER_CODE:
+                    stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stack = tuple(reversed(stack))
+            self.samples[";".join(stack)] += 1
+            self.sample_count += 1
+            if self.hook is not None:
+                self.hook(stack)
+
+    def top(self, count=10, inclusive=False):
+        """
+        Return the functions seen in the most samples.
+
+        Args:
+            count (int, optional): How many functions to return. Defaults to 10.
+            inclusive (bool, optional): Count samples anywhere on the stack instead of only
+                the innermost frame. Defaults to False.
+
+        Returns:
+            list[tuple[str, int]]: ``(function, samples)`` pairs, most sampled first.
+        """
+        totals = Counter()
+        for stack, samples in list(self.samples.items()):
+            frames = stack.split(";")
+            for name in (set(frames) if inclusive else frames[-1:]):
+                totals[name] += samples
+        return totals.most_common(count)
+
+    def collapsed(self):
+        """Return the samples as collapsed stack lines, ``frame;frame;frame count``."""
+        return "".join(f"{stack} {samples}\n" for stack, samples in sorted(self.samples.items()))
+
+
+class Instrumentation:
+    """Per-method call counters and latency histograms, with optional sampling profiles."""
+
+    def __init__(self, targets=DEFAULT_TARGETS, profile_interval=None, profile_hook=None):
+        """
+        Initialize an Instrumentation. Nothing is measured until it is installed.
+
+        Args:
+            targets (iterable, optional): ``(class, method names)`` pairs to instrument.
+                Defaults to the hot paths of Game, Deck, CompactDeck, Player and HandEvaluator.
+            profile_interval (float, optional): Also sample the installing thread's stack
+                every this many seconds. Defaults to no profiling.
+            profile_hook (callable, optional): Passed to the ``SamplingProfiler`` as its hook.
+        """
+        self.targets = tuple((cls, tuple(names)) for cls, names in targets)
+        self.methods = {}
+        self.profiler = SamplingProfiler(profile_interval, hook=profile_hook) if profile_interval else None
+        self.started = time.time()
+        self._originals = []
+
+    @property
+    def installed(self):
+        return bool(self._originals)
+
+    def install(self):
+        """
+        Wrap the target methods so that every call is counted and timed.
+
+        Raises:
+            RuntimeError: If an Instrumentation is already installed.
+        """
+        global _installed
+        with _install_lock:
+            if _installed is not None:
+                raise RuntimeError("an Instrumentation is already installed")
+            _installed = self
+            for cls, names in self.targets:
+                for name in names:
+                    original = cls.__dict__.get(name)
+                    if original is None:
+                        continue  # Inherited; the base class's wrapper counts it
+                    label = f"{cls.__name__}.{name}"
+                    stats = self.methods.setdefault(label, MethodStats())
+                    setattr(cls, name, _timed(original, stats))
+                    self._originals.append((cls, name, original))
+        if self.profiler is not None:
+            self.profiler.thread_id = None
+            self.profiler.start()
+        return self
+
+    def uninstall(self):
+        """Restore the original methods and stop the profiler. Collected data is kept."""
+        global _installed
+        if self.profiler is not None:
+            self.profiler.stop()
+        with _install_lock:
+            for cls, name, original in reversed(self._originals):
+                setattr(cls, name, original)
+            self._originals.clear()
+            if _installed is self:
+                _installed = None
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def reset(self):
+        """Zero every counter and histogram and drop the profile samples."""
+        for stats in self.methods.values():
+            stats.clear()
+        if self.profiler is not None:
+            self.profiler.samples.clear()
+            self.profiler.sample_count = 0
+        self.started = time.time()
+
+    def snapshot(self):
+        """
+        Return every metric as a JSON-serializable dict.
+
+        Returns:
+            dict: ``timestamp``, ``uptime_seconds``, ``methods`` (per-method counters, latency
+            summary and histogram buckets) and, when profiling, ``profile``.
+        """
+        now = time.time()
+        snapshot = {
+            "timestamp": now,
+            "uptime_seconds": now - self.started,
+            "methods": {label: stats.to_dict() for label, stats in sorted(self.methods.items()) if stats.calls},
+        }
+        if self.profiler is not None:
+            snapshot["profile"] = {"interval": self.profiler.interval, "samples": self.profiler.sample_count,
+                                   "top_self": self.profiler.top(20), "top_inclusive": self.profiler.top(20, True)}
+        return snapshot
+
+    def write_json(self, path: str):
+        """
+        Write a snapshot to a file, replacing it atomically so readers never see a partial dump.
+
+        Args:
+            path (str): The file to write.
+        """
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, indent=2)
+        os.replace(temporary, path)
+
+    def prometheus(self):
+        """
+        Return every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: ``card_game_calls_total``, ``card_game_errors_total`` and the
+            ``card_game_call_seconds`` histogram, labelled by method, plus
+            ``card_game_profile_samples_total`` by function when profiling.
+        """
+        methods = sorted((label, stats) for label, stats in self.methods.items() if stats.calls)
+        lines = [f"# HELP {METRIC_PREFIX}_calls_total Calls to each instrumented method.",
+                 f"# TYPE {METRIC_PREFIX}_calls_total counter"]
+        lines += [f'{METRIC_PREFIX}_calls_total{{method="{label}"}} {stats.calls}' for label, stats in methods]
+        lines += [f"# HELP {METRIC_PREFIX}_errors_total Calls to each instrumented method that raised.",
+                  f"# TYPE {METRIC_PREFIX}_errors_total counter"]
+        lines += [f'{METRIC_PREFIX}_errors_total{{method="{label}"}} {stats.errors}' for label, stats in methods]
+        lines += [f"# HELP {METRIC_PREFIX}_call_seconds Wall-clock time of each call.",
+                  f"# TYPE {METRIC_PREFIX}_call_seconds histogram"]
+        for label, stats in methods:
+            cumulative = 0
+            for bound, count in zip([*map(repr, BUCKET_BOUNDS), "+Inf"], stats.buckets):
+                cumulative += count
+                lines.append(f'{METRIC_PREFIX}_call_seconds_bucket{{method="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_PREFIX}_call_seconds_sum{{method="{label}"}} {stats.total!r}')
+            lines.append(f'{METRIC_PREFIX}_call_seconds_count{{method="{label}"}} {stats.calls}')
+        if self.profiler is not None:
+            lines += [f"# HELP {METRIC_PREFIX}_profile_samples_total Profiler samples with each function innermost.",
+                      f"# TYPE {METRIC_PREFIX}_profile_samples_total counter"]
+            lines += [f'{METRIC_PREFIX}_profile_samples_total{{function="{_escape(name)}"}} {samples}'
+                      for name, samples in self.profiler.top(count=None)]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _timed(function, stats):
+    """Wrap ``function`` so each call is recorded in ``stats``."""
+    clock = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return function(*args, **kwargs)
+        except BaseException:
+            stats.errors += 1
+            raise
+        finally:
+            stats.observe(clock() - start)
+
+    return wrapper
+
+
+# Timing wrappers are left out of profiler stacks.
+_WRAPPER_CODE = _timed(len, MethodStats()).__code__
+
+
+def serve_prometheus(instrumentation: Instrumentation, port=9464, host="127.0.0.1"):
+    """
+    Serve ``instrumentation.prometheus()`` over HTTP from a background thread.
+
+    Every path returns the metrics, so the server can be scraped at ``/metrics``.
+
+    Args:
+        instrumentation (Instrumentation): The metrics to expose.
+        port (int, optional): The port to listen on; 0 picks a free one. Defaults to 9464.
+        host (str, optional): The address to bind. Defaults to localhost only.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call ``shutdown()`` to stop it.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = instrumentation.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,439 @@
+"""
+Heads-up odds between 3-card starting hands, precomputed once and memory-mapped.
+
+Two 3-card hands belong to the same class when relabelling the suits (and,
+with Jokers, swapping the two Jokers) turns one into the other. Every hand of
+a class has the same odds against any other class, so a table over the 1,755
+classes (1,937 with Jokers) covers every matchup. Cell ``(A, B)`` counts the
+pairs of disjoint hands ``a`` in ``A`` and ``b`` in ``B`` where ``a`` wins and
+where the two tie, scored by ``HandEvaluator`` as ``Game.evaluate_hand`` does.
+The losses of ``(A, B)`` are the wins of ``(B, A)``. Counts are exact: ``build``
+scores one hand of each class against every hand of the deck, across worker
+processes, and scales by the size of the class.
+
+File (little-endian):
+    - magic ``b"CGMU"`` and format version (uint16), hand size and Jokers flag
+      (uint8 each), class count and hand count (uint32 each), and a SHA-256
+      fingerprint of how the evaluator orders the hands
+    - the class of every hand (uint16), indexed by the colex rank of its sorted card ids
+    - the size of every class (uint16), then its smallest member's card ids (3 x uint16)
+    - the win counts, then the tie counts, one uint16 per cell in row-major order
+
+``MatchupTable`` memory-maps the file, so answering a matchup is a few index
+computations and two array reads. The fingerprint changes whenever the
+evaluator would order the hands differently; ``MatchupTable.is_current`` checks
+it and ``python -m models.matchups build`` regenerates and verifies the table.
+
+Run with:
+    python -m models.matchups build [--jokers] [--workers 4] [--path PATH]
+    python -m models.matchups verify [--jokers] [--samples 200] [--path PATH]
+"""
+import argparse
+import hashlib
+import itertools
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from math import comb
+from typing import NamedTuple
+
+from models.card import Card, STANDARD_CARDS, JOKERS
+from models.equity import SUIT_PERMUTATIONS
+from models.evaluator import HandEvaluator, cache_dir
+
+MAGIC = b"CGMU"
+MATCHUP_FORMAT = 1
+HAND_SIZE = 3
+_HEADER = struct.Struct("<4sHBBII32s")
+ROWS_PER_TASK = 64
+
+
+class Matchup(NamedTuple):
+    """The odds of one hand class against another, and the number of deals they come from."""
+    win: float
+    tie: float
+    loss: float
+    deals: int
+
+
+def _relabellings(include_joker):
+    if not include_joker:
+        return [perm[:len(STANDARD_CARDS)] for perm in SUIT_PERMUTATIONS]
+    joker_swap = {JOKERS[0].id: JOKERS[1].id, JOKERS[1].id: JOKERS[0].id}
+    return SUIT_PERMUTATIONS + [perm[:len(STANDARD_CARDS)] + tuple(joker_swap[joker.id] for joker in JOKERS)
+                                for perm in SUIT_PERMUTATIONS]
+
+
+def hand_index(card_ids):
+    """Return the colex rank of a hand's sorted card ids, its position in the table's hand order."""
+    low, middle, high = sorted(card_ids)
+    return low + comb(middle, 2) + comb(high, 3)
+
+
+def _colex_hands(deck_size):
+    return sorted(itertools.combinations(range(deck_size), HAND_SIZE), key=lambda hand: hand[::-1])
+
+
+def _fingerprint(hands, evaluator):
+    """Rank every hand's strength densely and hash the ranks; the digest only changes with the ordering."""
+    strengths = [evaluator.evaluate([Card.from_id(card_id) for card_id in hand]) for hand in hands]
+    order = {strength: rank for rank, strength in enumerate(sorted(set(strengths)))}
+    ranks = [order[strength] for strength in strengths]
+    packed = array("H", ranks)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return ranks, hashlib.sha256(packed.tobytes()).digest()
+
+
+def _classify(hands, include_joker):
+    """Return the class of every hand, the smallest member of each class and each class's size."""
+    relabellings = _relabellings(include_joker)
+    classes = {}
+    hand_classes = array("H")
+    sizes = array("H")
+    for hand in hands:
+        key = min(tuple(sorted(perm[card_id] for card_id in hand)) for perm in relabellings)
+        index = classes.setdefault(key, len(classes))
+        if index == len(sizes):
+            sizes.append(0)
+        sizes[index] += 1
+        hand_classes.append(index)
+    return hand_classes, list(classes), sizes
+
+
+def _score_rows(field, rows):
+    """
+    Count the wins and ties of each class in ``rows`` against every class.
+
+    ``field`` holds ``(card mask, strength rank, class)`` for every hand, and
+    each row is ``(class, representative's mask, representative's rank, class size)``.
+    """
+    hands, class_count = field
+    scored = []
+    for index, representative, strength, size in rows:
+        wins = [0] * class_count
+        ties = [0] * class_count
+        for mask, other, other_class in hands:
+            if mask & representative:
+                continue
+            if other < strength:
+                wins[other_class] += size
+            elif other == strength:
+                ties[other_class] += size
+        scored.append((index, array("H", wins), array("H", ties)))
+    return scored
+
+
+_worker_field = None
+
+
+def _init_worker(field):
+    global _worker_field
+    _worker_field = field
+
+
+def _worker_rows(rows):
+    return _score_rows(_worker_field, rows)
+
+
+def default_path(include_joker=False):
+    """Return where the table is kept under ``cache_dir()``."""
+    suffix = "_jokers" if include_joker else ""
+    return os.path.join(cache_dir(), f"matchups_v{MATCHUP_FORMAT}{suffix}.bin")
+
+
+def build(path=None, include_joker=False, workers=1, evaluator=None):
+    """
+    Compute the matchup table and write it to ``path``, replacing any previous table.
+
+    Args:
+        path (str, optional): The output file. Defaults to ``default_path(include_joker)``.
+        include_joker (bool, optional): Include hands with Jokers. Defaults to False.
+        workers (int, optional): Worker processes; 1 builds in this process. Defaults to 1.
+        evaluator (HandEvaluator, optional): Scores the hands. Defaults to a new HandEvaluator.
+
+    Returns:
+        str: The path written.
+    """
+    path = path or default_path(include_joker)
+    evaluator = evaluator if evaluator is not None else HandEvaluator()
+    deck_size = len(STANDARD_CARDS) + (len(JOKERS) if include_joker else 0)
+    hands = _colex_hands(deck_size)
+    ranks, fingerprint = _fingerprint(hands, evaluator)
+    hand_classes, representatives, sizes = _classify(hands, include_joker)
+    masks = [(1 << a) | (1 << b) | (1 << c) for a, b, c in hands]
+    field = (list(zip(masks, ranks, hand_classes)), len(representatives))
+    rows = [(index, masks[hand_index(hand)], ranks[hand_index(hand)], sizes[index])
+            for index, hand in enumerate(representatives)]
+    tasks = [rows[start:start + ROWS_PER_TASK] for start in range(0, len(rows), ROWS_PER_TASK)]
+
+    class_count = len(representatives)
+    wins = [None] * class_count
+    ties = [None] * class_count
+    if workers <= 1:
+        results = (_score_rows(field, task) for task in tasks)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(field,))
+        results = pool.map(_worker_rows, tasks)
+    try:
+        for scored in results:
+            for index, win_row, tie_row in scored:
+                wins[index], ties[index] = win_row, tie_row
+    finally:
+        if workers > 1:
+            pool.shutdown()
+
+    body = array("H", hand_classes)
+    body.extend(sizes)
+    for hand in representatives:
+        body.extend(hand)
+    for row in wins:
+        body.extend(row)
+    for row in ties:
+        body.extend(row)
+    if sys.byteorder != "little":
+        body.byteswap()
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as handle:
+        handle.write(_HEADER.pack(MAGIC, MATCHUP_FORMAT, HAND_SIZE, include_joker, class_count, len(hands),
+                                  fingerprint))
+        body.tofile(handle)
+    os.replace(tmp_path, path)
+    return path
+
+
+class MatchupTable:
+    """
+    A memory-mapped matchup table written by ``build``.
+
+    Hands are passed as three ``Card`` objects in any order. Answers are for
+    the hands' classes: the odds of a random hand of the first class against a
+    random hand of the second that shares no card with it.
+    """
+
+    def __init__(self, path=None, include_joker=False):
+        """
+        Open a table for reading.
+
+        Args:
+            path (str, optional): The table file. Defaults to ``default_path(include_joker)``.
+            include_joker (bool, optional): Which default table to open. Defaults to False.
+
+        Raises:
+            FileNotFoundError: If there is no table; run ``python -m models.matchups build``.
+            ValueError: If the file is not a matchup table of a supported format.
+        """
+        self.path = path or default_path(include_joker)
+        self.file = open(self.path, "rb")
+        size = os.fstat(self.file.fileno()).st_size
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        if len(self.map) < _HEADER.size:
+            self.close()
+            raise ValueError("not a matchup table")
+        magic, version, hand_size, jokers, self.class_count, self.hand_count, self.fingerprint = \
+            _HEADER.unpack_from(self.map)
+        classes = self.class_count
+        expected = _HEADER.size + 2 * (self.hand_count + classes * (1 + HAND_SIZE) + 2 * classes * classes)
+        if magic != MAGIC or version != MATCHUP_FORMAT or hand_size != HAND_SIZE or len(self.map) != expected:
+            self.close()
+            raise ValueError("not a matchup table or unsupported format")
+        self.include_joker = bool(jokers)
+        values = memoryview(self.map)[_HEADER.size:]
+        if sys.byteorder == "little":
+            values = values.cast("H")
+        else:
+            values = array("H", values)
+            values.byteswap()
+        self._hand_classes = values[:self.hand_count]
+        start = self.hand_count
+        self._sizes = values[start:start + classes]
+        start += classes
+        self._representatives = values[start:start + classes * HAND_SIZE]
+        start += classes * HAND_SIZE
+        self._wins = values[start:start + classes * classes]
+        self._ties = values[start + classes * classes:]
+
+    def __len__(self):
+        return self.class_count
+
+    def hand_class(self, hand):
+        """
+        Return the class of a 3-card hand.
+
+        Raises:
+            ValueError: If the hand is not three different cards this table covers.
+        """
+        ids = {card.id for card in hand}
+        if len(hand) != HAND_SIZE or len(ids) != HAND_SIZE:
+            raise ValueError(f"expected {HAND_SIZE} different cards")
+        index = hand_index(ids)
+        if index >= self.hand_count:
+            raise ValueError("this table has no hands with Jokers")
+        return self._hand_classes[index]
+
+    def representative(self, index: int):
+        """Return the smallest member of a class as a list of cards."""
+        start = index * HAND_SIZE
+        return [Card.from_id(card_id) for card_id in self._representatives[start:start + HAND_SIZE]]
+
+    def class_size(self, index: int):
+        """Return the number of hands in a class."""
+        return self._sizes[index]
+
+    def counts(self, first: int, second: int):
+        """
+        Return the ``(wins, ties, losses)`` of class ``first`` against class ``second``.
+
+        Each count is a number of pairs of disjoint hands, one from each class.
+        """
+        classes = self.class_count
+        return (self._wins[first * classes + second], self._ties[first * classes + second],
+                self._wins[second * classes + first])
+
+    def _odds(self, wins, ties, losses):
+        deals = wins + ties + losses
+        if not deals:
+            raise ValueError("these hands can never be dealt together")
+        return Matchup(wins / deals, ties / deals, losses / deals, deals)
+
+    def matchup(self, hand, opponent):
+        """
+        Return the odds of ``hand``'s class against ``opponent``'s class.
+
+        Args:
+            hand (list[Card]): Three cards.
+            opponent (list[Card]): Three cards.
+
+        Returns:
+            Matchup: The win, tie and loss probabilities.
+
+        Raises:
+            ValueError: If a hand is invalid or the two classes cannot be dealt together.
+        """
+        return self._odds(*self.counts(self.hand_class(hand), self.hand_class(opponent)))
+
+    def against_random(self, hand):
+        """
+        Return the odds of ``hand``'s class against one random opponent hand.
+
+        Args:
+            hand (list[Card]): Three cards.
+
+        Returns:
+            Matchup: The win, tie and loss probabilities.
+        """
+        first = self.hand_class(hand)
+        classes = self.class_count
+        row = slice(first * classes, (first + 1) * classes)
+        return self._odds(sum(self._wins[row]), sum(self._ties[row]), sum(self._wins[first::classes]))
+
+    def is_current(self, evaluator=None):
+        """Return whether ``evaluator`` orders the hands as it did when the table was built."""
+        evaluator = evaluator if evaluator is not None else HandEvaluator()
+        deck_size = len(STANDARD_CARDS) + (len(JOKERS) if self.include_joker else 0)
+        return _fingerprint(_colex_hands(deck_size), evaluator)[1] == self.fingerprint
+
+    def close(self):
+        """Release the memory map and close the file."""
+        for name in ("_hand_classes", "_sizes", "_representatives", "_wins", "_ties"):
+            view = self.__dict__.pop(name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def verify(path=None, include_joker=False, samples=200, evaluator=None, rng=None):
+    """
+    Check a table against the evaluator.
+
+    The fingerprint must match, every cell must agree with its mirror cell
+    (ties are symmetric, and wins plus ties plus losses must count every
+    disjoint pair), and ``samples`` random cells are recounted by scoring every
+    pair of hands from the two classes.
+
+    Args:
+        path (str, optional): The table file. Defaults to ``default_path(include_joker)``.
+        include_joker (bool, optional): Which default table to check. Defaults to False.
+        samples (int, optional): Cells to recount. Defaults to 200.
+        evaluator (HandEvaluator, optional): The evaluator to check against. Defaults to a new HandEvaluator.
+        rng (random.Random, optional): Picks the cells to recount. Defaults to ``random.Random(0)``.
+
+    Returns:
+        int: The number of cells recounted.
+
+    Raises:
+        AssertionError: On the first disagreement.
+    """
+    evaluator = evaluator if evaluator is not None else HandEvaluator()
+    rng = rng or random.Random(0)
+    with MatchupTable(path, include_joker) as table:
+        deck_size = len(STANDARD_CARDS) + (len(JOKERS) if table.include_joker else 0)
+        hands = _colex_hands(deck_size)
+        ranks, fingerprint = _fingerprint(hands, evaluator)
+        assert fingerprint == table.fingerprint, "the evaluator has changed since the table was built; rebuild it"
+
+        members = [[] for _ in range(len(table))]
+        for hand, index in zip(hands, table._hand_classes):
+            members[index].append(((1 << hand[0]) | (1 << hand[1]) | (1 << hand[2]), ranks[hand_index(hand)]))
+        for index, group in enumerate(members):
+            assert len(group) == table.class_size(index), f"class {index} has the wrong size"
+
+        def recount(first, second):
+            wins = ties = losses = 0
+            for mask, strength in members[first]:
+                for other_mask, other in members[second]:
+                    if not mask & other_mask:
+                        wins += strength > other
+                        ties += strength == other
+                        losses += strength < other
+            return wins, ties, losses
+
+        classes = len(table)
+        for first in range(classes):
+            for second in range(first, classes):
+                wins, ties, losses = table.counts(first, second)
+                assert (losses, ties, wins) == table.counts(second, first), f"cells {first}, {second} disagree"
+
+        cells = [(rng.randrange(classes), rng.randrange(classes)) for _ in range(samples)]
+        for first, second in cells:
+            assert table.counts(first, second) == recount(first, second), f"cell {first}, {second} is wrong"
+    return len(cells)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m models.matchups",
+                                     description="Build or check the 3-card heads-up matchup table.")
+    parser.add_argument("command", choices=("build", "verify"))
+    parser.add_argument("--jokers", action="store_true", help="cover hands with Jokers")
+    parser.add_argument("--path", help="table file (default: under the lookup table cache)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--samples", type=int, default=200, help="cells to recount when verifying")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        path = build(args.path, args.jokers, args.workers)
+        print(f"wrote {path}")
+    try:
+        checked = verify(args.path, args.jokers, args.samples)
+    except (AssertionError, OSError, ValueError) as error:
+        print(f"verification failed: {error}")
+        return 1
+    print(f"verified {checked} cells")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,422 @@
+"""
+Stream game results through aggregation stages and columnar files in constant memory.
+
+A pipeline is a generator of ``GameResult`` records, one per seat per game,
+passed through any number of stages:
+
+    results = game_results(1_000_000_000, player_count=4, seed=7)
+    frequencies, wins = HandFrequencies(), SeatWinRates(4)
+    tiebreaks = RunningMoments("tiebreak")
+    sketch = QuantileSketch("tiebreak")
+    with ColumnarWriter("results/") as writer:
+        run_pipeline(results, frequencies, wins, tiebreaks, sketch, writer)
+
+Records are produced and consumed one at a time, and every stage keeps a
+fixed amount of state (the quantile sketch grows with the logarithm of the
+stream length), so a billion-game run needs no more memory than a thousand-
+game one. Stages are also generators themselves, ``stage(records)`` updates
+the stage and passes each record on, so they can be chained by hand with
+ordinary generator expressions in between.
+
+``ColumnarWriter`` stores each field as its own flat binary array file,
+written in batches; ``read_column`` memory-maps one back.
+"""
+import json
+import math
+import mmap
+import os
+import random
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from collections import Counter
+from typing import NamedTuple
+
+from models.evaluator import CATEGORY_NAMES, TIEBREAK_BITS
+from models.events import NullSink
+from models.game import Game
+
+# The tie-break score keeps the first eight tie-break values, four bits each.
+TIEBREAK_SCORE_BITS = 32
+
+
+class GameResult(NamedTuple):
+    """One seat's result in one game."""
+    game: int
+    seat: int
+    category: int
+    tiebreak: int
+    winner: int
+
+    @property
+    def won(self):
+        return self.seat == self.winner
+
+
+# Array typecode of each field in columnar files.
+COLUMN_TYPES = {"game": "Q", "seat": "H", "category": "B", "tiebreak": "I", "winner": "H"}
+
+
+def game_results(games: int, player_count=4, cards_per_hand=5, seed=0, include_joker=False, first_game=0):
+    """
+    Deal and score single-hand games, yielding one record per seat.
+
+    One pooled ``Game`` is reset for every deal, so producing records allocates
+    nothing that outlives them. The winner is the best hand, with ties going to
+    the lowest seat as in ``Game.determine_winner``.
+
+    Args:
+        games (int): The number of games.
+        player_count (int, optional): Seats per game. Defaults to 4.
+        cards_per_hand (int, optional): Cards dealt to each seat. Defaults to 5.
+        seed (int, optional): Seeds the shuffles. Defaults to 0.
+        include_joker (bool, optional): Include two Jokers in the deck. Defaults to False.
+        first_game (int, optional): The number of the first game in the records. Defaults to 0.
+
+    Yields:
+        GameResult: Each seat's result, game by game.
+    """
+    game = Game([f"Player {seat + 1}" for seat in range(player_count)], include_joker=include_joker,
+                rng=random.Random(seed), sink=NullSink())
+    tiebreak_shift = TIEBREAK_BITS - TIEBREAK_SCORE_BITS
+    tiebreak_mask = (1 << TIEBREAK_BITS) - 1
+    for number in range(first_game, first_game + games):
+        if number > first_game:
+            game.reset()
+        game.deal(cards_per_hand)
+        strengths = list(game.score_hands().values())
+        winner = strengths.index(max(strengths))
+        for seat, strength in enumerate(strengths):
+            yield GameResult(number, seat, strength >> TIEBREAK_BITS, (strength & tiebreak_mask) >> tiebreak_shift,
+                             winner)
+
+
+def run_pipeline(records, *stages):
+    """
+    Feed every record to every stage, in one pass.
+
+    Args:
+        records (iterable[GameResult]): The source.
+        *stages: Objects with an ``update(record)`` method, e.g. the stages and writers in this module.
+
+    Returns:
+        int: The number of records processed.
+    """
+    updates = [stage.update for stage in stages]
+    count = 0
+    for record in records:
+        for update in updates:
+            update(record)
+        count += 1
+    return count
+
+
+class Stage(ABC):
+    """Base class for aggregation stages: ``update`` each record, read ``result()`` at any time."""
+
+    @abstractmethod
+    def update(self, record):
+        """Add one record to the aggregate."""
+
+    @abstractmethod
+    def result(self):
+        """Return the aggregate of the records seen so far."""
+
+    def __call__(self, records):
+        """Update the stage with each record and pass the record on."""
+        update = self.update
+        for record in records:
+            update(record)
+            yield record
+
+
+class HandFrequencies(Stage):
+    """Count the hand categories dealt."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def update(self, record):
+        self.counts[record.category] += 1
+
+    def result(self):
+        """
+        Returns:
+            dict[str, int]: The number of hands of each category, keyed by name, most common first.
+        """
+        return {CATEGORY_NAMES[category]: count for category, count in self.counts.most_common()}
+
+
+class SeatWinRates(Stage):
+    """Count games and wins per seat."""
+
+    def __init__(self, player_count: int):
+        self.games = [0] * player_count
+        self.wins = [0] * player_count
+
+    def update(self, record):
+        self.games[record.seat] += 1
+        if record.seat == record.winner:
+            self.wins[record.seat] += 1
+
+    def result(self):
+        """
+        Returns:
+            list[float]: Each seat's share of the games it played that it won.
+        """
+        return [wins / games if games else 0.0 for wins, games in zip(self.wins, self.games)]
+
+
+class RunningMoments(Stage):
+    """Streaming count, mean, variance, minimum and maximum of one field (Welford's algorithm)."""
+
+    def __init__(self, field: str):
+        """
+        Args:
+            field (str): The ``GameResult`` field to summarize.
+        """
+        self.field = field
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def update(self, record):
+        value = getattr(record, self.field)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    @property
+    def variance(self):
+        """The sample variance, or 0.0 for fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def merge(self, other: "RunningMoments"):
+        """Fold in the moments of another stream, e.g. from another worker (Chan et al.)."""
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def result(self):
+        """
+        Returns:
+            dict: ``count``, ``mean``, ``variance``, ``stddev``, ``min`` and ``max``.
+        """
+        return {"count": self.count, "mean": self.mean, "variance": self.variance,
+                "stddev": math.sqrt(self.variance), "min": self.min, "max": self.max}
+
+
+class QuantileSketch(Stage):
+    """
+    Approximate quantiles of one field in bounded memory (a KLL-style compactor sketch).
+
+    Values are buffered per level; when a level holds ``capacity`` values it is
+    sorted and every other value, from a random start, moves up a level with
+    twice the weight. Each level's buffer is bounded, and there are about
+    ``log2(n / capacity)`` levels, so a billion values take a few thousand slots.
+    Rank errors are around ``1 / capacity`` of the stream length.
+    """
+
+    def __init__(self, field: str, capacity=256, quantiles=(0.01, 0.25, 0.5, 0.75, 0.99), rng=None):
+        """
+        Args:
+            field (str): The ``GameResult`` field to summarize.
+            capacity (int, optional): Values kept per level; larger is more accurate. Defaults to 256.
+            quantiles (tuple[float], optional): The quantiles ``result`` reports.
+            rng (random.Random, optional): Picks which half of each compaction survives.
+                Defaults to ``random.Random(0)``.
+
+        Raises:
+            ValueError: If the capacity is less than 2.
+        """
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self.field = field
+        self.capacity = capacity
+        self.quantiles = quantiles
+        self.rng = rng or random.Random(0)
+        self.count = 0
+        self.levels = [[]]
+
+    def update(self, record):
+        self.add(getattr(record, self.field))
+
+    def add(self, value):
+        """Add one value to the sketch."""
+        self.count += 1
+        level = self.levels[0]
+        level.append(value)
+        if len(level) >= self.capacity:
+            self._compact(0)
+
+    def _compact(self, height):
+        buffer = self.levels[height]
+        buffer.sort()
+        survivors = buffer[self.rng.randrange(2)::2]
+        buffer.clear()
+        if height + 1 == len(self.levels):
+            self.levels.append([])
+        above = self.levels[height + 1]
+        above.extend(survivors)
+        if len(above) >= self.capacity:
+            self._compact(height + 1)
+
+    def merge(self, other: "QuantileSketch"):
+        """Fold in another sketch of the same field."""
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for height, buffer in enumerate(other.levels):
+            self.levels[height].extend(buffer)
+        self.count += other.count
+        for height in range(len(self.levels)):
+            if len(self.levels[height]) >= self.capacity:
+                self._compact(height)
+
+    @property
+    def size(self):
+        """The number of values held."""
+        return sum(map(len, self.levels))
+
+    def quantile(self, q: float):
+        """
+        Return an approximate ``q`` quantile of the values added so far.
+
+        Raises:
+            ValueError: If the sketch is empty.
+        """
+        weighted = sorted((value, 1 << height) for height, buffer in enumerate(self.levels) for value in buffer)
+        if not weighted:
+            raise ValueError("the sketch is empty")
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return weighted[-1][0]
+
+    def result(self):
+        """
+        Returns:
+            dict[float, object]: The approximate value at each configured quantile.
+        """
+        return {q: self.quantile(q) for q in self.quantiles} if self.size else {}
+
+
+class ColumnarWriter:
+    """
+    Write records as one binary array file per field, in batches.
+
+    ``directory/<field>.bin`` holds the field's values back to back in native
+    byte order, using the typecodes in ``COLUMN_TYPES``; ``directory/columns.json``
+    records the typecodes, byte order and record count. Appending to an existing
+    directory continues its columns.
+
+    The manifest is written after the columns, so it only counts records that
+    reached every file. Reopening a directory truncates each column to that
+    count, dropping the tail of a flush that was interrupted.
+    """
+
+    def __init__(self, directory: str, batch_size=65536):
+        """
+        Args:
+            directory (str): Where to write the column files; created if missing.
+            batch_size (int, optional): Records to buffer before writing. Defaults to 65536.
+
+        Raises:
+            ValueError: If the directory holds columns of other typecodes or byte order.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.batch_size = batch_size
+        self.count = 0
+        if os.path.exists(_manifest_path(directory)):
+            manifest = _read_manifest(directory)
+            if manifest["columns"] != COLUMN_TYPES or manifest["byteorder"] != sys.byteorder:
+                raise ValueError(f"{directory} holds columns in another format")
+            self.count = manifest["count"]
+        self.files = {}
+        for field, typecode in COLUMN_TYPES.items():
+            file = open(os.path.join(directory, f"{field}.bin"), "ab")
+            file.truncate(self.count * array(typecode).itemsize)
+            self.files[field] = file
+        self.columns = {field: array(typecode) for field, typecode in COLUMN_TYPES.items()}
+        self._appends = [self.columns[field].append for field in GameResult._fields]
+
+    def update(self, record):
+        for append, value in zip(self._appends, record):
+            append(value)
+        if len(self.columns["game"]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write buffered records and update the manifest."""
+        written = len(self.columns["game"])
+        for field, column in self.columns.items():
+            column.tofile(self.files[field])
+            del column[:]
+            self.files[field].flush()
+        self.count += written
+        manifest = {"count": self.count, "byteorder": sys.byteorder, "columns": COLUMN_TYPES}
+        temporary = _manifest_path(self.directory) + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+        os.replace(temporary, _manifest_path(self.directory))
+
+    def close(self):
+        """Flush and close the column files."""
+        if not all(file.closed for file in self.files.values()):
+            self.flush()
+            for file in self.files.values():
+                file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _manifest_path(directory):
+    return os.path.join(directory, "columns.json")
+
+
+def _read_manifest(directory):
+    with open(_manifest_path(directory), encoding="utf-8") as file:
+        return json.load(file)
+
+
+def read_column(directory: str, field: str):
+    """
+    Memory-map one column written by ``ColumnarWriter``.
+
+    Args:
+        directory (str): The writer's directory.
+        field (str): A ``GameResult`` field name.
+
+    Returns:
+        memoryview: The column's values, as many as the manifest records. The view keeps
+        the file mapped; release it to unmap.
+    """
+    manifest = _read_manifest(directory)
+    typecode = manifest["columns"][field]
+    with open(os.path.join(directory, f"{field}.bin"), "rb") as file:
+        size = manifest["count"] * array(typecode).itemsize
+        if not size:
+            return memoryview(array(typecode))
+        mapped = mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(typecode)
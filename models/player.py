@@ -1,17 +1,61 @@
-
+from models.card import Card
 from models.deck import Deck
 
+SUIT_INDEX = {suit: index for index, suit in enumerate(Card.suits)}
+_NO_RANKS = (0,) * (Card.joker_value + 1)
+_NO_CURSORS = (0,) * len(Card.suits)
+
 class Player:
     def __init__(self,name):
         """
         Initialize a Player object with a given name.
 
+        Besides the hand itself, the player keeps summary state that is updated
+        as cards arrive and leave, so nothing has to rescan the hand:
+
+            - mask: A bitmask of the card ids in the hand.
+            - rank_counts: The number of cards of each rank value (index 2..15).
+            - suit_buckets: One list per suit holding the cards in arrival order.
+            - code: The sum of the evaluator's card codes, see ``HandEvaluator.evaluate_code``.
+
         Args:
             name (str): The name of the player.
         """
         self.name = name
         self.hand = []
 
+    @property
+    def hand(self):
+        """
+        list[Card]: The cards in the hand, in the order they arrived.
+
+        Treat the list as read-only: add cards with ``draw``/``draw_multiple``/``take``
+        and remove them with ``play`` so the summary state stays in sync.
+        Assigning a new list replaces the hand and rebuilds the state.
+        """
+        if self._holes:
+            # ``play`` leaves a hole where each card was; close them up in place
+            self._hand[:] = [card for card in self._hand if card is not None]
+            self._holes = self._first = 0
+            self._cursors[:] = _NO_CURSORS
+        return self._hand
+
+    @hand.setter
+    def hand(self, cards):
+        self._hand = []
+        # Played cards leave None behind. _first and _cursors are lower bounds on the
+        # position of the first card held, overall and of each suit; they only move
+        # forward, so finding the card to play is amortized O(1).
+        self._holes = self._first = 0
+        self._cursors = list(_NO_CURSORS)
+        self.mask = 0
+        self.rank_counts = [0] * (Card.joker_value + 1)
+        # Lists rather than deques: a hand holds a few cards per suit, and an empty
+        # deque costs ten times the memory, which adds up over thousands of seats.
+        self.suit_buckets = [[] for _ in Card.suits]
+        self.code = 0
+        self.take(cards)
+
     def __repr__(self):
         """
         Return a string representation of the player.
@@ -22,6 +66,34 @@ class Player:
 
         return self.name
 
+    def take(self, cards):
+        """
+        Add cards to the player's hand.
+
+        Args:
+            cards (list[Card]): The cards to add.
+        """
+        for card in cards:
+            self._hand.append(card)
+            self.mask |= card.mask
+            self.rank_counts[card.value] += 1
+            self.suit_buckets[card.suit_index].append(card)
+            self.code += card.code
+
+    def _discard(self, card):
+        bucket = self.suit_buckets[card.suit_index]
+        bucket.pop(0)
+        self.rank_counts[card.value] -= 1
+        self.code -= card.code
+        # Another copy can still be held with several decks. Compare ids, since
+        # the two Jokers are equal cards but have their own mask bits.
+        card_id = card.id
+        for other in bucket:
+            if other.id == card_id:
+                break
+        else:
+            self.mask &= ~card.mask
+
     def draw(self, deck=Deck):
         """
         Draw a single card from the deck and add it to the player's hand.
@@ -33,8 +105,11 @@ class Player:
             Card or None: The drawn card if successful, otherwise None if the deck is empty.
         """
         card = deck.draw()
-        return self.hand.append(card) if card else card
-    
+        if card:
+            self.take((card,))
+            return None
+        return card
+
     def draw_multiple(self, deck=Deck, card_count=int):
         """
         Draw multiple cards from the deck and add them to the player's hand.
@@ -47,8 +122,8 @@ class Player:
             list[Card] or str: A list of the drawn cards if the count is valid, otherwise an error message.
         """
         cards = deck.draw_multiple(card_count)
-        return self.hand.extend(cards) if len(cards) else cards
-    
+        return self.take(cards) if isinstance(cards, list) else cards
+
     def show_hand(self):
         """
         Display the player's current hand of cards.
@@ -57,37 +132,90 @@ class Player:
             list[Card]: A list of Card objects representing the player's hand.
         """
         return self.hand
-    
+
+    def has_suit(self, suit: str):
+        """
+        Return True if the player holds a card of the given suit.
+
+        Args:
+            suit (str): One of ``Card.suits``.
+        """
+        return bool(self.suit_buckets[SUIT_INDEX[suit]])
+
+    def clear(self):
+        """
+        Empty the player's hand.
+
+        Returns:
+            list[Card]: The cards that were in the hand.
+        """
+        cards = self.hand
+        self.hand = []
+        return cards
+
+    def reset(self):
+        """
+        Empty the hand in place, reusing its list, counts and suit buckets.
+
+        Unlike ``clear``, nothing is returned and no new containers are built,
+        so a pooled player can be dealt a new hand without allocating.
+        """
+        self._hand.clear()
+        self._holes = self._first = 0
+        self._cursors[:] = _NO_CURSORS
+        self.mask = 0
+        self.rank_counts[:] = _NO_RANKS
+        for bucket in self.suit_buckets:
+            bucket.clear()
+        self.code = 0
+
     def card_sort(self):
         """
         Sort the player's hand of cards in ascending order based on suit and rank.
 
         The sorting is done first by suit in the order of clubs, diamonds, hearts, and spades,
         and then by rank within each suit from 2 to 10, followed by J, Q, K, and A.
+        Jokers come last.
 
         Returns:
             list[Card]: A list of Card objects sorted by suit and rank.
         """
+        return sorted(self.hand)
 
-        suit_order = {"♣": 0, "♦": 1, "♥": 2, "♠": 3}
-        rank_order = {str(i): i for i in range(2, 11)}
-        rank_order.update({"J": 11, "Q": 12, "K": 13, "A": 14})
+    def play(self,leading_suit=None):
+        """
+        Play a card and remove it from the hand.
 
-        def sort_key(card):
-            rank, suit = card[:-1], card[-1]  # Split the rank and suit
-            return (suit_order[suit], rank_order[rank])
+        A player follows the leading suit with the first card of that suit they
+        received; otherwise, or when leading, they play the first card in the hand.
 
-        # Sort the cards using the custom key
-        return sorted(self.hand, key=sort_key)
-    
-    def play(self,leading_suit=None):
-        if leading_suit:
-            suited_cards = [card for card in self.hand if card.suit == leading_suit]
-            if suited_cards:
-                played_card = suited_cards.pop(0)  # Play first matching suit card
-            else:
-                played_card = self.hand.pop(0)  # Play any available card
-        else:
-            played_card = self.hand.pop(0)  # First player can play any card
+        Args:
+            leading_suit (str, optional): The suit led this round. Defaults to None.
 
-        return played_card
\ No newline at end of file
+        Returns:
+            Card: The card played.
+        """
+        hand = self._hand
+        if len(hand) == self._holes:
+            raise IndexError("play from an empty hand")
+        suit = SUIT_INDEX[leading_suit] if leading_suit else None
+        if suit is not None and self.suit_buckets[suit]:
+            # Play the first matching suit card
+            position = self._cursors[suit]
+            card = hand[position]
+            while card is None or card.suit_index != suit:
+                position += 1
+                card = hand[position]
+            self._cursors[suit] = position + 1
+        else:
+            # Play any available card
+            position = self._first
+            card = hand[position]
+            while card is None:
+                position += 1
+                card = hand[position]
+            self._first = position + 1
+        hand[position] = None
+        self._holes += 1
+        self._discard(card)
+        return card
@@ -0,0 +1,163 @@
+"""
+Rank a whole field of hands: winners, split pots, a top-k leaderboard and percentile placements.
+
+``Game.determine_winner`` keeps a single best hand and gives ties to the first
+seat, which is right for one table but cannot rank a tournament field.
+``Ranking`` takes every seat's integer strength (see ``HandEvaluator``) and
+answers ranking questions with structured results and no printing:
+
+    - ``winners`` and ``split_pot``: every seat tied for the best hand shares the pot.
+    - ``top(k)``: the ``k`` strongest seats, selected with a heap in O(n log k),
+      plus any seat tied with the last of them.
+    - ``standing(name)`` and ``standings()``: a seat's place and percentile.
+
+Places are competition ranks: a seat's place is one more than the number of
+strictly stronger hands, so tied seats share a place. A seat's percentile is
+the share of the other seats it beats, each tie counting as half a win.
+"""
+import heapq
+from collections import Counter
+from typing import NamedTuple
+
+from models.evaluator import CATEGORY_NAMES, TIEBREAK_BITS
+
+
+class Standing(NamedTuple):
+    """One seat's result in a ``Ranking``."""
+    name: str
+    seat: int
+    strength: int
+    hand_type: str
+    place: int
+    tied: int
+    percentile: float
+
+
+class Ranking:
+    """
+    The ranking of one deal across every seat.
+
+    Building a Ranking only copies the strengths. The place of every distinct
+    strength, which ``standing`` needs, is worked out once, on first use.
+    """
+
+    def __init__(self, names, strengths):
+        """
+        Args:
+            names (Iterable[str]): The seat names, in seat order.
+            strengths (Iterable[int]): Each seat's hand strength, in the same order. Higher is better.
+
+        Raises:
+            ValueError: If the two lengths differ or a name repeats.
+        """
+        self.names = list(names)
+        self.strengths = list(strengths)
+        if len(self.names) != len(self.strengths):
+            raise ValueError(f"{len(self.names)} names for {len(self.strengths)} strengths")
+        self._seats = {name: seat for seat, name in enumerate(self.names)}
+        if len(self._seats) != len(self.names):
+            raise ValueError("seat names must be unique")
+        self._places = None
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def best(self):
+        """int: The strongest hand's strength, or None for an empty field."""
+        return max(self.strengths, default=None)
+
+    @property
+    def winners(self):
+        """tuple[str, ...]: Every seat tied for the best hand, in seat order."""
+        best = self.best
+        return tuple(name for name, strength in zip(self.names, self.strengths) if strength == best)
+
+    def split_pot(self, pot: int):
+        """
+        Divide a pot of whole chips between the winners.
+
+        Each winner gets an equal share; chips that do not divide evenly go
+        one each to the earliest seats.
+
+        Args:
+            pot (int): The chips in the pot.
+
+        Returns:
+            dict[str, int]: Each winner's chips, keyed by name.
+
+        Raises:
+            ValueError: If the field is empty.
+        """
+        winners = self.winners
+        if not winners:
+            raise ValueError("no hands to split the pot between")
+        share, odd = divmod(pot, len(winners))
+        return {name: share + (index < odd) for index, name in enumerate(winners)}
+
+    def _standing(self, seat, place, tied):
+        strength = self.strengths[seat]
+        others = len(self.strengths) - 1
+        beaten = others + 1 - place - (tied - 1)
+        percentile = (beaten + (tied - 1) / 2) / others if others else 1.0
+        hand_type = CATEGORY_NAMES[strength >> TIEBREAK_BITS]
+        return Standing(self.names[seat], seat, strength, hand_type, place, tied, percentile)
+
+    def _place(self, strength):
+        if self._places is None:
+            # Walk the distinct strengths from the best down, counting the stronger hands
+            places = {}
+            stronger = 0
+            for value, tied in sorted(Counter(self.strengths).items(), reverse=True):
+                places[value] = (stronger + 1, tied)
+                stronger += tied
+            self._places = places
+        return self._places[strength]
+
+    def standing(self, name: str):
+        """
+        Return one seat's result.
+
+        Raises:
+            KeyError: If no seat has this name.
+        """
+        seat = self._seats[name]
+        return self._standing(seat, *self._place(self.strengths[seat]))
+
+    def standings(self):
+        """Return every seat's result, in seat order."""
+        return [self._standing(seat, *self._place(strength)) for seat, strength in enumerate(self.strengths)]
+
+    def top(self, k: int):
+        """
+        Return the ``k`` strongest seats, best first.
+
+        Seats tied with the ``k``-th are all included, so the list can be longer
+        than ``k``. Tied seats are listed in seat order. Only the selected seats
+        are sorted, so this does not need ``standings``.
+
+        Args:
+            k (int): The number of leaders.
+
+        Returns:
+            list[Standing]: The leaders.
+        """
+        strengths = self.strengths
+        leaders = heapq.nlargest(k, range(len(strengths)), key=strengths.__getitem__)
+        if not leaders:
+            return []
+        cutoff = strengths[leaders[-1]]
+        # Every hand at least as strong as the cutoff is selected, so places and
+        # ties can be counted inside the selection.
+        selected = [seat for seat, strength in enumerate(strengths) if strength >= cutoff]
+        selected.sort(key=strengths.__getitem__, reverse=True)
+        result = []
+        start = 0
+        while start < len(selected):
+            strength = strengths[selected[start]]
+            end = start + 1
+            while end < len(selected) and strengths[selected[end]] == strength:
+                end += 1
+            result.extend(self._standing(seat, start + 1, end - start) for seat in selected[start:end])
+            start = end
+        return result
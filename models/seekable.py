@@ -0,0 +1,117 @@
+"""
+Shuffles that can be reproduced for any game number without replaying the others.
+
+``random.Random`` is a sequential generator: to get the deck of game
+5,000,000 from a seeded run, every earlier shuffle has to be replayed.
+``SeekableRandom`` is counter based instead. Every draw is a keyed hash of
+``(seed, game, counter)``, so the generator for game ``k`` starts in the
+right state straight away.
+
+Its ``shuffle`` draws one uniform permutation rank and unranks it in a single
+pass (the factorial number system, applied as Fisher-Yates swaps), so shuffling
+a deck costs one hash and ``O(deck size)`` arithmetic.
+
+    deck = Deck(rng=SeekableRandom(seed, game=5_000_000))
+    deck.shuffle()
+"""
+import hashlib
+import random
+import struct
+from functools import lru_cache
+from math import factorial
+
+_KEY = struct.Struct("<QQQ")
+_BLOCK_BITS = 512
+# Draw at least this many bits more than a permutation rank needs, so that
+# reducing modulo n! is uniform to within 2**-128.
+_RANK_SLACK_BITS = 128
+
+
+@lru_cache(maxsize=None)
+def _rank_bits(size: int):
+    return factorial(size).bit_length() + _RANK_SLACK_BITS
+
+
+def unrank_permutation(rank: int, items: list):
+    """
+    Rearrange ``items`` in place into the permutation with the given rank.
+
+    The rank is read as mixed-radix digits (the factorial number system);
+    digit ``i`` picks which of the first ``i + 1`` items moves to position ``i``,
+    the same swaps Fisher-Yates makes. Every rank in ``0..n! - 1`` gives a
+    different permutation, and larger ranks wrap around modulo ``n!``.
+
+    Args:
+        rank (int): A non-negative permutation rank.
+        items (list): The list to rearrange.
+    """
+    for i in range(len(items) - 1, 0, -1):
+        rank, j = divmod(rank, i + 1)
+        items[i], items[j] = items[j], items[i]
+
+
+class SeekableRandom(random.Random):
+    """
+    A counter-based ``random.Random`` for one game of a seeded run.
+
+    All ``random.Random`` methods work; they draw from a stream that depends
+    only on the seed, the game number and how many draws the game has made.
+    """
+
+    def __init__(self, seed=0, game=0):
+        """
+        Initialize a SeekableRandom.
+
+        Args:
+            seed (int, optional): The run's seed, between 0 and 2**64 - 1. Defaults to 0.
+            game (int, optional): The game number within the run, between 0 and 2**64 - 1. Defaults to 0.
+        """
+        self.game = game
+        super().__init__(seed)
+
+    def seed(self, a=0, version=2):
+        """
+        Restart the stream for the given seed and the current game.
+
+        Raises:
+            ValueError: If the seed is not an integer between 0 and 2**64 - 1.
+        """
+        if not isinstance(a, int) or not 0 <= a < 1 << 64:
+            raise ValueError("seed must be an integer between 0 and 2**64 - 1")
+        self.seed_value = a
+        self.counter = 0
+        self.gauss_next = None
+
+    def getstate(self):
+        return self.seed_value, self.game, self.counter
+
+    def setstate(self, state):
+        self.seed_value, self.game, self.counter = state
+        self.gauss_next = None
+
+    def _block(self):
+        """Return the next 512 random bits as an integer."""
+        key = _KEY.pack(self.seed_value, self.game, self.counter)
+        self.counter += 1
+        return int.from_bytes(hashlib.blake2b(key, digest_size=_BLOCK_BITS // 8).digest(), "little")
+
+    def getrandbits(self, k):
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        bits = 0
+        for shift in range(0, k, _BLOCK_BITS):
+            bits |= self._block() << shift
+        return bits & ((1 << k) - 1)
+
+    def random(self):
+        return self.getrandbits(53) * 2.0 ** -53
+
+    def shuffle(self, x):
+        """
+        Shuffle the list ``x`` in place with a single permutation rank.
+
+        Args:
+            x (list): The list to shuffle.
+        """
+        if len(x) > 1:
+            unrank_permutation(self.getrandbits(_rank_bits(len(x))), x)
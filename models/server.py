@@ -0,0 +1,521 @@
+"""
+Host many ``Game`` tables in one long-running asyncio process.
+
+Clients talk to the server over a local TCP or Unix socket. Every message is a
+frame: a 4-byte big-endian payload length followed by the payload. A request
+payload starts with a 4-byte request id and a 1-byte opcode; the response
+repeats the request id and carries a 1-byte status (``OK`` or ``ERROR``) and
+the result, or a UTF-8 error message. Strings are a 1-byte length and UTF-8.
+
+    opcode         request body                         response body
+    CREATE_TABLE   seed (u64), jokers (u8), names       table id (u32)
+    DEAL           table (u32), cards per player (u8)   -
+    PLAY_ROUND     table (u32)                          round winner's name
+    REMOVE_PLAYER  table (u32), name                    -
+    WINNER         table (u32)                          winner's name, hand category (u8)
+    CLOSE_TABLE    table (u32)                          -
+
+``DEAL`` starts a new game at the table, then deals; 0 cards deals the whole
+deck. Clients may pipeline: send any number of requests without waiting and
+match the responses by request id. A connection's requests act on the tables
+in the order they were sent, but responses can arrive out of order, because
+``WINNER`` on hands too large for the lookup tables is scored on a worker
+process pool so the event loop never stalls. Its hands are copied when the
+request arrives, so later requests can change the table in the meantime.
+
+Run a server and a load generator with:
+    python -m models.server serve --port 7878
+    python -m models.server load --port 7878 --connections 8 --depth 32 --requests 100000
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import struct
+import sys
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor
+
+from models.card import Card
+from models.evaluator import CATEGORY_NAMES, HAND_RANKINGS, MAX_TABLE_CARDS, TIEBREAK_BITS, HandEvaluator
+from models.events import NullSink
+from models.game import Game
+from models.task_scheduler import SchedulerStats
+
+DEFAULT_PORT = 7878
+MAX_FRAME = 1 << 20
+
+CREATE_TABLE = 1
+DEAL = 2
+PLAY_ROUND = 3
+REMOVE_PLAYER = 4
+WINNER = 5
+CLOSE_TABLE = 6
+
+OK = 0
+ERROR = 1
+
+_LENGTH = struct.Struct("!I")
+_HEADER = struct.Struct("!IB")
+_TABLE = struct.Struct("!I")
+_DEAL = struct.Struct("!IB")
+_CREATE = struct.Struct("!QB")
+
+
+class ServerError(Exception):
+    """A request the server answered with an error."""
+
+
+def _pack_str(text: str):
+    data = text.encode("utf-8")
+    if len(data) > 255:
+        raise ValueError(f"string too long: {text!r}")
+    return bytes((len(data),)) + data
+
+
+def _unpack_str(data, offset: int):
+    if offset >= len(data):
+        raise ValueError("truncated string")
+    end = offset + 1 + data[offset]
+    if end > len(data):
+        raise ValueError("truncated string")
+    return bytes(data[offset + 1:end]).decode("utf-8"), end
+
+
+def _frame(request_id: int, code: int, body=b""):
+    return _LENGTH.pack(_HEADER.size + len(body)) + _HEADER.pack(request_id, code) + body
+
+
+async def _read_frame(reader):
+    """Return the next payload, or None at end of stream."""
+    try:
+        header = await reader.readexactly(_LENGTH.size)
+        (length,) = _LENGTH.unpack(header)
+        if not _HEADER.size <= length <= MAX_FRAME:
+            raise ValueError(f"bad frame length {length}")
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+
+
+_worker_evaluator = None
+
+
+def _best_seat(hands):
+    """
+    Score hands given as lists of card ids and return the winning index and strength.
+
+    Runs in worker processes; ties go to the first hand, as in ``Game.determine_winner``.
+    """
+    global _worker_evaluator
+    if _worker_evaluator is None:
+        _worker_evaluator = HandEvaluator()
+    strengths = _worker_evaluator.evaluate_hands([[Card.from_id(card) for card in hand] for hand in hands])
+    best = strengths.index(max(strengths))
+    return best, strengths[best]
+
+
+class GameServer:
+    """
+    Serve ``Game`` tables over the length-prefixed protocol described in this module.
+
+    Every table is an ordinary ``Game`` with a ``NullSink``, seeded by its creator.
+    Requests run on the event loop, except ``WINNER`` on hands larger than
+    ``MAX_TABLE_CARDS``, which is scored on the worker pool.
+    """
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers (int, optional): Worker processes for heavy evaluation. Defaults to
+                ``os.cpu_count()``; 0 scores every hand on the event loop.
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.tables = {}
+        self.requests = 0
+        self.evaluator = HandEvaluator()
+        self._table_ids = itertools.count(1)
+        self._pool = None
+        self._server = None
+        self._handlers = {
+            CREATE_TABLE: self._create_table,
+            DEAL: self._deal,
+            PLAY_ROUND: self._play_round,
+            REMOVE_PLAYER: self._remove_player,
+            WINNER: self._winner,
+            CLOSE_TABLE: self._close_table,
+        }
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Listen on a TCP address. Pass port 0 to pick a free port; see ``address``."""
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        return self._server
+
+    async def start_unix(self, path: str):
+        """Listen on a Unix socket."""
+        self._server = await asyncio.start_unix_server(self._serve_connection, path)
+        return self._server
+
+    @property
+    def address(self):
+        """The address the server listens on, e.g. ``("127.0.0.1", 7878)`` or a socket path."""
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        """Stop listening and shut the worker pool down."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    async def _serve_connection(self, reader, writer):
+        pending = set()
+        try:
+            while True:
+                payload = await _read_frame(reader)
+                if payload is None:
+                    break
+                request_id, opcode = _HEADER.unpack_from(payload)
+                self.requests += 1
+                response = self._handle(request_id, opcode, payload)
+                if isinstance(response, bytes):
+                    writer.write(response)
+                else:
+                    # Scored on the pool: answered after any later requests that finish first
+                    task = asyncio.ensure_future(self._respond_later(request_id, response, writer))
+                    pending.add(task)
+                    task.add_done_callback(pending.discard)
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass  # A broken or misbehaving client only loses its own connection
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    def _handle(self, request_id, opcode, payload):
+        try:
+            handler = self._handlers.get(opcode)
+            if handler is None:
+                raise ValueError(f"unknown opcode {opcode}")
+            body = handler(payload)
+            return _frame(request_id, OK, body) if isinstance(body, bytes) else body
+        except (IndexError, KeyError, ValueError, struct.error) as error:
+            return _frame(request_id, ERROR, str(error).encode("utf-8"))
+
+    def _table(self, payload):
+        (table_id,) = _TABLE.unpack_from(payload, _HEADER.size)
+        game = self.tables.get(table_id)
+        if game is None:
+            raise ValueError(f"no table {table_id}")
+        return game
+
+    def _create_table(self, payload):
+        seed, include_joker = _CREATE.unpack_from(payload, _HEADER.size)
+        offset = _HEADER.size + _CREATE.size
+        if offset >= len(payload):
+            raise ValueError("truncated request: missing the name count")
+        count = payload[offset]
+        offset += 1
+        names = []
+        for _ in range(count):
+            name, offset = _unpack_str(payload, offset)
+            names.append(name)
+        if not names or len(set(names)) != len(names):
+            raise ValueError("a table needs distinct player names")
+        table_id = next(self._table_ids)
+        self.tables[table_id] = Game(names, include_joker=bool(include_joker), rng=random.Random(seed),
+                                     sink=NullSink(), evaluator=self.evaluator)
+        return _TABLE.pack(table_id)
+
+    def _deal(self, payload):
+        game = self._table(payload)
+        cards = _DEAL.unpack_from(payload, _HEADER.size)[1]
+        if cards * len(game.players) > (54 if game.deck.include_joker else 52):
+            raise ValueError("not enough cards to deal every hand")
+        game.reset()
+        game.deal(cards or None)
+        return b""
+
+    def _play_round(self, payload):
+        game = self._table(payload)
+        if not game.players or not all(player.hand for player in game.players.values()):
+            raise ValueError("every player needs a card to play a round")
+        game.play_round()
+        return _pack_str(game.round_winner)
+
+    def _remove_player(self, payload):
+        game = self._table(payload)
+        name, _ = _unpack_str(payload, _HEADER.size + _TABLE.size)
+        if name not in game.players:
+            raise ValueError(f"no player {name!r}")
+        game.remove_player(name)
+        return b""
+
+    def _close_table(self, payload):
+        (table_id,) = _TABLE.unpack_from(payload, _HEADER.size)
+        if self.tables.pop(table_id, None) is None:
+            raise ValueError(f"no table {table_id}")
+        return b""
+
+    def _winner(self, payload):
+        game = self._table(payload)
+        hands = [[card.id for card in player.hand] for player in game.players.values()]
+        if not any(hands):
+            raise ValueError("no cards have been dealt")
+        if self.workers and max(map(len, hands)) > MAX_TABLE_CARDS:
+            loop = asyncio.get_running_loop()
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            # Submitted now, with a copy of the hands, so later requests cannot change what is scored
+            try:
+                scoring = loop.run_in_executor(self._pool, _best_seat, hands)
+            except BrokenExecutor:
+                # A worker died earlier; the requests it held were answered with errors
+                self._pool.shutdown(wait=False)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                scoring = loop.run_in_executor(self._pool, _best_seat, hands)
+            return self._scored(list(game.players), scoring)
+        name, hand_type = game.determine_winner()
+        return _pack_str(name) + bytes((HAND_RANKINGS[hand_type],))
+
+    @staticmethod
+    async def _scored(names, scoring):
+        seat, strength = await scoring
+        return _pack_str(names[seat]) + bytes((strength >> TIEBREAK_BITS,))
+
+    async def _respond_later(self, request_id, body, writer):
+        try:
+            response = _frame(request_id, OK, await body)
+        except (KeyError, ValueError) as error:
+            response = _frame(request_id, ERROR, str(error).encode("utf-8"))
+        except BrokenExecutor as error:
+            response = _frame(request_id, ERROR, f"worker pool failed: {error}".encode("utf-8"))
+        except Exception as error:  # Anything else raised by a worker still gets an answer
+            response = _frame(request_id, ERROR, f"{type(error).__name__}: {error}".encode("utf-8"))
+        if not writer.is_closing():
+            writer.write(response)
+
+
+class GameClient:
+    """
+    An asyncio client for ``GameServer``.
+
+    Each call sends its request at once and waits for the matching response, so
+    concurrent calls (e.g. through ``asyncio.gather``) are pipelined over the
+    one connection.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._waiting = {}
+        self._request_ids = itertools.count(1)
+        self._receiver = asyncio.ensure_future(self._receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT):
+        """Connect to a server on a TCP address."""
+        return cls(*await asyncio.open_connection(host, port))
+
+    @classmethod
+    async def connect_unix(cls, path: str):
+        """Connect to a server on a Unix socket."""
+        return cls(*await asyncio.open_unix_connection(path))
+
+    async def _receive(self):
+        error = ConnectionError("the server closed the connection")
+        try:
+            while True:
+                payload = await _read_frame(self._reader)
+                if payload is None:
+                    break
+                request_id, status = _HEADER.unpack_from(payload)
+                future = self._waiting.pop(request_id, None)
+                if future is not None and not future.done():
+                    if status == OK:
+                        future.set_result(payload[_HEADER.size:])
+                    else:
+                        future.set_exception(ServerError(payload[_HEADER.size:].decode("utf-8")))
+        except (ConnectionError, ValueError) as exc:
+            error = exc
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(error)
+        self._waiting.clear()
+
+    async def request(self, opcode: int, body=b""):
+        """
+        Send one request and return the response body.
+
+        Raises:
+            ServerError: If the server answered with an error.
+            ConnectionError: If the connection closed first.
+        """
+        if self._receiver.done():
+            raise ConnectionError("the connection is closed")
+        request_id = next(self._request_ids) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self._writer.write(_frame(request_id, opcode, body))
+        await self._writer.drain()
+        return await future
+
+    async def create_table(self, names, seed=0, include_joker=False):
+        """Create a table for the named players and return its id."""
+        body = _CREATE.pack(seed, include_joker) + bytes((len(names),)) + b"".join(map(_pack_str, names))
+        return _TABLE.unpack(await self.request(CREATE_TABLE, body))[0]
+
+    async def deal(self, table: int, cards=0):
+        """Start a new game at the table and deal ``cards`` to each player (0 deals the whole deck)."""
+        await self.request(DEAL, _DEAL.pack(table, cards))
+
+    async def play_round(self, table: int):
+        """Play one round and return the name of the player who won it."""
+        return _unpack_str(await self.request(PLAY_ROUND, _TABLE.pack(table)), 0)[0]
+
+    async def remove_player(self, table: int, name: str):
+        """Remove a player from the table, returning their cards to the deck."""
+        await self.request(REMOVE_PLAYER, _TABLE.pack(table) + _pack_str(name))
+
+    async def winner(self, table: int):
+        """Return the name and hand type of the player with the best hand."""
+        body = await self.request(WINNER, _TABLE.pack(table))
+        name, offset = _unpack_str(body, 0)
+        return name, CATEGORY_NAMES[body[offset]]
+
+    async def close_table(self, table: int):
+        """Remove the table from the server."""
+        await self.request(CLOSE_TABLE, _TABLE.pack(table))
+
+    async def close(self):
+        """Close the connection."""
+        self._writer.close()
+        self._receiver.cancel()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+async def run_load(connect, connections=8, depth=32, requests=100000, tables_per_connection=16, players=4,
+                   cards=5):
+    """
+    Drive a server with pipelined deal and winner requests and measure latency.
+
+    Each connection creates its own tables, then keeps ``depth`` requests in
+    flight, alternating ``DEAL`` and ``WINNER`` on its tables, until
+    ``requests`` requests have completed across all connections.
+
+    Args:
+        connect: A coroutine function returning a connected ``GameClient``.
+        connections (int, optional): Concurrent connections. Defaults to 8.
+        depth (int, optional): Requests in flight per connection. Defaults to 32.
+        requests (int, optional): Total requests to send. Defaults to 100000.
+        tables_per_connection (int, optional): Tables each connection plays at. Defaults to 16.
+        players (int, optional): Players per table. Defaults to 4.
+        cards (int, optional): Cards dealt to each player. Defaults to 5.
+
+    Returns:
+        dict: ``requests``, ``elapsed`` (seconds), ``requests_per_second``, and ``p50_ms``,
+        ``p99_ms`` and ``max_ms`` request latencies.
+    """
+    names = [f"Player {seat + 1}" for seat in range(players)]
+    latencies = []
+    remaining = [requests]
+
+    async def stream(client, tables, lane):
+        perf_counter = time.perf_counter
+        for step in itertools.count(lane):
+            if remaining[0] <= 0:
+                return
+            remaining[0] -= 1
+            table = tables[step // 2 % len(tables)]
+            start = perf_counter()
+            if step % 2:
+                await client.winner(table)
+            else:
+                await client.deal(table, cards)
+            latencies.append(perf_counter() - start)
+
+    async def drive(seed):
+        async with await connect() as client:
+            tables = await asyncio.gather(*(client.create_table(names, seed=seed * 1000 + index)
+                                            for index in range(tables_per_connection)))
+            # Deal once so that WINNER always has hands to score
+            await asyncio.gather(*(client.deal(table, cards) for table in tables))
+            await asyncio.gather(*(stream(client, tables, lane) for lane in range(depth)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(drive(seed) for seed in range(connections)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": len(latencies),
+        "elapsed": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": SchedulerStats.percentile(latencies, 0.50) * 1e3,
+        "p99_ms": SchedulerStats.percentile(latencies, 0.99) * 1e3,
+        "max_ms": max(latencies, default=0.0) * 1e3,
+    }
+
+
+async def _serve(args):
+    server = GameServer(args.workers)
+    if args.unix:
+        await server.start_unix(args.unix)
+    else:
+        await server.start(args.host, args.port)
+    print(f"serving on {server.address}")
+    try:
+        await server._server.serve_forever()
+    finally:
+        await server.close()
+
+
+async def _load(args):
+    if args.unix:
+        connect = lambda: GameClient.connect_unix(args.unix)
+    else:
+        connect = lambda: GameClient.connect(args.host, args.port)
+    report = await run_load(connect, args.connections, args.depth, args.requests, args.tables, args.players,
+                            args.cards)
+    print(f"{report['requests']} requests in {report['elapsed']:.2f}s ({report['requests_per_second']:,.0f} req/s)")
+    print(f"latency p50 {report['p50_ms']:.3f}ms, p99 {report['p99_ms']:.3f}ms, max {report['max_ms']:.3f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Game tables over a socket, or load-test a server.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("serve", "run a server"), ("load", "send pipelined requests and report latency")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--host", default="127.0.0.1")
+        command.add_argument("--port", type=int, default=DEFAULT_PORT)
+        command.add_argument("--unix", help="use a Unix socket at this path instead of TCP")
+    commands.choices["serve"].add_argument("--workers", type=int, default=None,
+                                           help="processes for heavy evaluation (default: CPU count)")
+    load = commands.choices["load"]
+    load.add_argument("--connections", type=int, default=8)
+    load.add_argument("--depth", type=int, default=32, help="requests in flight per connection")
+    load.add_argument("--requests", type=int, default=100000)
+    load.add_argument("--tables", type=int, default=16, help="tables per connection")
+    load.add_argument("--players", type=int, default=4)
+    load.add_argument("--cards", type=int, default=5)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args) if args.command == "serve" else _load(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
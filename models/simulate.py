@@ -0,0 +1,254 @@
+"""
+Run batches of games from the command line and report how fast they ran.
+
+Two modes are supported:
+
+    - ``deal``: deal ``--cards`` cards to every player and pick the winner with
+      ``Game.determine_winner``, as in a single-hand game.
+    - ``play``: deal the whole deck and play 13 rounds, as ``Game.play_game`` does.
+
+Games run headless unless ``--sink`` asks for events. The report at the end
+shows games/sec, the time spent in each phase (resetting and shuffling,
+dealing, scoring or playing) and the peak resident memory of the run.
+
+Run with:
+    python -m models --games 100000 --mode deal --players 4 --cards 5 --workers 4
+    python -m models --games 1000 --mode play --sink jsonl:events.jsonl --workers 1
+"""
+import argparse
+import os
+import time
+from collections import Counter
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from models.events import ConsoleSink, JsonLinesSink, NullSink, RingBufferSink
+from models.game import Game
+from models.tournament import run_shards, shard_rng, split_shards
+
+MODES = ("deal", "play")
+PHASES = {"deal": ("reset", "deal", "winner"), "play": ("reset", "deal", "play")}
+ROUNDS = 13
+
+
+def peak_memory():
+    """Return this process's peak resident memory in bytes, or None where it is unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == "Darwin" else peak * 1024  # Linux reports kilobytes
+
+
+class SimulationStats:
+    """
+    Counts and phase timings for a batch of games.
+
+    ``wins`` counts games won in ``deal`` mode and rounds won in ``play`` mode.
+    """
+
+    def __init__(self, mode: str):
+        """
+        Args:
+            mode (str): One of ``MODES``.
+        """
+        self.mode = mode
+        self.games = 0
+        self.wins = Counter()
+        self.hand_types = Counter()
+        self.phases = dict.fromkeys(PHASES[mode], 0.0)
+        self.peak_memory = None
+        self.elapsed = 0.0
+
+    def merge(self, other: "SimulationStats"):
+        """Add another batch's statistics into this one."""
+        self.games += other.games
+        self.wins.update(other.wins)
+        self.hand_types.update(other.hand_types)
+        for phase, seconds in other.phases.items():
+            self.phases[phase] += seconds
+        if other.peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, other.peak_memory)
+
+    @property
+    def games_per_second(self):
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def report(self):
+        """Return the end-of-run summary as text."""
+        lines = [f"{self.games} {self.mode} games in {self.elapsed:.2f}s ({self.games_per_second:,.0f} games/sec)"]
+        busy = sum(self.phases.values())
+        for phase, seconds in self.phases.items():
+            per_game = seconds / self.games * 1e6 if self.games else 0.0
+            share = seconds / busy if busy else 0.0
+            lines.append(f"  {phase:<8}{seconds:>9.3f}s {per_game:>10.1f}us/game {share:>7.1%}")
+        if self.peak_memory is not None:
+            lines.append(f"peak memory: {self.peak_memory / 2 ** 20:.1f} MiB (largest process)")
+        total = sum(self.wins.values())
+        unit = "wins" if self.mode == "deal" else "rounds won"
+        for name, wins in sorted(self.wins.items(), key=lambda item: -item[1]):
+            lines.append(f"{name}: {wins} {unit} ({wins / total:.2%})")
+        for hand_type, count in self.hand_types.most_common():
+            lines.append(f"{hand_type}: {count}")
+        return "\n".join(lines)
+
+
+def make_sink(spec: str, shard=None):
+    """
+    Build an event sink from its command-line spec.
+
+    Args:
+        spec (str): ``null``, ``console``, ``ring`` or ``jsonl:PATH``.
+        shard (int, optional): With ``jsonl``, append ``.<shard>`` to the path so
+            parallel shards write separate files. Defaults to None.
+
+    Raises:
+        ValueError: If the spec is not recognized.
+    """
+    _check_sink(spec)
+    if spec == "null":
+        return NullSink()
+    if spec == "console":
+        return ConsoleSink()
+    if spec == "ring":
+        return RingBufferSink()
+    path = spec[len("jsonl:"):]
+    return JsonLinesSink(path if shard is None else f"{path}.{shard}")
+
+
+def _check_sink(spec):
+    if spec not in ("null", "console", "ring") and not (spec.startswith("jsonl:") and len(spec) > len("jsonl:")):
+        raise ValueError(f"unknown sink {spec!r}; use null, console, ring or jsonl:PATH")
+
+
+def run_shard(mode: str, seed: int, shard: int, games: int, player_count: int, cards_per_hand: int,
+              include_joker=False, sink="null", shard_files=False):
+    """
+    Play one shard of games on a pooled ``Game`` and time each phase.
+
+    Args:
+        mode (str): One of ``MODES``.
+        seed (int): The master seed; the shard's generator comes from ``shard_rng``.
+        shard (int): The shard number.
+        games (int): Games to play.
+        player_count (int): Seats per table.
+        cards_per_hand (int): Cards dealt to each seat in ``deal`` mode.
+        include_joker (bool, optional): Include two Jokers in the deck. Defaults to False.
+        sink (str, optional): The event sink spec, see ``make_sink``. Defaults to ``"null"``.
+        shard_files (bool, optional): Give the shard its own ``jsonl`` file. Defaults to False.
+
+    Returns:
+        SimulationStats: The shard's results.
+    """
+    perf_counter = time.perf_counter
+    stats = SimulationStats(mode)
+    events = make_sink(sink, shard if shard_files else None)
+    game = Game([f"Player {seat + 1}" for seat in range(player_count)], include_joker=include_joker,
+                rng=shard_rng(seed, shard), sink=events)
+    resetting = dealing = finishing = 0.0
+    try:
+        for number in range(games):
+            start = perf_counter()
+            if number:
+                game.reset()
+            dealt = perf_counter()
+            if mode == "deal":
+                game.deal(cards_per_hand)
+                scored = perf_counter()
+                winner, hand_type = game.determine_winner()
+                stats.wins[winner] += 1
+                stats.hand_types[hand_type] += 1
+            else:
+                game.deal()
+                scored = perf_counter()
+                for _ in range(ROUNDS):
+                    game.play_round()
+                    stats.wins[game.round_winner] += 1
+            end = perf_counter()
+            resetting += dealt - start
+            dealing += scored - dealt
+            finishing += end - scored
+    finally:
+        events.close()
+    stats.games = games
+    stats.phases = dict(zip(PHASES[mode], (resetting, dealing, finishing)))
+    stats.peak_memory = peak_memory()
+    return stats
+
+
+def _run_shard(args):
+    return run_shard(*args)
+
+
+def run_simulation(games: int, mode="deal", player_count=4, cards_per_hand=5, include_joker=False, seed=0,
+                   workers=1, sink="null", shard_size=10000):
+    """
+    Play ``games`` games, split into shards across worker processes.
+
+    Results depend on the seed and the shard size, not on the number of workers.
+
+    Args:
+        games (int): The number of games.
+        mode (str, optional): ``"deal"`` or ``"play"``. Defaults to ``"deal"``.
+        player_count (int, optional): Seats per table. Defaults to 4.
+        cards_per_hand (int, optional): Cards dealt to each seat in ``deal`` mode. Defaults to 5.
+        include_joker (bool, optional): Include two Jokers in each deck. Defaults to False.
+        seed (int, optional): The master seed. Defaults to 0.
+        workers (int, optional): Worker processes; 1 runs in this process. Defaults to 1.
+        sink (str, optional): The event sink spec, see ``make_sink``. Defaults to ``"null"``.
+        shard_size (int, optional): Games per work unit. Defaults to 10000.
+
+    Returns:
+        SimulationStats: The merged results, with ``elapsed`` set to the wall-clock time.
+
+    Raises:
+        ValueError: On an unknown mode or sink, an empty hand, or if the deck cannot cover every hand.
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}; use one of {', '.join(MODES)}")
+    _check_sink(sink)
+    deck_size = 54 if include_joker else 52
+    needed = cards_per_hand if mode == "deal" else ROUNDS
+    if needed < 1:
+        raise ValueError("every hand needs at least one card")
+    if player_count < 1 or player_count * needed > deck_size:
+        raise ValueError(f"a {deck_size}-card deck cannot give {player_count} players {needed} cards each")
+    shards = [(mode, seed, shard, count, player_count, cards_per_hand, include_joker, sink, workers > 1)
+              for shard, _, count in split_shards(games, shard_size)]
+    total = run_shards(_run_shard, shards, SimulationStats(mode), workers)
+    own_peak = peak_memory()
+    if own_peak is not None:
+        total.peak_memory = max(total.peak_memory or 0, own_peak)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m models", description="Run a batch of games headless and "
+                                     "report throughput, per-phase timing and peak memory.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--mode", choices=MODES, default="deal",
+                        help="deal: one hand and determine_winner; play: play_game's 13 rounds")
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--cards", type=int, default=5, help="cards per hand in deal mode")
+    parser.add_argument("--jokers", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes (default: %(default)s)")
+    parser.add_argument("--shard-size", type=int, default=10000)
+    parser.add_argument("--sink", default="null", help="null, console, ring or jsonl:PATH (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.shard_size < 1:
+        parser.error("--shard-size must be at least 1")
+    if args.cards < 1:
+        parser.error("--cards must be at least 1")
+
+    try:
+        stats = run_simulation(args.games, args.mode, args.players, args.cards, args.jokers, args.seed,
+                               args.workers, args.sink, args.shard_size)
+    except ValueError as error:
+        parser.error(str(error))
+    print(stats.report())
+    return 0
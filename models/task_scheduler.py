@@ -1,14 +1,322 @@
+"""
+Run delayed and recurring tasks on an asyncio event loop.
 
+Tasks wait in a min-heap keyed by due time, so the scheduler only ever sleeps
+until the earliest task is due and the total runtime is the longest delay, not
+the sum of all of them. Plain callables run inline on the loop; coroutine
+functions and coroutine objects run as asyncio tasks, at most
+``max_concurrency`` at a time.
+"""
+import asyncio
+import heapq
+import inspect
+import itertools
 import time
+from collections import deque
+
+
+class ScheduledTask:
+    """A handle for a task added to a ``TaskScheduler``."""
+
+    __slots__ = ("name", "action", "due", "interval", "cancelled", "runs", "_running")
+
+    def __init__(self, name, action, due: float, interval: float = None):
+        self.name = name
+        self.action = action
+        self.due = due
+        self.interval = interval
+        self.cancelled = False
+        self.runs = 0
+        self._running = None
+
+    def cancel(self):
+        """
+        Stop the task from running again.
+
+        A coroutine that is already running is cancelled as well.
+        """
+        self.cancelled = True
+        if self._running is not None:
+            self._running.cancel()
+        elif inspect.iscoroutine(self.action):
+            self.action.close()  # Never started; avoids the "never awaited" warning
+
+    def __repr__(self):
+        return f"ScheduledTask({self.name!r}, due={self.due:.3f}, interval={self.interval})"
+
+
+class SchedulerStats:
+    """
+    Timing statistics for a ``TaskScheduler``.
+
+    Lag is how late a task started compared with its due time; latency is how
+    long it took to run. Totals cover every run; percentiles are taken from the
+    most recent ``sample_size`` runs.
+    """
+
+    def __init__(self, sample_size=10000):
+        self.executed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.lags = deque(maxlen=sample_size)
+        self.latencies = deque(maxlen=sample_size)
+
+    def record(self, lag: float, latency: float):
+        self.executed += 1
+        self.total_lag += lag
+        self.total_latency += latency
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if latency > self.max_latency:
+            self.max_latency = latency
+        self.lags.append(lag)
+        self.latencies.append(latency)
+
+    @property
+    def mean_lag(self):
+        return self.total_lag / self.executed if self.executed else 0.0
+
+    @property
+    def mean_latency(self):
+        return self.total_latency / self.executed if self.executed else 0.0
+
+    @staticmethod
+    def percentile(samples, fraction: float):
+        """
+        Return the given fraction (0..1) of a list of samples, or 0.0 when it is empty.
+        """
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def __repr__(self):
+        return (f"SchedulerStats(executed={self.executed}, cancelled={self.cancelled}, failed={self.failed}, "
+                f"mean_lag={self.mean_lag * 1e3:.3f}ms, max_lag={self.max_lag * 1e3:.3f}ms)")
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _discard(awaitable):
+    """Drop an awaitable that will never be awaited."""
+    if inspect.iscoroutine(awaitable):
+        awaitable.close()
+    elif isinstance(awaitable, asyncio.Future):
+        awaitable.cancel()
+
+
+def _print_task(name):
+    print(f"{time.strftime('%Y-%m-%d %H:%M:%S')}: {name}")
+
 
 class TaskScheduler:
-    def __init__(self):
-        self.tasks = []
+    def __init__(self, max_concurrency=None, sample_size=10000):
+        """
+        Initialize a TaskScheduler.
+
+        Args:
+            max_concurrency (int, optional): The most coroutines that may run at once.
+                Defaults to no limit.
+            sample_size (int, optional): Recent runs kept for lag and latency percentiles.
+                Defaults to 10000.
+        """
+        self.tasks = []  # The heap of (due, sequence, ScheduledTask)
+        self.max_concurrency = max_concurrency
+        self.stats = SchedulerStats(sample_size)
+        self._sequence = itertools.count()
+        self._loop = None
+        self._origin = 0.0
+        self._wakeup = None
+        self._running = set()
+        self._slots = None
+
+    def __len__(self):
+        return sum(not entry[2].cancelled for entry in self.tasks)
+
+    def now(self):
+        """
+        Return the scheduler time in seconds.
+
+        Before ``run`` starts this is 0, so delays given to ``add`` count from the
+        start of the run; while running, it is the time since the run started.
+        """
+        if self._loop is None:
+            return 0.0
+        return self._loop.time() - self._origin
+
+    def add(self, name, delay: float, action=None, interval: float = None):
+        """
+        Schedule a task.
+
+        Args:
+            name (str): A label for the task.
+            delay (float): Seconds from now (or from the start of the run) until the first run.
+            action (callable or coroutine, optional): What to run. A callable is called with no
+                arguments and may return an awaitable; a coroutine object is awaited once.
+                Defaults to printing a timestamp and the name.
+            interval (float, optional): Run again every ``interval`` seconds after the due time
+                until cancelled. Defaults to running once.
+
+        Returns:
+            ScheduledTask: A handle that can cancel the task.
+
+        Raises:
+            ValueError: If the delay is negative, the interval is not positive, or a
+                coroutine object is given a repeat interval.
+        """
+        if delay < 0:
+            raise ValueError("delay must not be negative")
+        if interval is not None and interval <= 0:
+            raise ValueError("interval must be positive")
+        if inspect.iscoroutine(action) and interval is not None:
+            raise ValueError("a coroutine object can only run once")
+        if action is None:
+            action = lambda: _print_task(name)
+        task = ScheduledTask(name, action, self.now() + delay, interval)
+        self._push(task)
+        return task
+
+    def cancel(self, task: ScheduledTask):
+        """
+        Cancel a scheduled task.
+
+        Cancelled tasks are dropped from the heap when they reach the top.
+        """
+        if not task.cancelled:
+            task.cancel()
+            self.stats.cancelled += 1
+
+    def _push(self, task):
+        heapq.heappush(self.tasks, (task.due, next(self._sequence), task))
+        if self._wakeup is not None and self.tasks[0][2] is task:
+            _wake(self._wakeup)
+
+    async def run(self):
+        """
+        Run tasks as they fall due until none are left.
+
+        Returns when the heap is empty and every coroutine has finished. Recurring
+        tasks keep the run going until they are cancelled. Exceptions raised by tasks
+        are counted in ``stats.failed`` and do not stop the scheduler.
+        """
+        self._loop = loop = asyncio.get_running_loop()
+        self._origin = loop.time()
+        if self.max_concurrency:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        tasks = self.tasks
+        try:
+            while tasks or self._running:
+                if not tasks:
+                    await self._sleep()  # Until a coroutine finishes or adds a task
+                    continue
+                due, _, task = tasks[0]
+                if task.cancelled:
+                    heapq.heappop(tasks)
+                    continue
+                wait = due - (loop.time() - self._origin)
+                if wait > 0:
+                    await self._sleep(wait)
+                    continue
+                heapq.heappop(tasks)
+                self._dispatch(task)
+        finally:
+            self._loop = None
+            self._wakeup = None
+
+    async def _sleep(self, delay=None):
+        """Sleep until the delay passes, an earlier task is added or a coroutine finishes."""
+        self._wakeup = wakeup = self._loop.create_future()
+        timer = self._loop.call_later(delay, _wake, wakeup) if delay is not None else None
+        try:
+            await wakeup
+        finally:
+            if timer is not None:
+                timer.cancel()
+            self._wakeup = None
+
+    def _dispatch(self, task):
+        """Start one due task and put it back on the heap if it repeats."""
+        due = task.due
+        action = task.action
+        if task.interval is not None:
+            task.due += task.interval
+            self._push(task)
+        if inspect.iscoroutine(action):
+            self._start(task, action, due)
+            return
+        started = self._loop.time()
+        try:
+            result = action()
+        except Exception:
+            self.stats.failed += 1
+            return
+        if inspect.isawaitable(result):
+            self._start(task, result, due)
+            return
+        task.runs += 1
+        self.stats.record(started - self._origin - due, self._loop.time() - started)
+
+    def _start(self, task, awaitable, due):
+        """
+        Run an awaitable as an asyncio task.
+
+        The task waits for a concurrency slot itself, so the dispatcher never
+        blocks and plain callables keep running on time.
+        """
+        loop, origin = self._loop, self._origin
+        running = asyncio.ensure_future(self._run_when_free(task, awaitable))
+        task._running = running
+        self._running.add(running)
+
+        def finished(future):
+            self._running.discard(future)
+            if self._wakeup is not None:
+                _wake(self._wakeup)
+            if task._running is future:
+                task._running = None
+            if future.cancelled():
+                _discard(awaitable)  # In case it was cancelled before it started
+                return
+            if future.exception() is not None:
+                self.stats.failed += 1
+                return
+            started = future.result()
+            if started is None:  # Cancelled while it waited for a slot
+                return
+            task.runs += 1
+            self.stats.record(started - origin - due, loop.time() - started)
+
+        running.add_done_callback(finished)
+
+    async def _run_when_free(self, task, awaitable):
+        """Await ``awaitable`` once a slot is free and return when it started, or None if it never did."""
+        slots = self._slots
+        if slots is not None:
+            try:
+                await slots.acquire()
+            except asyncio.CancelledError:
+                _discard(awaitable)
+                raise
+        try:
+            if task.cancelled:
+                _discard(awaitable)
+                return None
+            started = self._loop.time()
+            await awaitable
+            return started
+        finally:
+            if slots is not None:
+                slots.release()
 
-    def add(self, name, delay):
-        self.tasks.append((name, delay))
-    
     def execute(self):
-        for task in self.tasks:
-            time.sleep(task[1])
-            print(f"{time.strftime('%Y-%m-%d %H:%M:%S')}: {task[0]}")
\ No newline at end of file
+        """
+        Run every scheduled task on a new event loop and block until they finish.
+        """
+        asyncio.run(self.run())
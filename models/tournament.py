@@ -0,0 +1,248 @@
+"""
+Run large numbers of single-hand games across worker processes.
+
+The games are split into fixed-size shards. Each shard gets its own random
+generator derived from the master seed and the shard number, so the totals do
+not depend on how many workers run the shards or in which order they finish.
+
+With ``seekable=True`` every game instead shuffles with a ``SeekableRandom``
+keyed by the seed and the game's number in the whole run. Any single game can
+then be rebuilt with ``seeded_game`` without playing the ones before it, and
+the totals do not depend on the shard size either.
+
+Run with:
+    python -m models.tournament --games 1000000 --players 4 --workers 4
+"""
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from models.evaluator import CATEGORY_NAMES, TIEBREAK_BITS
+from models.events import NullSink
+from models.game import Game
+from models.seekable import SeekableRandom
+
+
+class TournamentStats:
+    """Aggregated results of a batch of games."""
+
+    def __init__(self, player_count: int):
+        """
+        Initialize empty statistics.
+
+        Args:
+            player_count (int): The number of seats at each table.
+        """
+        self.games = 0
+        self.wins = [0] * player_count
+        self.hand_types = Counter()
+        self.elapsed = 0.0
+
+    def merge(self, other: "TournamentStats"):
+        """
+        Add another set of statistics into this one.
+
+        Args:
+            other (TournamentStats): Statistics for the same number of seats.
+        """
+        self.games += other.games
+        self.wins = [mine + theirs for mine, theirs in zip(self.wins, other.wins)]
+        self.hand_types.update(other.hand_types)
+
+    @property
+    def games_per_second(self):
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def __eq__(self, other):
+        if not isinstance(other, TournamentStats):
+            return NotImplemented
+        return (self.games, self.wins, self.hand_types) == (other.games, other.wins, other.hand_types)
+
+    def __repr__(self):
+        return f"TournamentStats(games={self.games}, wins={self.wins}, hand_types={dict(self.hand_types)})"
+
+
+def shard_rng(seed: int, shard: int):
+    """
+    Return the random generator for one shard.
+
+    Seeding with a string hashes it with SHA-512, so neighbouring shard numbers
+    still give unrelated streams.
+    """
+    return random.Random(f"{seed}:{shard}")
+
+
+def seeded_game(seed: int, game_number: int, player_count: int, cards_per_hand: int, include_joker=False,
+                sink=None):
+    """
+    Rebuild game ``game_number`` of a ``seekable`` run, dealt and ready to score.
+
+    Args:
+        seed (int): The run's master seed.
+        game_number (int): The game's position in the run, counting from 0.
+        player_count (int): Seats per table.
+        cards_per_hand (int): Cards dealt to each seat.
+        include_joker (bool, optional): Include two Jokers in the deck. Defaults to False.
+        sink (optional): The game's event sink. Defaults to a NullSink.
+
+    Returns:
+        Game: The dealt game.
+    """
+    names = [f"Player {seat + 1}" for seat in range(player_count)]
+    game = Game(names, include_joker=include_joker, rng=SeekableRandom(seed, game_number),
+                sink=sink if sink is not None else NullSink())
+    game.deal(cards_per_hand)
+    return game
+
+
+def play_shard(seed: int, shard: int, games: int, player_count: int, cards_per_hand: int, include_joker=False,
+               first_game=0, seekable=False):
+    """
+    Play one shard of games and return its statistics.
+
+    Each game shuffles a full deck, deals ``cards_per_hand`` cards to every seat
+    and scores the hands. The shard reuses one ``Game``, reset between deals.
+    Ties go to the lowest seat, as in ``Game.determine_winner``.
+
+    Args:
+        first_game (int, optional): The run-wide number of the shard's first game. Only used
+            with ``seekable``. Defaults to 0.
+        seekable (bool, optional): Shuffle each game with its own ``SeekableRandom`` instead
+            of one generator per shard. Defaults to False.
+
+    Returns:
+        TournamentStats: The results of the shard.
+    """
+    rng = SeekableRandom(seed, first_game) if seekable else shard_rng(seed, shard)
+    names = [f"Player {seat + 1}" for seat in range(player_count)]
+    stats = TournamentStats(player_count)
+    wins = stats.wins
+    hand_types = stats.hand_types
+    # One pooled game per shard: ``Game.reset`` reshuffles it in place for every deal.
+    game = Game(names, include_joker=include_joker, rng=rng, sink=NullSink())
+    for game_number in range(first_game, first_game + games):
+        if seekable:
+            rng.setstate((seed, game_number, 0))
+            game.reset()
+        elif game_number > first_game:
+            game.reset()
+        game.deal(cards_per_hand)
+        strengths = list(game.score_hands().values())
+        best = max(strengths)
+        wins[strengths.index(best)] += 1
+        for strength in strengths:
+            hand_types[strength >> TIEBREAK_BITS] += 1
+    stats.games = games
+    stats.hand_types = Counter({CATEGORY_NAMES[category]: count for category, count in hand_types.items()})
+    return stats
+
+
+def _play_shard(args):
+    return play_shard(*args)
+
+
+def split_shards(games: int, shard_size: int):
+    """
+    Split a run into work units.
+
+    Returns:
+        list[tuple[int, int, int]]: ``(shard, first_game, games)`` for each shard, in order.
+    """
+    return [(shard, start, min(shard_size, games - start)) for shard, start in enumerate(range(0, games, shard_size))]
+
+
+def run_shards(play, shards, total, workers=1):
+    """
+    Call ``play`` on each shard's arguments and merge every result into ``total``.
+
+    Args:
+        play (callable): Takes one item of ``shards`` and returns statistics with a ``merge``
+            method. It must be picklable (a module-level function) to run in worker processes.
+        shards (iterable): The arguments of each shard.
+        total: The statistics to merge into, e.g. an empty ``TournamentStats``.
+        workers (int, optional): Worker processes; 1 runs in this process. Defaults to 1.
+
+    Returns:
+        The merged ``total``, with ``elapsed`` set to the wall-clock time.
+    """
+    start_time = time.perf_counter()
+    if workers <= 1:
+        for result in map(play, shards):
+            total.merge(result)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for result in pool.map(play, shards):
+                total.merge(result)
+    total.elapsed = time.perf_counter() - start_time
+    return total
+
+
+def run_tournament(games: int, player_count=4, cards_per_hand=5, seed=0, workers=None, shard_size=10000,
+                   include_joker=False, seekable=False):
+    """
+    Play ``games`` single-hand games and merge the results.
+
+    Args:
+        games (int): The total number of games.
+        player_count (int, optional): Seats per table. Defaults to 4.
+        cards_per_hand (int, optional): Cards dealt to each seat. Defaults to 5.
+        seed (int, optional): The master seed. Defaults to 0.
+        workers (int, optional): Worker processes. Defaults to ``os.cpu_count()``; 1 runs in this process.
+        shard_size (int, optional): Games per work unit. Defaults to 10000.
+        include_joker (bool, optional): Include two Jokers in each deck. Defaults to False.
+        seekable (bool, optional): Key each game's shuffle by its number, see ``seeded_game``.
+            Defaults to False.
+
+    Returns:
+        TournamentStats: The merged statistics, with ``elapsed`` set to the wall-clock time.
+
+    Raises:
+        ValueError: If a hand would be empty or the deck cannot cover every hand.
+    """
+    if cards_per_hand < 1:
+        raise ValueError("every hand needs at least one card")
+    deck_size = 54 if include_joker else 52
+    if player_count * cards_per_hand > deck_size:
+        raise ValueError("not enough cards to deal every hand")
+    workers = workers or os.cpu_count() or 1
+    shards = [(seed, shard, count, player_count, cards_per_hand, include_joker, start, seekable)
+              for shard, start, count in split_shards(games, shard_size)]
+    return run_shards(_play_shard, shards, TournamentStats(player_count), workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run many single-hand games in parallel.")
+    parser.add_argument("--games", type=int, default=100000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--cards", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--shard-size", type=int, default=10000)
+    parser.add_argument("--jokers", action="store_true")
+    parser.add_argument("--seekable", action="store_true", help="key each game's shuffle by its number")
+    args = parser.parse_args(argv)
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+    if args.players < 1:
+        parser.error("--players must be at least 1")
+    if args.cards < 1:
+        parser.error("--cards must be at least 1")
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.shard_size < 1:
+        parser.error("--shard-size must be at least 1")
+
+    stats = run_tournament(args.games, args.players, args.cards, args.seed, args.workers, args.shard_size, args.jokers,
+                           args.seekable)
+    print(f"{stats.games} games in {stats.elapsed:.2f}s ({stats.games_per_second:,.0f} games/sec)")
+    for seat, wins in enumerate(stats.wins):
+        print(f"Player {seat + 1}: {wins} wins ({wins / stats.games:.2%})")
+    for hand_type, count in stats.hand_types.most_common():
+        print(f"{hand_type}: {count}")
+
+
+if __name__ == "__main__":
+    main()
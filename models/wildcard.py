@@ -0,0 +1,157 @@
+"""
+Wildcard evaluation: each Joker stands for whichever card makes the best hand.
+
+The original rules only let a Joker fill the first gap in a straight, so a
+Joker never makes trips, quads or a flush, and the ``"Wildcard Hand"`` ranking
+is never produced. ``WildcardEvaluator`` scores a hand with one or two Jokers as
+the best hand any substitution of standard cards can make. A Joker may stand
+for a card already in the hand, so five cards of one rank are possible; they
+score as a ``"Wildcard Hand"``, above a straight flush.
+
+For hands of up to five cards the best substitution only depends on the rank
+multiset of the other cards and on whether they share a suit, which is exactly
+what the ``HandEvaluator`` table keys hold. The wildcard tables are built over
+those keys, so scoring a hand with Jokers is one lookup, like any other hand.
+
+Run ``python -m models.wildcard verify [size]`` to check every hand of a given
+size (default 5) that holds a Joker against brute-force substitution. Five-card
+hands take several minutes.
+"""
+import itertools
+import sys
+
+from models.card import STANDARD_CARDS, JOKERS
+from models.evaluator import MAX_TABLE_CARDS, RANK_KEY_MASK, HandEvaluator, _representatives, pack, \
+    reference_evaluate
+
+# Wildcard lookup tables by hand size, shared by every WildcardEvaluator.
+_wild_tables = {}
+
+
+def natural_strength(hand):
+    """
+    Score a hand without Jokers, which may hold the same card twice.
+
+    Five cards of one rank are a ``"Wildcard Hand"``; anything else follows
+    the original rules.
+    """
+    first = hand[0].value
+    if len(hand) == 5 and all(card.value == first for card in hand):
+        return pack("Wildcard Hand", [first])
+    return pack(*reference_evaluate(hand))
+
+
+def _best_substitution(others, jokers, candidates):
+    return max(natural_strength(others + list(cards))
+               for cards in itertools.combinations_with_replacement(candidates, jokers))
+
+
+def brute_force_evaluate(hand):
+    """
+    Score a hand by trying every standard card for every Joker.
+
+    This is the ground truth the wildcard tables are verified against, and the
+    fallback for hands larger than ``MAX_TABLE_CARDS``.
+    """
+    others = [card for card in hand if card.value != 15]
+    return _best_substitution(others, len(hand) - len(others), STANDARD_CARDS)
+
+
+class WildcardEvaluator(HandEvaluator):
+    """
+    A ``HandEvaluator`` whose Jokers are wild.
+
+    Use it in place of the default evaluator, e.g.
+    ``Game(names, include_joker=True, evaluator=WildcardEvaluator())``. Hands
+    without Jokers score exactly as they do under the original rules.
+    """
+
+    _table_cache = _wild_tables
+    _table_name = "wildcard_table"
+
+    def _build(self, size: int):
+        table = {}
+        for key, hand in _representatives(size):
+            others = [card for card in hand if card.value != 15]
+            # A substitute in the suit of the other cards is never worse than one in
+            # another suit: it can only add a flush. So thirteen candidates suffice.
+            suit = others[0].suit_index if others else 0
+            table[key] = _best_substitution(others, len(hand) - len(others), STANDARD_CARDS[suit * 13:suit * 13 + 13])
+        return table
+
+    def evaluate(self, hand):
+        """
+        Return the strength of a hand with every Joker substituted at best.
+
+        Args:
+            hand (list[Card]): The cards to evaluate. Must not be empty.
+
+        Returns:
+            int: The hand strength.
+        """
+        code = 0
+        for card in hand:
+            code += card.code
+        return self.evaluate_code(code, hand)
+
+    def evaluate_code(self, code: int, hand):
+        """
+        Return the strength of a hand whose summed ``CARD_CODES`` are already known.
+
+        Args:
+            code (int): The sum of ``CARD_CODES`` over the hand.
+            hand (list[Card]): The cards, used when the hand is too large for the tables.
+
+        Returns:
+            int: The hand strength.
+        """
+        table = _wild_tables.get(len(hand))
+        if table is None and len(hand) <= MAX_TABLE_CARDS:
+            table = self.table(len(hand))
+        if table:
+            strength = table.get(code) or table.get(code & RANK_KEY_MASK)
+            if strength:
+                return strength
+        return brute_force_evaluate(hand)
+
+    def evaluate_best(self, hand):
+        """
+        Return the strength of the best five-card hand that can be made from ``hand``.
+
+        Larger hands are scored by looking up every 5-card subset.
+        """
+        if len(hand) <= 5:
+            return self.evaluate(hand)
+        return self.naive_best(hand)
+
+
+def verify(size=MAX_TABLE_CARDS, evaluator=None):
+    """
+    Compare the wildcard tables with brute-force substitution on every hand of ``size`` cards with a Joker.
+
+    Args:
+        size (int, optional): The hand size. Defaults to ``MAX_TABLE_CARDS``.
+        evaluator (WildcardEvaluator, optional): The evaluator to check. Defaults to a new one.
+
+    Returns:
+        int: The number of hands checked.
+
+    Raises:
+        AssertionError: On the first hand where the two disagree.
+    """
+    evaluator = evaluator or WildcardEvaluator()
+    checked = 0
+    for jokers in range(1, min(size, len(JOKERS)) + 1):
+        for others in itertools.combinations(STANDARD_CARDS, size - jokers):
+            hand = list(others) + list(JOKERS[:jokers])
+            assert evaluator.evaluate(hand) == brute_force_evaluate(hand), f"mismatch for {hand}"
+            checked += 1
+    return checked
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["verify"] and len(sys.argv) <= 3:
+        print(f"verified {verify(int(sys.argv[2]) if len(sys.argv) == 3 else MAX_TABLE_CARDS)} hands")
+    else:
+        print("usage: python -m models.wildcard verify [size]")
+        sys.exit(2)
@@ -0,0 +1,54 @@
+import pytest
+
+from models.card import Card
+from models.eval_cache import CachedEvaluator
+from models.evaluator import HandEvaluator
+
+np = pytest.importorskip("numpy")
+from models import batch_evaluator
+
+def test_batch_matches_scalar():
+    evaluator = HandEvaluator(use_disk_cache=False)
+    batch = batch_evaluator.BatchEvaluator(evaluator)
+    decks = batch_evaluator.shuffled_decks(3000, np.random.default_rng(3), include_joker=True)
+    for size in range(1, 6):
+        categories, tiebreaks = batch.evaluate(decks[:, :size])
+        strengths = [evaluator.evaluate([Card.from_id(i) for i in ids]) for ids in decks[:, :size]]
+        # Batch scores must order hands exactly as the full scalar strengths do
+        batch_order = sorted(range(len(strengths)), key=lambda row: (categories[row], tiebreaks[row], row))
+        scalar_order = sorted(range(len(strengths)), key=lambda row: (strengths[row], row))
+        assert batch_order == scalar_order
+        for low, high in zip(scalar_order, scalar_order[1:]):
+            same = strengths[low] == strengths[high]
+            assert ((categories[low], tiebreaks[low]) == (categories[high], tiebreaks[high])) == same
+
+def test_batch_keeps_two_pair_kickers():
+    evaluator = HandEvaluator(use_disk_cache=False)
+    batch = batch_evaluator.BatchEvaluator(evaluator)
+    hands = [[Card("♣", "9"), Card("♦", "9"), Card("♣", "4"), Card("♦", "4"), Card("♥", rank)] for rank in ("3", "2")]
+    assert evaluator.evaluate(hands[0]) > evaluator.evaluate(hands[1])
+    categories, tiebreaks = batch.evaluate([[card.id for card in hand] for hand in hands])
+    assert categories[0] == categories[1]
+    assert tiebreaks[0] > tiebreaks[1]
+
+def test_batch_keeps_an_empty_cached_evaluator():
+    cached = CachedEvaluator(HandEvaluator(use_disk_cache=False))
+    assert batch_evaluator.BatchEvaluator(cached).evaluator is cached
+
+def test_batch_falls_back_for_impossible_hands():
+    evaluator = HandEvaluator(use_disk_cache=False)
+    batch = batch_evaluator.BatchEvaluator(evaluator)
+    jokers = [[52, 53, 52, 0, 1]]
+    categories, tiebreaks = batch.evaluate(jokers)
+    expected = batch_evaluator.split_strength(evaluator.evaluate([Card.from_id(i) for i in jokers[0]]))
+    assert (categories[0], tiebreaks[0]) == expected
+
+def test_batch_rejects_bad_shapes():
+    # Hands larger than the lookup tables are rejected, not scored.
+    batch = batch_evaluator.BatchEvaluator()
+    with pytest.raises(ValueError):
+        batch.evaluate(np.zeros((4, 6), dtype=np.int8))
+    with pytest.raises(ValueError):
+        batch.evaluate(np.zeros((4, 0), dtype=np.int8))
+    with pytest.raises(ValueError):
+        batch.evaluate(np.zeros(5, dtype=np.int8))
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from models import batch_play
+from models.batch_play import deal_hands, play_games, seeded_decks
+from models.events import RingBufferSink
+from models.game import Game
+
+def _scalar(names, seed, include_joker=False):
+    sink = RingBufferSink(capacity=1000)
+    game = Game(names, include_joker=include_joker, rng=random.Random(seed), sink=sink)
+    game.play_game()
+    plays = [event.card.id for event in sink.events if event.kind == "play"]
+    winners = [names.index(event.player) for event in sink.events if event.kind == "round_won"]
+    return plays, winners
+
+@pytest.mark.parametrize("player_count, include_joker", [(4, False), (4, True), (3, False), (2, True)])
+def test_matches_scalar_engine(player_count, include_joker, monkeypatch):
+    monkeypatch.setattr(batch_play, "CHUNK_GAMES", 16)  # Several chunks
+    names = [f"Player {seat + 1}" for seat in range(player_count)]
+    seeds = range(40)
+    result = play_games(deal_hands(seeded_decks(seeds, include_joker), player_count))
+    for game, seed in enumerate(seeds):
+        plays, winners = _scalar(names, seed, include_joker)
+        assert result.plays[game].ravel().tolist() == plays
+        assert result.winners[game].tolist() == winners
+        assert result.tricks[game].tolist() == [winners.count(seat) for seat in range(player_count)]
+    assert (result.leaders[:, 1:] == result.winners[:, :-1]).all()
+
+def test_deal_pads_uneven_hands():
+    hands = deal_hands(seeded_decks([0], include_joker=True), 4)
+    assert hands.shape == (1, 4, 14)
+    assert (hands[0, 2:, 13] == -1).all()
+    with pytest.raises(ValueError):
+        play_games(deal_hands(seeded_decks([0]), 5))
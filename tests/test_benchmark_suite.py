@@ -0,0 +1,57 @@
+import json
+import time
+
+from benchmarks import suite
+
+def _document(times):
+    return {"format": suite.RESULTS_FORMAT, "environment": {"python": "3"},
+            "results": {name: {"best_ns": best, "median_ns": best, "number": 1, "repeat": 1}
+                        for name, best in times.items()}}
+
+def test_every_benchmark_runs():
+    cases = suite.benchmarks()
+    for category in list(suite.CATEGORY_HANDS) + ["Wildcard Hand"]:
+        assert f"evaluate_hand[{category}]" in cases
+    for players in range(2, 11):
+        assert f"determine_winner[{players} players]" in cases
+    for function in cases.values():
+        function()
+    assert cases["evaluate_hand[Wildcard Hand]"]()[0] == "Full House"
+
+def test_compare_flags_regressions_beyond_the_threshold():
+    baseline = _document({"a": 100, "b": 100, "c": 100, "gone": 100, suite.REFERENCE: 50})
+    current = _document({"a": 124, "b": 130, "c": 70, "added": 5, suite.REFERENCE: 50})
+    rows = {row[0]: row for row in suite.compare_results(current, baseline, threshold=0.25)}
+    assert rows["a"][4] == "ok" and rows["b"][4] == "regression" and rows["c"][4] == "improvement"
+    assert rows["gone"][4] == "missing" and rows["added"][4] == "new"
+    assert rows["b"][3] == 1.3
+
+    # Everything twice as slow on a machine that is twice as slow is not a regression.
+    slower = _document({"a": 200, "b": 200, suite.REFERENCE: 100})
+    statuses = {row[0]: row[4] for row in suite.compare_results(slower, baseline, normalize=True)}
+    assert statuses["a"] == statuses["b"] == "ok"
+
+def test_compare_command_exit_status(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    current = tmp_path / "current.json"
+    baseline.write_text(json.dumps(_document({"a": 100})))
+    current.write_text(json.dumps(_document({"a": 110})))
+    assert suite.main(["compare", str(current), "--baseline", str(baseline)]) == 0
+    assert suite.main(["compare", str(current), "--baseline", str(baseline), "--threshold", "0.05"]) == 1
+    assert "1 benchmark(s) regressed" in capsys.readouterr().out
+
+def test_calibration_skips_the_first_call(monkeypatch):
+    calls = []
+
+    def warms_up():
+        # The first call builds something slow, like the evaluator's lookup tables.
+        if not calls:
+            time.sleep(0.05)
+        calls.append(1)
+
+    monkeypatch.setattr(suite, "benchmarks", lambda: {"warms_up": warms_up})
+    monkeypatch.setattr(suite, "MIN_TIME", 0.01)
+    monkeypatch.setattr(suite, "REPEAT", 1)
+    results = suite.run_suite()["results"]
+    assert results["warms_up"]["number"] > 1
+    assert results["warms_up"]["best_ns"] < 1e7
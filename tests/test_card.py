@@ -85,11 +85,53 @@ def test_card_sort():
     for i, card in enumerate(sorted_cards):
         assert repr(card) == repr(expected_order[i])
 
+def test_card_interning():
+    # Constructing a card returns the cached instance
+    assert Card("♠", "A") is Card("♠", "A")
+    assert Card.from_id(Card("♥", "10").id) is Card("♥", "10")
+
+    # Ids, values and masks are precomputed integers
+    card = Card("♦", "Q")
+    assert card.id == 1 * 13 + (12 - 2)
+    assert card.value == 12 and card.suit_index == 1
+    assert card.mask == 1 << card.id
+
+    # Jokers are two distinct cards that compare equal
+    joker = Card("None", "Joker")
+    assert joker.id == 52 and Card.from_id(53) == joker
+    assert joker > Card("♠", "A")
+
+def test_card_immutability():
+    card = Card("♣", "2")
+    for name in ("suit", "rank", "id", "extra"):
+        try:
+            setattr(card, name, "x")
+            assert False, "Card attributes should be read-only"
+        except AttributeError:
+            pass
+
+    import copy
+    import pickle
+    assert copy.deepcopy(card) is card
+    assert pickle.loads(pickle.dumps(card)) is card
+
+def test_card_ordering_rejects_other_types():
+    card = Card("♣", "2")
+    for compare in (lambda: card < 1, lambda: card > "2♣", lambda: card <= None, lambda: card >= 2.0):
+        try:
+            compare()
+            assert False, "Comparing a card with a non-card should raise TypeError"
+        except TypeError:
+            pass
+
 def run_tests():
     test_card_initialization()
     test_card_repr()
     test_card_comparisons()
     test_card_sort()
+    test_card_interning()
+    test_card_immutability()
+    test_card_ordering_rejects_other_types()
     print("All tests passed!")
 
 # Run the tests
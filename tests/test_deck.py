@@ -1,5 +1,12 @@
+import random
+from collections import Counter
+
+import pytest
+
 from models.card import Card
-from models.deck import Deck
+from models.deck import CompactDeck, Deck, Shoe
+from models.events import NullSink
+from models.game import Game
 
 def test_deck_initialization(self):
     # Initialize deck and check it contains 52 cards
@@ -67,3 +74,97 @@ def test_draw_multiple_invalid_count(self):
     self.assertEqual(len(drawn_cards), 52)  # All 52 cards should be drawn
     self.assertEqual(len(deck.cards), 0)  # Deck should be empty
 
+
+def test_compact_deck_matches_deck_order():
+    deck = Deck(rng=random.Random(4))
+    compact = CompactDeck(rng=random.Random(4))
+    deck.shuffle()
+    compact.shuffle()
+    assert compact.cards == deck.cards
+    assert compact.draw_multiple(5) == deck.draw_multiple(5)
+    assert compact.draw() == deck.draw()
+    assert len(compact) == len(deck) == 46
+
+def test_compact_deck_draw_ids_is_a_view():
+    compact = CompactDeck()
+    drawn = compact.draw_ids(4)
+    assert isinstance(drawn, memoryview) and drawn.readonly
+    assert list(drawn) == [48, 49, 50, 51]
+    assert len(compact) == 48
+    assert compact.draw_multiple(100) == "over flow"
+    assert compact.draw_multiple(0) == "Invalid count"
+
+def test_compact_deck_add_cards_keeps_every_card():
+    compact = CompactDeck(include_joker=True, rng=random.Random(9))
+    compact.shuffle()
+    hand = compact.draw_multiple(20)
+    compact.add_cards(hand)
+    assert len(compact) == 54
+    assert sorted(card.id for card in compact.cards) == list(range(54))
+
+def test_shoe_deals_every_copy_once():
+    shoe = Shoe(8, include_joker=True, rng=random.Random(3))
+    assert len(shoe) == 8 * 54 and shoe.count(Card("♠", "A")) == 8
+    drawn = Counter(card.id for card in shoe.draw_multiple(8 * 54))
+    assert drawn == Counter({card_id: 8 for card_id in range(54)})
+    assert shoe.draw() is None and shoe.draw_multiple(1) == "over flow"
+    assert not any(shoe.counts)
+
+def test_shoe_draws_uniformly():
+    first = Counter(Shoe(2, rng=random.Random(seed)).draw().id for seed in range(10400))
+    assert len(first) == 52 and min(first.values()) > 140 and max(first.values()) < 260
+
+def test_shoe_counts_and_snapshot_follow_draws_and_returns():
+    shoe = Shoe(3, rng=random.Random(4))
+    hand = shoe.draw_multiple(40)
+    assert sorted(shoe.cards + hand) == sorted(list(Deck().cards) * 3)
+    for card in set(hand):
+        assert shoe.count(card) == 3 - hand.count(card)
+    shoe.add_cards(hand)
+    assert len(shoe) == 156 and sorted(shoe.cards) == sorted(list(Deck().cards) * 3)
+    with pytest.raises(ValueError):
+        shoe.add_cards([Card("♥", "2")])
+
+def test_shoe_reshuffles_at_the_cut_card():
+    shoe = Shoe(2, rng=random.Random(5), penetration=0.5)
+    shoe.draw_multiple(51)
+    shoe.reset()
+    assert len(shoe) == 53 and shoe.shuffles == 0
+    shoe.draw_multiple(1)
+    assert shoe.needs_shuffle
+    shoe.reset()
+    assert len(shoe) == 104 and shoe.dealt == 0 and shoe.shuffles == 1
+    with pytest.raises(ValueError):
+        Shoe(2, penetration=0)
+
+def test_games_deal_from_a_shoe_to_hundreds_of_seats():
+    game = Game([f"Seat {seat}" for seat in range(200)], rng=random.Random(6), sink=NullSink(), decks=8)
+    assert isinstance(game.deck, Shoe)
+    game.deal(2)
+    assert len(game.deck) == 416 - 400
+    winner, _ = game.determine_winner()
+    assert winner in game.players
+    game.reset()
+    assert len(game.deck) == 416 and all(not player.hand for player in game.players.values())
+
+def test_pooled_games_on_one_shoe_always_deal_full_hands():
+    game = Game([f"Seat {seat}" for seat in range(45)], rng=random.Random(7), sink=NullSink(), decks=6)
+    for number in range(20):
+        if number:
+            game.reset()
+        game.deal(5)
+        assert all(len(player.hand) == 5 for player in game.players.values())
+        assert game.deck.dealt <= game.deck.size
+    assert game.deck.shuffles >= 10
+    game = Game([f"Seat {seat}" for seat in range(10)], rng=random.Random(8), sink=NullSink(), decks=2,
+                penetration=1.0)
+    for number in range(4):
+        if number:
+            game.reset()
+        game.deal(5)
+        assert game.determine_winner()[0] in game.players
+    # Four cards are left, and the hands still hold theirs
+    with pytest.raises(ValueError):
+        game.deal(5)
+    with pytest.raises(ValueError):
+        Game(["Alice", "Bob"], decks=2, sink=NullSink()).deal(60)
@@ -0,0 +1,114 @@
+import random
+
+import pytest
+
+from models.card import Card, STANDARD_CARDS, JOKERS
+from models.double_dummy import DoubleDummySolver
+from models.events import NullSink
+from models.game import Game
+
+def _minimax(hands, leader, seat, tricks):
+    """Plain minimax over every legal play, for checking the solver."""
+    players = len(hands)
+
+    def play(hands, leader, position, lead_suit, best, winner, tricks):
+        if position == players:
+            won = winner == seat
+            return won + (play(hands, winner, 0, None, None, None, tricks - 1) if tricks > 1 else 0)
+        current = (leader + position) % players
+        hand = hands[current]
+        legal = [card for card in hand if card.suit_index == lead_suit] or hand
+        results = []
+        for card in legal:
+            rest = list(hands)
+            rest[current] = [other for other in hand if other is not card]
+            suit = card.suit_index if lead_suit is None else lead_suit
+            if position == 0 or (card.suit_index == suit and card.value > best):
+                results.append(play(rest, leader, position + 1, suit, card.value, current, tricks))
+            else:
+                results.append(play(rest, leader, position + 1, suit, best, winner, tricks))
+        return max(results) if current == seat else min(results)
+
+    return play(hands, leader, 0, None, None, None, tricks) if tricks else 0
+
+@pytest.mark.parametrize("players, cards", [(2, 5), (3, 4), (4, 3)])
+def test_matches_minimax(players, cards):
+    rng = random.Random(players)
+    deck = STANDARD_CARDS + JOKERS
+    for _ in range(25):
+        dealt = rng.sample(deck, players * cards)
+        hands = [dealt[seat::players] for seat in range(players)]
+        leader = rng.randrange(players)
+        expected = [_minimax(hands, leader, seat, cards) for seat in range(players)]
+        assert DoubleDummySolver().solve(hands, leader) == expected
+        assert DoubleDummySolver(tt_capacity=2).solve(hands, leader) == expected
+
+@pytest.mark.parametrize("players, cards", [(3, 4), (4, 3)])
+def test_count_game_is_a_lower_bound(players, cards):
+    rng = random.Random(players + 10)
+    deck = STANDARD_CARDS + JOKERS
+    total = 0
+    for _ in range(25):
+        dealt = rng.sample(deck, players * cards)
+        hands = [dealt[seat::players] for seat in range(players)]
+        masks = [sum(card.mask for card in hand) for hand in hands]
+        leader = rng.randrange(players)
+        solver = DoubleDummySolver()
+        for seat in range(players):
+            rotated = tuple(masks[seat:] + masks[:seat])
+            rotated_leader = (leader - seat) % players
+            state = solver._count_state(solver._position(rotated, rotated_leader, cards)[1])
+            guaranteed = 0
+            while solver._count_at_least(cards, rotated_leader, *state, guaranteed + 1):
+                guaranteed += 1
+            assert guaranteed <= _minimax(hands, leader, seat, cards)
+            total += guaranteed
+    assert total > 0
+
+def test_simple_positions():
+    solver = DoubleDummySolver()
+    aces = [Card(suit, "A") for suit in ["♣", "♦", "♥", "♠"]]
+    twos = [Card(suit, "2") for suit in ["♣", "♦", "♥", "♠"]]
+    assert solver.solve([aces, twos]) == [4, 0]
+    # Seat 1 holds the top spades but never gets the lead, so it only wins when spades are led.
+    hands = [[Card("♣", "A"), Card("♣", "K"), Card("♠", "2")], [Card("♠", "A"), Card("♠", "K"), Card("♣", "2")]]
+    assert solver.solve(hands, leader=0) == [2, 1]
+    assert solver.solve(hands, leader=1) == [1, 2]
+    # The first Joker played wins.
+    jokers = [[JOKERS[0], Card("♣", "3")], [JOKERS[1], Card("♣", "4")]]
+    assert solver.solve(jokers, leader=0) == [1, 1]
+    assert solver.solve(jokers, leader=1) == [0, 2]
+
+def test_solve_game_uses_turn_order_and_leader():
+    game = Game(["Ann", "Bob", "Cid", "Dee"], rng=random.Random(3), sink=NullSink())
+    game.deal(4)
+    solver = DoubleDummySolver()
+    names = game.turn_order
+    hands = [game.players[name].hand for name in names]
+    assert solver.solve_game(game) == dict(zip(names, solver.solve(hands, 0)))
+    game.play_round()
+    leader = names.index(game.round_winner)
+    result = solver.solve_game(game)
+    assert list(result) == names
+    assert list(result.values()) == solver.solve([game.players[name].hand for name in names], leader)
+    assert solver.solve_game(game, tricks=1) == dict(zip(names, solver.solve(
+        [game.players[name].hand for name in names], leader, tricks=1)))
+
+def test_stats_and_validation():
+    solver = DoubleDummySolver(tt_capacity=64)
+    rng = random.Random(5)
+    dealt = rng.sample(STANDARD_CARDS, 20)
+    solver.solve([dealt[seat::4] for seat in range(4)])
+    stats = solver.stats()
+    assert stats["nodes"] > 0 and stats["tt_lookups"] >= stats["tt_hits"] > 0
+    assert stats["tt_size"] <= 64
+    assert 0 < stats["hit_rate"] == solver.hit_rate <= 1
+    solver.clear()
+    assert solver.stats() == {"nodes": 0, "tt_lookups": 0, "tt_hits": 0, "tt_size": 0, "hit_rate": 0.0}
+
+    with pytest.raises(ValueError):
+        solver.solve([[Card("♣", "A")], [Card("♣", "A")]])
+    with pytest.raises(ValueError):
+        solver.solve([[Card("♣", "A")], []], tricks=1)
+    with pytest.raises(ValueError):
+        DoubleDummySolver(tt_capacity=1)
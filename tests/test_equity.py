@@ -0,0 +1,114 @@
+import itertools
+import random
+
+import pytest
+
+from models.card import Card, STANDARD_CARDS
+from models.equity import EquityCalculator
+from models.events import NullSink
+from models.game import Game
+
+def _brute_force(calculator, hands, deck, cards_per_hand):
+    names = list(hands)
+    wins = dict.fromkeys(names, 0)
+    total = 0
+    first, second = names
+    deck = sorted(deck, key=lambda card: card.id)
+    for added in itertools.combinations(deck, cards_per_hand - len(hands[first])):
+        rest = [card for card in deck if card not in added]
+        for other in itertools.combinations(rest, cards_per_hand - len(hands[second])):
+            mine = calculator.evaluator.evaluate(hands[first] + list(added))
+            theirs = calculator.evaluator.evaluate(hands[second] + list(other))
+            wins[first if mine >= theirs else second] += 1
+            total += 1
+    return {name: count / total for name, count in wins.items()}
+
+def test_exact_matches_brute_force():
+    calculator = EquityCalculator()
+    hands = {"Alice": [Card("♠", "A"), Card("♥", "A")], "Bob": [Card("♠", "K"), Card("♠", "Q")]}
+    deck = [card for card in STANDARD_CARDS[:26] + STANDARD_CARDS[39:] if card not in hands["Bob"] + hands["Alice"]]
+    result = calculator.equity(hands, deck, 4)
+    assert result.exact
+    assert result.wins == pytest.approx(_brute_force(calculator, hands, deck, 4))
+    assert sum(result.equity.values()) == pytest.approx(1.0)
+
+def test_suit_symmetry_and_cache():
+    hands = {"Alice": [Card("♠", "A"), Card("♠", "K"), Card("♠", "Q")],
+             "Bob": [Card("♠", "2"), Card("♠", "7"), Card("♠", "9")]}
+    deck = [card for card in STANDARD_CARDS if card not in hands["Alice"] + hands["Bob"]]
+    calculator = EquityCalculator(max_exact=10 ** 6)
+    reduced = calculator.equity(hands, deck, 4)
+    unreduced = EquityCalculator(max_exact=10 ** 6)
+    unreduced._symmetries = lambda hand_ids, deck_ids: []
+    assert unreduced.equity(hands, deck, 4) == reduced
+
+    # The same state with hearts in place of spades is answered from the cache
+    relabel = {card: Card("♥" if card.suit == "♠" else "♠" if card.suit == "♥" else card.suit, card.rank)
+               for card in STANDARD_CARDS}
+    swapped = {name: [relabel[card] for card in hand] for name, hand in hands.items()}
+    assert calculator.equity(swapped, [relabel[card] for card in deck], 4) == reduced
+    assert len(calculator.cache) == 1
+
+def test_sampling_within_error_bound():
+    hands = {"Alice": [Card("♠", "A"), Card("♥", "A")], "Bob": [Card("♠", "K"), Card("♠", "Q")]}
+    deck = [card for card in STANDARD_CARDS if card not in hands["Bob"] + hands["Alice"]]
+    exact = EquityCalculator().equity(hands, deck, 3)
+    sampled = EquityCalculator(max_exact=0).equity(hands, deck, 3)
+    assert exact.exact and not sampled.exact
+    for name in hands:
+        assert abs(sampled.wins[name] - exact.wins[name]) < sampled.error
+
+def test_game_queries_are_cached():
+    game = Game(["Alice", "Bob", "Charlie"], rng=random.Random(4), sink=NullSink())
+    game.deal(2)
+    sampled = game.win_probabilities(5)
+    assert not sampled.exact
+    assert sum(sampled.wins.values()) == pytest.approx(1.0)
+    assert game.win_probabilities(5) is not sampled and game.win_probabilities(5) == sampled
+
+def test_finished_deal_is_certain():
+    game = Game(["Alice", "Bob"], rng=random.Random(5), sink=NullSink())
+    game.deal(5)
+    winner, _ = game.determine_winner()
+    assert game.win_probabilities(5).wins[winner] == 1.0
+
+def test_ordered_hands_keep_their_suits():
+    # Hands of more than five cards are scored in card order, which a suit relabelling changes.
+    cards = random.Random(6).sample([card for card in STANDARD_CARDS if card.rank in "2 3 5 9 10 J".split()], 14)
+    hands = {"Alice": cards[:1], "Bob": cards[1:2]}
+    swap = {"♣": "♠", "♠": "♣"}
+    relabel = {card: Card(swap.get(card.suit, card.suit), card.rank) for card in STANDARD_CARDS}
+    swapped = {name: [relabel[card] for card in hand] for name, hand in hands.items()}
+    calculator = EquityCalculator()
+    first = calculator.equity(hands, cards[2:], 7)
+    second = calculator.equity(swapped, [relabel[card] for card in cards[2:]], 7)
+    assert first == EquityCalculator().equity(hands, cards[2:], 7)
+    assert second == EquityCalculator().equity(swapped, [relabel[card] for card in cards[2:]], 7)
+    assert first != second and len(calculator.cache) == 2
+
+def test_copies_of_a_card_are_dealt_separately():
+    hands = {"Alice": [Card("♠", "A")], "Bob": [Card("♠", "K")]}
+    deck = [Card("♥", "A"), Card("♥", "A"), Card("♣", "2"), Card("♦", "3"), Card("♠", "K")]
+    evaluate = EquityCalculator().evaluator.evaluate
+    wins = {"Alice": 0, "Bob": 0}
+    for picked in itertools.combinations(range(len(deck)), 1):
+        rest = [card for index, card in enumerate(deck) if index not in picked]
+        for other in rest:
+            mine = hands["Alice"] + [deck[index] for index in picked]
+            theirs = hands["Bob"] + [other]
+            wins["Alice" if evaluate(mine) >= evaluate(theirs) else "Bob"] += 1
+    result = EquityCalculator().equity(hands, deck, 2)
+    assert result.completions == 20
+    assert result.wins == pytest.approx({name: count / 20 for name, count in wins.items()})
+
+def test_cache_is_bounded():
+    calculator = EquityCalculator(cache_size=1)
+    hands = {"Alice": [Card("♠", "A")], "Bob": [Card("♠", "K")]}
+    deck = STANDARD_CARDS[:13]
+    first = calculator.equity(hands, deck, 2)
+    calculator.equity(hands, deck, 3)
+    assert len(calculator.cache) == 1
+    assert calculator.equity(hands, deck, 2) == first
+    with pytest.raises(ValueError):
+        EquityCalculator(cache_size=0)
+
@@ -0,0 +1,124 @@
+import random
+import threading
+
+import pytest
+
+from models.card import Card, STANDARD_CARDS, JOKERS
+from models.eval_cache import CachedEvaluator, best_key, hand_key, wildcard_hand_key
+from models.evaluator import HandEvaluator
+from models.events import NullSink
+from models.game import Game
+from models.wildcard import WildcardEvaluator
+
+evaluator = HandEvaluator(use_disk_cache=False)
+
+def test_equal_keys_mean_equal_strengths():
+    rng = random.Random(12)
+    cards = list(STANDARD_CARDS + JOKERS)
+    seen = {}
+    best_seen = {}
+    for _ in range(20000):
+        hand = rng.sample(cards, rng.choice((3, 5, 7)))
+        assert seen.setdefault(hand_key(hand), evaluator.evaluate(hand)) == evaluator.evaluate(hand)
+        assert best_seen.setdefault(best_key(hand), evaluator.evaluate_best(hand)) == evaluator.evaluate_best(hand)
+
+def test_wildcard_keys_follow_the_wildcard_rules():
+    wild = WildcardEvaluator(use_disk_cache=False)
+    rng = random.Random(3)
+    # Few ranks, so that keys repeat.
+    cards = [card for card in STANDARD_CARDS if card.value >= 11] + list(JOKERS)
+    seen = {}
+    best_seen = {}
+    for _ in range(200):
+        hand = rng.sample(cards, 6)
+        assert seen.setdefault(wildcard_hand_key(hand), wild.evaluate(hand)) == wild.evaluate(hand)
+        assert best_seen.setdefault(best_key(hand), wild.evaluate_best(hand)) == wild.evaluate_best(hand)
+    assert len(best_seen) < 200
+    cached = CachedEvaluator(wild)
+    hand = cards[:5] + [JOKERS[0]]
+    assert cached.evaluate(hand) == cached.evaluate(hand) == wild.evaluate(hand) and cached.hits == 1
+
+def test_unknown_evaluators_are_refused():
+    class Reversed(HandEvaluator):
+        def evaluate(self, hand):
+            return -super().evaluate(hand)
+
+    with pytest.raises(TypeError):
+        CachedEvaluator(Reversed())
+
+def test_order_only_matters_for_repeated_ranks():
+    two_trips = [Card("♠", "9"), Card("♥", "9"), Card("♦", "9"), Card("♠", "4"), Card("♥", "4"),
+                 Card("♦", "4"), Card("♣", "A")]
+    reordered = two_trips[3:6] + two_trips[:3] + two_trips[6:]
+    assert hand_key(two_trips) != hand_key(reordered)
+    assert evaluator.evaluate(two_trips) != evaluator.evaluate(reordered)
+    shuffled = two_trips[:1] + two_trips[6:] + two_trips[3:4] + two_trips[1:3] + two_trips[4:6]
+    assert hand_key(two_trips) == hand_key(shuffled)
+
+def test_keys_ignore_order_and_suit_names():
+    hand = [Card("♠", "2"), Card("♥", "9"), Card("♠", "K"), Card("♦", "9"), Card("♣", "A")]
+    relabelled = [Card("♣", "A"), Card("♥", "9"), Card("♦", "2"), Card("♠", "9"), Card("♦", "K")]
+    assert hand_key(hand) == hand_key(relabelled)
+    flush = [Card("♥", rank) for rank in ["2", "5", "9", "J"]] + [Card("♣", "3"), Card("♣", "4")]
+    assert best_key(flush) == best_key([Card("♠", card.rank) if card.suit == "♥" else card for card in flush])
+    assert best_key(flush) != best_key(flush[:-1] + [Card("♥", "4")])
+
+def test_shoe_sized_hands_count_suits_explicitly():
+    # Seventeen clubs overflow the four-bit club count of a summed code
+    ranks = [card.rank for card in STANDARD_CARDS[:13]] + ["2", "3", "4", "5"]
+    flush = [Card("♣", rank) for rank in ranks]
+    mixed = flush[:15] + [Card("♦", rank) for rank in ranks[15:]]
+    assert evaluator.evaluate(flush) != evaluator.evaluate(mixed)
+    assert hand_key(flush) != hand_key(mixed)
+    assert wildcard_hand_key(flush) != wildcard_hand_key(mixed)
+    cached = CachedEvaluator(evaluator)
+    assert cached.evaluate(mixed) == evaluator.evaluate(mixed)
+    assert cached.evaluate(flush) == evaluator.evaluate(flush)
+
+def test_counters_and_eviction():
+    cached = CachedEvaluator(evaluator, capacity=2)
+    base = [Card("♣", rank) for rank in ["5", "6", "7", "8", "9"]]
+    hands = [base + [Card("♠", rank), Card("♥", rank)] for rank in ["2", "3", "4"]]
+    cached.evaluate(hands[0])
+    cached.evaluate(hands[1])
+    cached.evaluate(hands[0])  # Refreshes "2" under LRU
+    cached.evaluate(hands[2])  # Evicts "3"
+    assert cached.stats() == {"hits": 1, "misses": 3, "evictions": 1, "size": 2, "capacity": 2, "hit_rate": 0.25}
+    cached.evaluate(hands[0])
+    assert cached.hits == 2
+
+    fifo = CachedEvaluator(evaluator, capacity=2, policy="fifo")
+    for hand in [hands[0], hands[1], hands[0], hands[2], hands[0]]:
+        fifo.evaluate(hand)
+    assert (fifo.hits, fifo.misses, fifo.evictions) == (1, 4, 2)
+
+    with pytest.raises(ValueError):
+        CachedEvaluator(evaluator, policy="random")
+
+def test_batches_use_the_cache_for_large_hands():
+    cached = CachedEvaluator(evaluator)
+    base = [Card("♣", rank) for rank in ["5", "6", "7", "8", "9"]]
+    hands = [base + [Card("♠", "2"), Card("♥", "2")], base, base + [Card("♠", "2"), Card("♥", "2")]]
+    assert cached.evaluate_hands(hands) == list(map(evaluator.evaluate, hands))
+    assert (cached.hits, cached.misses) == (1, 1)
+    assert cached.evaluate_hands(hands[1:2]) == [evaluator.evaluate(base)] and cached.misses == 1
+
+def test_shared_between_games_and_threads():
+    cached = CachedEvaluator(evaluator, capacity=1000)
+    winners = []
+
+    def play(seed):
+        game = Game(["Alice", "Bob"], rng=random.Random(seed), sink=NullSink(), evaluator=cached)
+        game.deal(7)
+        plain = Game(["Alice", "Bob"], rng=random.Random(seed), sink=NullSink())
+        plain.deal(7)
+        winners.append(game.determine_winner() == plain.determine_winner())
+
+    threads = [threading.Thread(target=lambda start=start: [play(seed) for seed in range(start, start + 50)])
+               for start in range(0, 200, 50)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(winners) and len(winners) == 200
+    assert cached.hits + cached.misses == 400
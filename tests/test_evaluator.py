@@ -0,0 +1,71 @@
+import random
+
+from models.card import Card, STANDARD_CARDS, JOKERS
+from models.evaluator import HandEvaluator, describe, pack, reference_evaluate
+from models.wildcard import WildcardEvaluator
+
+evaluator = HandEvaluator(use_disk_cache=False)
+
+def test_pack_round_trip():
+    for result in [("Straight", [3, 4, 5, 6, 7]), ("Full House", [9, 2]), ("High Card", [14]), ("Straight", [])]:
+        assert describe(pack(*result)) == result
+
+def test_pack_orders_like_lists():
+    assert pack("One Pair", [5, 3]) < pack("One Pair", [5, 3, 2])
+    assert pack("One Pair", [5, 3, 2]) < pack("One Pair", [6])
+    assert pack("Flush", [7, 5, 4, 3, 2]) > pack("Straight", [10, 11, 12, 13, 14])
+
+def test_evaluate_matches_reference():
+    rng = random.Random(7)
+    cards = list(STANDARD_CARDS + JOKERS)
+    for size in (1, 2, 3, 4, 5, 7, 9):
+        for _ in range(2000):
+            hand = rng.sample(cards, size)
+            assert evaluator.evaluate(hand) == pack(*reference_evaluate(hand)), hand
+
+def test_evaluate_known_hands():
+    royal = [Card("♥", rank) for rank in ["10", "J", "Q", "K", "A"]]
+    quads = [Card(suit, "9") for suit in Card.suits[:-1]] + [Card("♣", "2")]
+    assert describe(evaluator.evaluate(royal)) == ("Straight Flush", [10, 11, 12, 13, 14])
+    assert describe(evaluator.evaluate(quads)) == ("Four of a Kind", [9, 2])
+    assert evaluator.evaluate(royal) > evaluator.evaluate(quads)
+
+def test_evaluate_best_matches_naive():
+    rng = random.Random(8)
+    cards = list(STANDARD_CARDS + JOKERS)
+    hearts = list(STANDARD_CARDS[26:39])
+    for size in (6, 7, 8, 9):
+        for _ in range(300):
+            hand = rng.sample(cards, size)
+            assert evaluator.evaluate_best(hand) == evaluator.naive_best(hand), hand
+            # Mostly one suit plus Jokers, to reach the flush and straight flush paths
+            jokers = rng.randrange(3)
+            hand = rng.sample(hearts, size - jokers - 1) + rng.sample(cards[:26], 1) + list(JOKERS[:jokers])
+            assert evaluator.evaluate_best(hand) == evaluator.naive_best(hand), hand
+
+def test_evaluate_best_joker_quirks():
+    hand = [Card("♠", rank) for rank in ["9", "10", "J", "Q", "K"]] + [Card("None", "Joker"), Card("♦", "2")]
+    # Four cards and a Joker score [10, 11, 12, 13], which beats the full [9..13] run
+    assert describe(evaluator.evaluate_best(hand)) == ("Straight Flush", [10, 11, 12, 13])
+    assert evaluator.evaluate_best(hand) == evaluator.naive_best(hand)
+
+def test_evaluate_hands_with_repeated_cards():
+    # A shoe of several decks can deal the same card more than once
+    rng = random.Random(9)
+    for _ in range(3000):
+        size = rng.randrange(2, 6)
+        suit = rng.randrange(4)
+        pool = STANDARD_CARDS[suit * 13:suit * 13 + 13] if rng.random() < 0.5 else STANDARD_CARDS
+        hand = [rng.choice(pool) for _ in range(size)]
+        assert evaluator.evaluate(hand) == pack(*reference_evaluate(hand)), hand
+
+def test_evaluate_hands_matches_evaluate():
+    rng = random.Random(10)
+    cards = list(STANDARD_CARDS + JOKERS)
+    hearts = list(STANDARD_CARDS[26:39])
+    hands = [rng.sample(cards, rng.choice((3, 5, 5, 7))) for _ in range(2000)]
+    hands += [rng.sample(hearts, 4) + [rng.choice(cards)] for _ in range(500)]
+    hands += [[rng.choice(hearts) for _ in range(5)] for _ in range(500)]
+    assert evaluator.evaluate_hands(hands) == list(map(evaluator.evaluate, hands))
+    wild = WildcardEvaluator(use_disk_cache=False)
+    assert wild.evaluate_hands(hands[:300]) == list(map(wild.evaluate, hands[:300]))
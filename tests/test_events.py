@@ -0,0 +1,43 @@
+import json
+import random
+
+from models.events import JsonLinesSink, NullSink, RingBufferSink
+from models.game import Game
+
+def test_null_sink_is_silent(capsys):
+    game = Game(["Alice", "Bob"], rng=random.Random(1), sink=NullSink())
+    game.deal(5)
+    game.show_hands()
+    game.determine_winner()
+    assert capsys.readouterr().out == ""
+
+def test_ring_buffer_records_typed_events():
+    sink = RingBufferSink(capacity=8)
+    game = Game(["Alice", "Bob"], rng=random.Random(2), sink=sink)
+    game.deal(3)
+    winner, hand_type = game.determine_winner()
+    kinds = [event.kind for event in sink.events]
+    assert kinds == ["deal", "deal", "hand_evaluated", "hand_evaluated", "winner"]
+    assert len(sink.events[0].cards) == 3
+    assert sink.events[-1] == (winner, hand_type)
+
+    for _ in range(3):
+        game.play_round()
+    assert len(sink.events) == 8  # Older events are dropped
+
+def test_json_lines_sink(tmp_path):
+    path = tmp_path / "events.jsonl"
+    with JsonLinesSink(str(path), buffer_size=2) as sink:
+        game = Game(["Alice", "Bob"], rng=random.Random(3), sink=sink)
+        game.deal(2)
+        game.play_round()
+    events = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [event["event"] for event in events] == ["deal", "deal", "round_started", "play", "play", "round_won"]
+    assert all(isinstance(card, str) for card in events[0]["cards"])
+
+def test_console_sink_is_the_default(capsys):
+    game = Game(["Alice", "Bob"], rng=random.Random(4))
+    game.deal(1)
+    game.play_round()
+    out = capsys.readouterr().out
+    assert "--- New Round ---" in out and "wins the round!" in out
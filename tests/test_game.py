@@ -0,0 +1,40 @@
+import random
+
+from models.card import Card
+from models.events import NullSink
+from models.game import Game
+
+def test_determine_winner_picks_highest_strength():
+    game = Game(["Alice", "Bob", "Charlie"])
+    game.players["Alice"].hand = [Card("♣", "2"), Card("♦", "2"), Card("♠", "9")]
+    game.players["Bob"].hand = [Card("♥", "A"), Card("♥", "K"), Card("♥", "Q")]
+    game.players["Charlie"].hand = [Card("♠", "A"), Card("♦", "K"), Card("♣", "J")]
+
+    assert game.determine_winner() == ("Bob", "Straight Flush")
+    assert game.evaluate_hand(game.players["Alice"].hand) == ("One Pair", [2, 9])
+
+def test_determine_winner_keeps_first_on_tie():
+    game = Game(["Alice", "Bob"])
+    game.players["Alice"].hand = [Card("♣", "7"), Card("♦", "5")]
+    game.players["Bob"].hand = [Card("♥", "7"), Card("♠", "5")]
+
+    assert game.determine_winner() == ("Alice", "High Card")
+
+def test_reset_deals_like_a_new_game():
+    for compact in (False, True):
+        pooled = Game(["Alice", "Bob", "Charlie"], include_joker=True, rng=random.Random(1), compact=compact,
+                      sink=NullSink())
+        players = list(pooled.players.values())
+        hand = players[0].hand
+        pooled.play_game()
+        rng = random.Random(2)
+        fresh = Game(["Alice", "Bob", "Charlie"], include_joker=True, rng=random.Random(2), sink=NullSink())
+        pooled.reset(rng)
+        assert pooled.round_winner is None and len(pooled.deck) == 54
+        assert list(pooled.players.values()) == players and players[0].hand is hand
+        pooled.deal(5)
+        fresh.deal(5)
+        for name, player in fresh.players.items():
+            assert pooled.players[name].hand == player.hand
+            assert pooled.players[name].code == player.code and pooled.players[name].mask == player.mask
+        assert pooled.deck.cards == fresh.deck.cards
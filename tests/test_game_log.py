@@ -0,0 +1,68 @@
+import struct
+
+import pytest
+
+from models.game_log import LOG_FORMAT, MAGIC, GameLog, GameLogWriter, record_game, replay
+
+NAMES = ["Alice", "Bob", "Charlie", "Dean"]
+
+def test_write_read_and_replay(tmp_path):
+    path = str(tmp_path / "games.log")
+    records = [record_game(NAMES, seed)[1] for seed in range(20)]
+    with GameLogWriter(path, NAMES, buffer_size=8) as writer:
+        for record in records:
+            writer.write(record)
+
+    with GameLog(path) as log:
+        assert len(log) == 20
+        assert log.player_names == NAMES
+        assert log[7] == records[7]
+        assert log[-1] == records[-1]
+        assert list(log) == records
+        for record in log:
+            assert replay(record, log.player_names)[1] == record
+        with pytest.raises(IndexError):
+            log[20]
+
+def test_record_matches_game():
+    game, record = record_game(NAMES, 3)
+    assert len(record.plays) == 13
+    assert NAMES[record.turn_order[record.winner]] == game.round_winner
+    assert sorted(card for plays in record.plays for card in plays) == list(range(52))
+
+def test_appending_checks_layout(tmp_path):
+    path = str(tmp_path / "games.log")
+    with GameLogWriter(path, NAMES) as writer:
+        writer.write(record_game(NAMES, 1)[1])
+    with GameLogWriter(path, NAMES) as writer:
+        writer.write(record_game(NAMES, 2)[1])
+    with GameLog(path) as log:
+        assert [record.seed for record in log] == [1, 2]
+    with pytest.raises(ValueError):
+        GameLogWriter(path, NAMES[:3])
+
+def test_short_deals_replay_from_the_log_alone(tmp_path):
+    path = str(tmp_path / "games.log")
+    records = [record_game(NAMES, seed, rounds=5, cards_per_player=5)[1] for seed in range(5)]
+    with GameLogWriter(path, NAMES, rounds=5, cards_per_player=5) as writer:
+        for record in records:
+            writer.write(record)
+        with pytest.raises(ValueError):
+            writer.write(record_game(NAMES, 9, rounds=5)[1])
+    with GameLog(path) as log:
+        assert log.cards_per_player == 5
+        assert list(log) == records
+        for record in log:
+            assert replay(record, log.player_names)[1] == record
+
+def test_record_game_rejects_deals_shorter_than_the_rounds():
+    with pytest.raises(ValueError, match="each round"):
+        record_game(NAMES, 1, rounds=13, cards_per_player=5)
+    with pytest.raises(ValueError, match="each round"):
+        record_game(NAMES + ["Eve"], 1)
+
+def test_older_log_formats_are_rejected(tmp_path):
+    path = tmp_path / "old.log"
+    path.write_bytes(struct.pack("<4sHBBBH", MAGIC, LOG_FORMAT - 1, 4, 13, 52, 2) + b"[]")
+    with pytest.raises(ValueError):
+        GameLog(str(path))
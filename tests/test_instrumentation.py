@@ -0,0 +1,107 @@
+import json
+import random
+import time
+import urllib.request
+
+import pytest
+
+from models.deck import Deck
+from models.events import NullSink
+from models.game import Game
+from models.wildcard import WildcardEvaluator
+from models.instrumentation import BUCKET_BOUNDS, Instrumentation, MethodStats, SamplingProfiler, serve_prometheus
+
+def _play(seed=0):
+    game = Game(["Ann", "Bob", "Cid", "Dee"], rng=random.Random(seed), sink=NullSink())
+    game.play_game()
+    return game
+
+def test_counts_calls_and_restores_methods():
+    original = Game.deal
+    metrics = Instrumentation()
+    with metrics:
+        assert Game.deal is not original and metrics.installed
+        _play()
+    assert Game.deal is original and not metrics.installed
+    methods = metrics.snapshot()["methods"]
+    assert methods["Game.deal"]["calls"] == 1
+    assert methods["Game.play_round"]["calls"] == 13
+    assert methods["Player.play"]["calls"] == 52
+    assert methods["Player.draw"]["calls"] == 4 * 52  # deal() makes a pass per card in the deck
+    assert methods["Game.play_game"]["total_seconds"] >= methods["Game.play_round"]["total_seconds"]
+    assert sum(methods["Player.play"]["buckets"].values()) == 52
+    _play()  # Not counted once uninstalled
+    assert metrics.methods["Game.deal"].calls == 1
+    metrics.reset()
+    assert metrics.methods["Game.deal"].calls == 0
+
+def test_counts_shoe_and_wildcard_calls():
+    with Instrumentation() as metrics:
+        game = Game(["Ann", "Bob", "Cid"], include_joker=True, rng=random.Random(1), sink=NullSink(),
+                    evaluator=WildcardEvaluator(), decks=2)
+        game.deal(5)
+        game.determine_winner()
+    methods = metrics.snapshot()["methods"]
+    assert methods["Shoe.shuffle"]["calls"] == 1
+    assert methods["WildcardEvaluator.evaluate_code"]["calls"] == 3
+
+def test_errors_and_single_installation():
+    metrics = Instrumentation(targets=[(Deck, ["draw_multiple"])])
+    with metrics:
+        with pytest.raises(RuntimeError):
+            Instrumentation().install()
+        deck = Deck()
+        deck.draw_multiple(5)
+        with pytest.raises(TypeError):
+            deck.draw_multiple()
+    assert (metrics.methods["Deck.draw_multiple"].calls, metrics.methods["Deck.draw_multiple"].errors) == (2, 1)
+
+def test_histogram_buckets_and_quantiles():
+    stats = MethodStats()
+    for seconds in [0.5e-6, 3e-6, 3e-6, 5.0]:
+        stats.observe(seconds)
+    assert stats.buckets[0] == 1 and stats.buckets[2] == 2 and stats.buckets[-1] == 1
+    assert stats.quantile(0.5) == BUCKET_BOUNDS[2]
+    assert stats.quantile(1.0) == 5.0
+
+def test_exports(tmp_path):
+    metrics = Instrumentation(targets=[(Game, ["deal", "play_round"])])
+    with metrics:
+        _play()
+    text = metrics.prometheus()
+    assert '# TYPE card_game_call_seconds histogram' in text
+    assert 'card_game_calls_total{method="Game.play_round"} 13' in text
+    assert 'card_game_call_seconds_bucket{method="Game.play_round",le="+Inf"} 13' in text
+    assert 'card_game_call_seconds_count{method="Game.deal"} 1' in text
+    path = tmp_path / "metrics.json"
+    metrics.write_json(str(path))
+    assert json.loads(path.read_text())["methods"]["Game.play_round"]["calls"] == 13
+
+    server = serve_prometheus(metrics, port=0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            assert response.read().decode("utf-8") == text
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_sampling_profiler_hook():
+    stacks = []
+    metrics = Instrumentation(targets=[(Game, ["play_game"])], profile_interval=0.001, profile_hook=stacks.append)
+    with metrics:
+        deadline = time.perf_counter() + 0.2
+        while time.perf_counter() < deadline:
+            _play()
+    profiler = metrics.profiler
+    assert profiler.sample_count == len(stacks) > 0
+    assert any(name.startswith("models.") for name, _ in profiler.top(None, inclusive=True))
+    assert not any("wrapper" in stack for stack in profiler.samples)
+    assert "card_game_profile_samples_total" in metrics.prometheus()
+    assert metrics.snapshot()["profile"]["samples"] == profiler.sample_count
+    assert profiler.collapsed().count("\n") == len(profiler.samples)
+
+    profiler = SamplingProfiler(interval=0.01)
+    profiler.start()
+    with pytest.raises(RuntimeError):
+        profiler.start()
+    profiler.stop()
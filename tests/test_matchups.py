@@ -0,0 +1,64 @@
+import pytest
+
+from models.card import Card
+from models.evaluator import HandEvaluator
+from models.matchups import MatchupTable, build, main, verify
+
+@pytest.fixture(scope="module")
+def table_path(tmp_path_factory):
+    return build(str(tmp_path_factory.mktemp("matchups") / "matchups.bin"))
+
+class ReversedEvaluator(HandEvaluator):
+    def evaluate(self, hand):
+        return -super().evaluate(hand)
+
+def cards(*specs):
+    return [Card(suit, rank) for suit, rank in specs]
+
+def test_table_covers_every_class(table_path):
+    with MatchupTable(table_path) as table:
+        assert len(table) == 1755
+        assert sum(table.class_size(index) for index in range(len(table))) == 22100
+        assert not table.include_joker
+        assert table.is_current()
+        assert verify(table_path, samples=20) == 20
+
+def test_matchup_odds(table_path):
+    suited = cards(("♥", "A"), ("♥", "K"), ("♥", "Q"))
+    pair = cards(("♠", "2"), ("♦", "2"), ("♣", "7"))
+    with MatchupTable(table_path) as table:
+        assert table.matchup(suited, pair) == (1.0, 0.0, 0.0, 48)
+        assert table.matchup(pair, suited) == (0.0, 0.0, 1.0, 48)
+        # Any suit relabelling of a hand is the same class
+        clubs = cards(("♣", "Q"), ("♣", "K"), ("♣", "A"))
+        assert table.hand_class(clubs[::-1]) == table.hand_class(suited)
+        odds = table.against_random(pair)
+        assert odds.win + odds.tie + odds.loss == pytest.approx(1.0)
+        assert table.against_random(suited).win > odds.win
+        first, second = table.hand_class(suited), table.hand_class(pair)
+        assert table.representative(first) == clubs
+        assert table.counts(first, second)[0] == table.counts(second, first)[2]
+
+def test_invalid_matchups(table_path):
+    aces = cards(("♥", "A"), ("♠", "A"), ("♦", "A"))
+    with MatchupTable(table_path) as table:
+        with pytest.raises(ValueError):
+            table.matchup(aces, cards(("♣", "A"), ("♥", "A"), ("♠", "A")))
+        with pytest.raises(ValueError):
+            table.hand_class(aces[:2])
+        with pytest.raises(ValueError):
+            table.hand_class(aces[:2] + [Card(None, "Joker")])
+
+def test_stale_or_corrupt_tables(table_path, tmp_path):
+    with MatchupTable(table_path) as table:
+        assert not table.is_current(ReversedEvaluator())
+    with pytest.raises(AssertionError):
+        verify(table_path, evaluator=ReversedEvaluator())
+    corrupt = tmp_path / "corrupt.bin"
+    corrupt.write_bytes(open(table_path, "rb").read()[:-2])
+    with pytest.raises(ValueError):
+        MatchupTable(str(corrupt))
+
+def test_verify_command(table_path, capsys):
+    assert main(["verify", "--path", table_path, "--samples", "5"]) == 0
+    assert "verified 5 cells" in capsys.readouterr().out
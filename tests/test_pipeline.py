@@ -0,0 +1,110 @@
+import random
+import statistics
+import tracemalloc
+
+import pytest
+
+from models.evaluator import CATEGORY_NAMES
+from models.pipeline import (ColumnarWriter, GameResult, HandFrequencies, QuantileSketch, RunningMoments,
+                             SeatWinRates, Stage, game_results, read_column, run_pipeline)
+
+def test_results_have_one_record_per_seat_and_one_winner_per_game():
+    records = list(game_results(200, player_count=3, seed=4))
+    assert len(records) == 600
+    assert [record.seat for record in records[:6]] == [0, 1, 2, 0, 1, 2]
+    for start in range(0, 600, 3):
+        game = records[start:start + 3]
+        assert len({record.game for record in game}) == 1 and len({record.winner for record in game}) == 1
+        best = max((record.category, record.tiebreak) for record in game)
+        assert (game[game[0].winner].category, game[game[0].winner].tiebreak) == best
+    assert records == list(game_results(200, player_count=3, seed=4))
+
+def test_stages_must_implement_update_and_result():
+    class Partial(Stage):
+        def update(self, record):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
+
+def test_stages_count_categories_and_wins():
+    frequencies, wins = HandFrequencies(), SeatWinRates(4)
+    records = list(wins(frequencies(game_results(300, seed=2))))
+    assert len(records) == 1200
+    assert sum(frequencies.result().values()) == 1200
+    assert set(frequencies.result()) <= set(CATEGORY_NAMES.values())
+    assert wins.games == [300] * 4 and sum(wins.wins) == 300
+    assert abs(sum(wins.result()) - 1.0) < 1e-9
+
+def test_running_moments_match_statistics_and_merge():
+    values = [GameResult(0, 0, 0, random.Random(index).randrange(10 ** 6), 0) for index in range(500)]
+    whole, left, right = RunningMoments("tiebreak"), RunningMoments("tiebreak"), RunningMoments("tiebreak")
+    run_pipeline(values, whole)
+    run_pipeline(values[:123], left)
+    run_pipeline(values[123:], right)
+    left.merge(right)
+    expected = [record.tiebreak for record in values]
+    for moments in (whole, left):
+        assert moments.count == 500
+        assert abs(moments.mean - statistics.mean(expected)) < 1e-6
+        assert abs(moments.variance - statistics.variance(expected)) / statistics.variance(expected) < 1e-9
+        assert (moments.min, moments.max) == (min(expected), max(expected))
+
+def test_quantile_sketch_is_accurate_and_bounded():
+    sketch = QuantileSketch("tiebreak", capacity=128)
+    for value in random.Random(1).sample(range(200000), 200000):
+        sketch.add(value)
+    assert sketch.count == 200000
+    assert sketch.size < 128 * 12
+    for q in (0.1, 0.5, 0.9):
+        assert abs(sketch.quantile(q) - q * 200000) < 0.03 * 200000
+    other = QuantileSketch("tiebreak", capacity=128)
+    for value in range(200000, 400000):
+        other.add(value)
+    sketch.merge(other)
+    assert sketch.count == 400000 and abs(sketch.quantile(0.5) - 200000) < 0.03 * 400000
+
+def test_columnar_writer_round_trips(tmp_path):
+    records = list(game_results(100, player_count=4, seed=9))
+    with ColumnarWriter(str(tmp_path), batch_size=64) as writer:
+        run_pipeline(records[:250], writer)
+    with ColumnarWriter(str(tmp_path), batch_size=64) as writer:
+        run_pipeline(records[250:], writer)
+    for index, field in enumerate(GameResult._fields):
+        column = read_column(str(tmp_path), field)
+        assert list(column) == [record[index] for record in records]
+        column.release()
+
+def test_columnar_writer_stores_wide_seat_numbers(tmp_path):
+    records = [GameResult(0, seat, 1, 0, 300) for seat in range(300)]
+    with ColumnarWriter(str(tmp_path)) as writer:
+        run_pipeline(records, writer)
+    column = read_column(str(tmp_path), "seat")
+    assert list(column) == list(range(300))
+    column.release()
+
+def test_columnar_writer_drops_columns_past_the_manifest(tmp_path):
+    records = list(game_results(10, seed=3))
+    with ColumnarWriter(str(tmp_path)) as writer:
+        run_pipeline(records[:20], writer)
+    # A crash after writing some columns but before the manifest
+    with open(tmp_path / "game.bin", "ab") as file:
+        file.write(bytes(8 * 5))
+    with ColumnarWriter(str(tmp_path)) as writer:
+        run_pipeline(records[20:], writer)
+    for index, field in enumerate(GameResult._fields):
+        column = read_column(str(tmp_path), field)
+        assert list(column) == [record[index] for record in records]
+        assert (tmp_path / f"{field}.bin").stat().st_size == column.nbytes
+        column.release()
+
+def test_memory_does_not_grow_with_the_number_of_games():
+    def peak(games):
+        stages = [HandFrequencies(), SeatWinRates(4), RunningMoments("tiebreak"), QuantileSketch("category")]
+        tracemalloc.start()
+        run_pipeline(game_results(games, seed=3), *stages)
+        result = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result
+    peak(200)  # Load the evaluator tables outside the measurements
+    assert peak(4000) < 1.5 * peak(1000)
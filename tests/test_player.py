@@ -0,0 +1,111 @@
+import random
+
+import pytest
+
+from models.card import Card
+from models.deck import Deck
+from models.evaluator import CARD_CODES, HandEvaluator
+from models.player import Player
+
+def test_state_tracks_drawn_cards():
+    player = Player("Alice")
+    deck = Deck(include_joker=True, rng=random.Random(5))
+    deck.shuffle()
+    player.draw_multiple(deck, 7)
+    player.draw(deck)
+
+    hand = player.hand
+    assert len(hand) == 8
+    assert player.mask == sum(card.mask for card in hand)
+    assert player.code == sum(CARD_CODES[card.id] for card in hand)
+    for value in range(2, 16):
+        assert player.rank_counts[value] == sum(card.value == value for card in hand)
+    for index, suit in enumerate(Card.suits):
+        assert list(player.suit_buckets[index]) == [card for card in hand if card.suit == suit]
+
+def test_play_follows_suit_and_removes_the_card():
+    player = Player("Bob")
+    player.hand = [Card("♣", "2"), Card("♥", "9"), Card("♥", "K"), Card("♠", "A")]
+
+    assert player.play("♥") == Card("♥", "9")
+    assert player.hand == [Card("♣", "2"), Card("♥", "K"), Card("♠", "A")]
+    assert player.play("♦") == Card("♣", "2")
+    assert player.play() == Card("♥", "K")
+    assert not player.has_suit("♥") and player.has_suit("♠")
+    assert player.mask == Card("♠", "A").mask
+    assert player.rank_counts[14] == 1 and sum(player.rank_counts) == 1
+
+def test_card_sort():
+    player = Player("Carol")
+    player.hand = [Card("♠", "2"), Card("None", "Joker"), Card("♣", "K"), Card("♣", "3"), Card("♥", "10")]
+    assert [repr(card) for card in player.card_sort()] == ["3♣", "K♣", "10♥", "2♠", "Joker"]
+
+def test_code_matches_evaluator():
+    evaluator = HandEvaluator(use_disk_cache=False)
+    player = Player("Dave")
+    deck = Deck(rng=random.Random(6))
+    deck.shuffle()
+    player.draw_multiple(deck, 5)
+    assert evaluator.evaluate_code(player.code, player.hand) == evaluator.evaluate(player.hand)
+    player.play()
+    assert evaluator.evaluate_code(player.code, player.hand) == evaluator.evaluate(player.hand)
+
+def test_clear_returns_the_hand():
+    player = Player("Erin")
+    player.hand = [Card("♦", "4"), Card("♦", "5")]
+    assert player.clear() == [Card("♦", "4"), Card("♦", "5")]
+    assert player.hand == [] and player.mask == 0 and player.code == 0
+
+def test_reset_empties_the_hand_in_place():
+    player = Player("Erin")
+    player.hand = [Card("♦", "4"), Card("♦", "5"), Card("♠", "4")]
+    hand, buckets = player.hand, player.suit_buckets
+    player.reset()
+    assert player.hand is hand and player.suit_buckets is buckets
+    assert player.hand == [] and player.mask == 0 and player.code == 0
+    assert not any(player.rank_counts) and not any(buckets)
+
+def test_duplicate_cards_from_a_shoe():
+    ace = Card("♠", "A")
+    player = Player("Dana")
+    player.take([ace, Card("♠", "K"), ace])
+    assert player.hand.count(ace) == 2 and sorted(player.hand) == [Card("♠", "K"), ace, ace]
+    assert len(set(player.hand)) == 2
+    assert player.play("♠") == ace
+    assert player.mask & ace.mask  # The second ace is still held
+    player.play("♠")
+    assert player.play("♠") == ace and not player.mask
+
+def test_playing_one_of_two_jokers_keeps_the_other_in_the_mask():
+    player = Player("Gina")
+    first, second = Card.from_id(52), Card.from_id(53)
+    player.take([first, second, Card("♠", "A")])
+    player.play("None")
+    assert player.hand == [second, Card("♠", "A")]
+    assert player.mask == second.mask | Card("♠", "A").mask
+    player.play("None")
+    assert player.mask == Card("♠", "A").mask
+
+def test_play_matches_scanning_the_hand():
+    rng = random.Random(9)
+    for _ in range(50):
+        deck = Deck(include_joker=True, rng=rng)
+        deck.shuffle()
+        player = Player("Hal")
+        player.draw_multiple(deck, 13)
+        expected = list(player.hand)
+        while expected:
+            suit = rng.choice(Card.suits + [None])
+            following = [card for card in expected if card.suit == suit]
+            card = following[0] if suit and following else expected[0]
+            expected.remove(card)
+            assert player.play(suit) == card
+            if rng.random() < 0.3:
+                assert player.hand == expected
+            if rng.random() < 0.2 and len(deck):
+                drawn = deck.draw()
+                player.take([drawn])
+                expected.append(drawn)
+        assert player.mask == 0 and player.code == 0
+        with pytest.raises(IndexError):
+            player.play()
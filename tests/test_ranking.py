@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from models.card import Card
+from models.eval_cache import CachedEvaluator
+from models.evaluator import CARD_CODES, HandEvaluator
+from models.events import NullSink
+from models.game import Game
+from models.ranking import Ranking
+
+def test_winners_split_the_pot():
+    ranking = Ranking(["Alice", "Bob", "Charlie", "Dana"], [5, 9, 9, 1])
+
+    assert ranking.winners == ("Bob", "Charlie")
+    assert ranking.split_pot(101) == {"Bob": 51, "Charlie": 50}
+    assert Ranking(["Alice"], [3]).split_pot(10) == {"Alice": 10}
+    with pytest.raises(ValueError):
+        Ranking([], []).split_pot(10)
+
+def test_places_and_percentiles_count_ties():
+    ranking = Ranking(["A", "B", "C", "D", "E"], [5, 9, 9, 1, 5])
+    standings = {standing.name: standing for standing in ranking.standings()}
+
+    assert [(standings[name].place, standings[name].tied) for name in "ABCDE"] == [(3, 2), (1, 2), (1, 2), (5, 1), (3, 2)]
+    assert standings["B"].percentile == pytest.approx(3.5 / 4)
+    assert standings["D"].percentile == 0.0
+    assert standings["A"].percentile == pytest.approx(1.5 / 4)
+    assert ranking.standing("E") == standings["E"]
+    assert Ranking(["Solo"], [1]).standing("Solo").percentile == 1.0
+
+def test_top_includes_ties_at_the_cutoff():
+    ranking = Ranking(["A", "B", "C", "D", "E"], [5, 9, 9, 1, 5])
+
+    assert [standing.name for standing in ranking.top(1)] == ["B", "C"]
+    assert [standing.name for standing in ranking.top(3)] == ["B", "C", "A", "E"]
+    assert ranking.top(3) == sorted(ranking.standings(), key=lambda standing: standing.place)[:4]
+    assert ranking.top(0) == []
+    assert len(ranking.top(10)) == 5
+
+def test_ranking_rejects_mismatched_fields():
+    with pytest.raises(ValueError):
+        Ranking(["A", "B"], [1])
+    with pytest.raises(ValueError):
+        Ranking(["A", "A"], [1, 2])
+
+def test_game_rank_matches_determine_winner():
+    names = [f"Player {seat}" for seat in range(500)]
+    for evaluator in (HandEvaluator(), CachedEvaluator()):
+        game = Game(names, rng=random.Random(3), decks=60, sink=NullSink(), evaluator=evaluator)
+        game.deal(5)
+        ranking = game.rank()
+        scores = game.score_hands()
+
+        assert ranking.strengths == [scores[name] for name in names]
+        assert game.determine_winner()[0] == ranking.winners[0]
+        assert ranking.top(1)[0].hand_type == game.determine_winner()[1]
+
+def test_game_rank_keeps_tied_winners():
+    game = Game(["Alice", "Bob", "Charlie"], sink=NullSink())
+    game.players["Alice"].hand = [Card("♣", "7"), Card("♦", "5")]
+    game.players["Bob"].hand = [Card("♥", "7"), Card("♠", "5")]
+    game.players["Charlie"].hand = [Card("♥", "4"), Card("♠", "2")]
+
+    ranking = game.rank()
+    assert ranking.winners == ("Alice", "Bob")
+    assert [standing.place for standing in ranking.standings()] == [1, 1, 3]
+
+def test_evaluate_codes_matches_evaluate_code():
+    evaluator = HandEvaluator()
+    rng = random.Random(4)
+    deck = [Card.from_id(card_id) for card_id in range(54)]
+    hands = [rng.sample(deck, 5) for _ in range(2000)] + [rng.sample(deck, 3), rng.sample(deck, 7)]
+    codes = [sum(CARD_CODES[card.id] for card in hand) for hand in hands]
+
+    assert evaluator.evaluate_codes(codes[:2000], hands[:2000]) == list(map(evaluator.evaluate, hands[:2000]))
+    assert evaluator.evaluate_codes(codes, hands) == list(map(evaluator.evaluate, hands))
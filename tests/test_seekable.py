@@ -0,0 +1,45 @@
+import itertools
+from collections import Counter
+
+import pytest
+
+from models.deck import CompactDeck, Deck
+from models.seekable import SeekableRandom, unrank_permutation
+
+def test_unranking_covers_every_permutation():
+    seen = set()
+    for rank in range(24):
+        items = list("abcd")
+        unrank_permutation(rank, items)
+        seen.add(tuple(items))
+    assert seen == set(itertools.permutations("abcd"))
+
+def test_games_are_independent_of_order():
+    decks = {}
+    for game in (7, 3, 5_000_000, 3):
+        deck = Deck(rng=SeekableRandom(42, game))
+        deck.shuffle()
+        decks.setdefault(game, deck.cards)
+        assert decks[game] == deck.cards
+    assert decks[3] != decks[7] != decks[5_000_000]
+    compact = CompactDeck(rng=SeekableRandom(42, 7))
+    compact.shuffle()
+    assert compact.cards == decks[7]
+
+def test_shuffles_are_uniform():
+    counts = Counter()
+    for game in range(6000):
+        items = [0, 1, 2]
+        SeekableRandom(1, game).shuffle(items)
+        counts[tuple(items)] += 1
+    assert len(counts) == 6 and all(800 < count < 1200 for count in counts.values())
+
+def test_random_api_and_state():
+    rng = SeekableRandom(9, 1)
+    state = rng.getstate()
+    values = [rng.random(), rng.randrange(52), rng.getrandbits(700)]
+    assert 0 <= values[0] < 1 and values[2] < 1 << 700
+    rng.setstate(state)
+    assert [rng.random(), rng.randrange(52), rng.getrandbits(700)] == values
+    with pytest.raises(ValueError):
+        SeekableRandom(-1)
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import random
+import struct
+
+import pytest
+
+from models.events import NullSink
+from models.game import Game
+from models import server as server_module
+from models.server import CREATE_TABLE, GameClient, GameServer, ServerError, run_load
+
+NAMES = ["Alice", "Bob", "Carol", "Dave"]
+
+def _local_game(seed, cards):
+    game = Game(NAMES, rng=random.Random(seed), sink=NullSink())
+    game.reset()
+    game.deal(cards or None)
+    return game
+
+async def _with_server(test, workers=0):
+    server = GameServer(workers=workers)
+    await server.start(port=0)
+    client = await GameClient.connect(*server.address)
+    try:
+        return await test(server, client)
+    finally:
+        await client.close()
+        await server.close()
+
+def test_tables_play_like_local_games():
+    async def test(server, client):
+        table = await client.create_table(NAMES, seed=5)
+        await client.deal(table, 5)
+        assert await client.winner(table) == _local_game(5, 5).determine_winner()
+        await client.deal(table, 0)
+        local = _local_game(5, 5)
+        local.reset()
+        local.deal()
+        for _ in range(3):
+            local.play_round()
+            assert await client.play_round(table) == local.round_winner
+        await client.remove_player(table, "Bob")
+        local.remove_player("Bob")
+        local.play_round()
+        assert await client.play_round(table) == local.round_winner
+        await client.close_table(table)
+        assert not server.tables
+    asyncio.run(_with_server(test))
+
+def test_pipelined_requests_keep_their_order():
+    async def test(server, client):
+        tables = await asyncio.gather(*(client.create_table(NAMES, seed=seed) for seed in range(50)))
+        assert len(set(tables)) == 50
+        results = await asyncio.gather(*(request for table in tables
+                                         for request in (client.deal(table, 5), client.winner(table))))
+        assert results[1::2] == [_local_game(seed, 5).determine_winner() for seed in range(50)]
+        assert server.requests == 150
+    asyncio.run(_with_server(test))
+
+def test_errors_are_reported_per_request():
+    async def test(server, client):
+        with pytest.raises(ServerError, match="no table"):
+            await client.deal(99, 5)
+        table = await client.create_table(NAMES)
+        with pytest.raises(ServerError, match="no cards"):
+            await client.winner(table)
+        with pytest.raises(ServerError, match="not enough cards"):
+            await client.deal(table, 14)
+        with pytest.raises(ServerError, match="no player"):
+            await client.remove_player(table, "Zed")
+        await client.deal(table, 1)
+        await client.play_round(table)
+        with pytest.raises(ServerError, match="needs a card"):
+            await client.play_round(table)
+        # The connection survives every error
+        await client.deal(table, 5)
+        assert (await client.winner(table))[0] in NAMES
+    asyncio.run(_with_server(test))
+
+def test_truncated_requests_get_an_error_response():
+    async def test(server, client):
+        seed_and_jokers = struct.pack("!QB", 1, 0)
+        with pytest.raises(ServerError, match="truncated"):
+            await client.request(CREATE_TABLE, seed_and_jokers)
+        with pytest.raises(ServerError, match="truncated"):
+            await client.request(CREATE_TABLE, seed_and_jokers + bytes((2, 5)) + b"Alice")
+        with pytest.raises(ServerError, match="truncated"):
+            await client.request(CREATE_TABLE, seed_and_jokers + bytes((1, 9)) + b"Bob")
+        assert await client.create_table(NAMES) == 1
+    asyncio.run(_with_server(test))
+
+def _crash(hands):
+    os._exit(1)
+
+def test_a_broken_worker_pool_is_answered_and_replaced(monkeypatch):
+    async def test(server, client):
+        table = await client.create_table(NAMES, seed=3)
+        await client.deal(table, 0)
+        monkeypatch.setattr(server_module, "_best_seat", _crash)
+        with pytest.raises(ServerError, match="worker pool failed"):
+            await asyncio.wait_for(client.winner(table), 30)
+        monkeypatch.undo()
+        assert await asyncio.wait_for(client.winner(table), 30) == _local_game(3, 0).determine_winner()
+    asyncio.run(_with_server(test, workers=1))
+
+def test_large_hands_are_scored_on_the_worker_pool():
+    async def test(server, client):
+        table = await client.create_table(NAMES, seed=3)
+        _, winner, _ = await asyncio.gather(client.deal(table, 0), client.winner(table), client.deal(table, 2))
+        assert winner == _local_game(3, 0).determine_winner()
+        assert server._pool is not None
+    asyncio.run(_with_server(test, workers=1))
+
+def test_unix_socket_load_generator(tmp_path):
+    async def test():
+        server = GameServer(workers=0)
+        path = str(tmp_path / "games.sock")
+        await server.start_unix(path)
+        try:
+            report = await run_load(lambda: GameClient.connect_unix(path), connections=2, depth=4, requests=400,
+                                    tables_per_connection=3)
+        finally:
+            await server.close()
+        assert report["requests"] == 400
+        assert 0 < report["p50_ms"] <= report["p99_ms"] <= report["max_ms"]
+        assert report["requests_per_second"] > 0
+    asyncio.run(test())
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from models.simulate import main, make_sink, run_simulation
+
+def test_results_do_not_depend_on_worker_count():
+    single = run_simulation(300, player_count=3, seed=4, workers=1, shard_size=100)
+    pooled = run_simulation(300, player_count=3, seed=4, workers=2, shard_size=100)
+    assert (single.wins, single.hand_types) == (pooled.wins, pooled.hand_types)
+    assert single.games == 300 and sum(single.wins.values()) == 300
+    assert sum(single.hand_types.values()) == 300
+    assert list(single.phases) == ["reset", "deal", "winner"] and all(single.phases.values())
+
+def test_play_mode_counts_rounds():
+    stats = run_simulation(20, mode="play", player_count=4, seed=1)
+    assert stats.games == 20 and sum(stats.wins.values()) == 20 * 13
+    assert list(stats.phases) == ["reset", "deal", "play"]
+    assert not stats.hand_types
+
+def test_invalid_runs_are_rejected():
+    with pytest.raises(ValueError, match="mode"):
+        run_simulation(10, mode="poker")
+    with pytest.raises(ValueError, match="cannot give"):
+        run_simulation(10, mode="play", player_count=5)
+    with pytest.raises(ValueError, match="unknown sink"):
+        make_sink("jsonl:")
+
+def test_command_line_rejects_no_games_and_empty_shards():
+    with pytest.raises(SystemExit):
+        main(["--games", "0"])
+    with pytest.raises(SystemExit):
+        main(["--games", "10", "--shard-size", "0"])
+
+def test_empty_and_negative_hands_are_rejected():
+    for cards in (0, -1):
+        with pytest.raises(ValueError, match="at least one card"):
+            run_simulation(10, player_count=2, cards_per_hand=cards)
+        with pytest.raises(SystemExit):
+            main(["--games", "10", "--cards", str(cards)])
+
+def test_command_line_reports_throughput(tmp_path, capsys):
+    events = tmp_path / "events.jsonl"
+    assert main(["--games", "5", "--players", "2", "--cards", "3", "--sink", f"jsonl:{events}"]) == 0
+    out = capsys.readouterr().out
+    assert "5 deal games in" in out and "games/sec" in out and "us/game" in out
+    lines = [json.loads(line) for line in events.read_text(encoding="utf-8").splitlines()]
+    assert sum(line["event"] == "winner" for line in lines) == 5
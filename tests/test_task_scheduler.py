@@ -0,0 +1,105 @@
+import asyncio
+import time
+
+import pytest
+
+from models.task_scheduler import TaskScheduler
+
+
+def test_tasks_run_in_due_order_concurrently():
+    scheduler = TaskScheduler()
+    order = []
+    for name, delay in [("c", 0.06), ("a", 0.02), ("b", 0.04)]:
+        scheduler.add(name, delay, lambda name=name: order.append(name))
+    start = time.perf_counter()
+    scheduler.execute()
+    assert order == ["a", "b", "c"]
+    assert time.perf_counter() - start < 0.11  # The longest delay, not the sum
+    assert scheduler.stats.executed == 3
+
+def test_coroutines_and_cancellation():
+    scheduler = TaskScheduler()
+    done = []
+
+    async def job(name):
+        await asyncio.sleep(0.01)
+        done.append(name)
+
+    scheduler.add("function", 0.0, lambda: job("function"))
+    scheduler.add("coroutine", 0.01, job("coroutine"))
+    dropped = scheduler.add("dropped", 0.02, job("dropped"))
+    scheduler.cancel(dropped)
+    scheduler.execute()
+    assert sorted(done) == ["coroutine", "function"]
+    assert scheduler.stats.cancelled == 1
+
+def test_recurring_task_stops_when_cancelled():
+    scheduler = TaskScheduler()
+    ticks = []
+    ticker = scheduler.add("tick", 0.0, lambda: ticks.append(1), interval=0.01)
+    scheduler.add("stop", 0.045, ticker.cancel)
+    scheduler.execute()
+    assert len(ticks) == 5
+    assert ticker.runs == 5
+
+def test_concurrency_limit():
+    scheduler = TaskScheduler(max_concurrency=2)
+    active = [0]
+    peak = [0]
+
+    async def job():
+        active[0] += 1
+        peak[0] = max(peak[0], active[0])
+        await asyncio.sleep(0.01)
+        active[0] -= 1
+
+    for _ in range(6):
+        scheduler.add("job", 0.0, job)
+    scheduler.execute()
+    assert peak[0] == 2
+    assert scheduler.stats.executed == 6
+
+def test_failures_are_counted():
+    scheduler = TaskScheduler()
+    scheduler.add("boom", 0.0, lambda: 1 / 0)
+    scheduler.add("fine", 0.0, lambda: None)
+    scheduler.execute()
+    assert (scheduler.stats.executed, scheduler.stats.failed) == (1, 1)
+
+def test_invalid_arguments():
+    scheduler = TaskScheduler()
+    with pytest.raises(ValueError):
+        scheduler.add("late", -1)
+    with pytest.raises(ValueError):
+        scheduler.add("never", 0, interval=0)
+def test_cancelling_a_queued_coroutine():
+    scheduler = TaskScheduler(max_concurrency=1)
+    ran = []
+
+    async def queued():
+        ran.append("queued")
+
+    async def first():
+        scheduler.cancel(waiting)
+        await asyncio.sleep(0.02)
+        ran.append("first")
+
+    scheduler.add("first", 0.0, first())
+    waiting = scheduler.add("queued", 0.0, queued())
+    scheduler.execute()
+    assert ran == ["first"]
+    assert scheduler.stats.cancelled == 1 and scheduler.stats.failed == 0 and scheduler.stats.executed == 1
+
+def test_waiting_for_a_slot_does_not_delay_other_tasks():
+    scheduler = TaskScheduler(max_concurrency=1)
+    lags = []
+
+    async def slow():
+        await asyncio.sleep(0.15)
+
+    scheduler.add("slow", 0.0, slow())
+    scheduler.add("queued", 0.01, slow())
+    scheduler.add("plain", 0.05, lambda: lags.append(scheduler.now() - 0.05))
+    scheduler.execute()
+    assert lags and lags[0] < 0.04
+    assert scheduler.stats.executed == 3
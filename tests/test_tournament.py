@@ -0,0 +1,65 @@
+import pytest
+
+from models.events import NullSink
+from models.game import Game
+from models.tournament import TournamentStats, main, play_shard, run_tournament, seeded_game, shard_rng, \
+    split_shards
+
+def test_results_do_not_depend_on_worker_count():
+    single = run_tournament(600, player_count=3, seed=11, workers=1, shard_size=100)
+    pooled = run_tournament(600, player_count=3, seed=11, workers=2, shard_size=100)
+    assert single == pooled
+    assert single.games == 600 and sum(single.wins) == 600
+    assert sum(single.hand_types.values()) == 600 * 3
+
+def test_shards_use_independent_streams():
+    assert play_shard(1, 0, 200, 4, 5) != play_shard(1, 1, 200, 4, 5)
+    assert play_shard(1, 0, 200, 4, 5) == play_shard(1, 0, 200, 4, 5)
+
+def test_merge_adds_counts():
+    stats = TournamentStats(2)
+    stats.merge(play_shard(5, 0, 50, 2, 5))
+    stats.merge(play_shard(5, 1, 50, 2, 5))
+    assert stats.games == 100 and sum(stats.wins) == 100
+
+def test_seekable_runs_do_not_depend_on_shard_size():
+    small = run_tournament(300, player_count=3, seed=4, workers=1, shard_size=50, seekable=True)
+    large = run_tournament(300, player_count=3, seed=4, workers=1, shard_size=300, seekable=True)
+    assert small == large
+    # Game 250 alone accounts for the difference between 251 and 250 games
+    before = run_tournament(250, player_count=3, seed=4, workers=1, seekable=True)
+    after = run_tournament(251, player_count=3, seed=4, workers=1, seekable=True)
+    strengths = list(seeded_game(4, 250, 3, 5).score_hands().values())
+    after.wins[strengths.index(max(strengths))] -= 1
+    assert after.wins == before.wins
+
+def test_pooled_shard_matches_fresh_games():
+    rng = shard_rng(3, 0)
+    wins = [0, 0, 0]
+    for _ in range(100):
+        game = Game(["Player 1", "Player 2", "Player 3"], rng=rng, sink=NullSink())
+        game.deal(5)
+        strengths = list(game.score_hands().values())
+        wins[strengths.index(max(strengths))] += 1
+    assert play_shard(3, 0, 100, 3, 5).wins == wins
+
+def test_main_rejects_no_games():
+    with pytest.raises(SystemExit):
+        main(["--games", "0"])
+
+def test_main_rejects_empty_shards_and_tables():
+    with pytest.raises(SystemExit):
+        main(["--games", "10", "--shard-size", "0"])
+    with pytest.raises(SystemExit):
+        main(["--games", "10", "--players", "0"])
+    for cards in ("0", "-1"):
+        with pytest.raises(SystemExit):
+            main(["--games", "10", "--cards", cards])
+    with pytest.raises(SystemExit):
+        main(["--games", "10", "--workers", "0"])
+    with pytest.raises(ValueError, match="at least one card"):
+        run_tournament(10, cards_per_hand=0)
+
+def test_split_shards():
+    assert split_shards(25, 10) == [(0, 0, 10), (1, 10, 10), (2, 20, 5)]
+    assert split_shards(0, 10) == []
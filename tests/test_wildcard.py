@@ -0,0 +1,57 @@
+import random
+
+from models.card import Card, STANDARD_CARDS, JOKERS
+from models.evaluator import HandEvaluator, describe
+from models.events import NullSink
+from models.game import Game
+from models.wildcard import WildcardEvaluator, brute_force_evaluate, verify
+
+evaluator = WildcardEvaluator(use_disk_cache=False)
+
+def test_tables_match_brute_force_on_every_small_hand():
+    assert verify(1, evaluator) == 1
+    assert verify(2, evaluator) == 53
+    assert verify(3, evaluator) == 1378
+
+def test_tables_match_brute_force_on_sampled_hands():
+    rng = random.Random(20)
+    for size in (4, 5):
+        for _ in range(150):
+            jokers = rng.randrange(1, 3)
+            hand = rng.sample(STANDARD_CARDS, size - jokers) + list(JOKERS[:jokers])
+            rng.shuffle(hand)
+            assert evaluator.evaluate(hand) == brute_force_evaluate(hand), hand
+            # One suit, to reach the flush and straight flush classes
+            suit = rng.randrange(4)
+            hand = rng.sample(STANDARD_CARDS[suit * 13:suit * 13 + 13], size - jokers) + list(JOKERS[:jokers])
+            assert evaluator.evaluate(hand) == brute_force_evaluate(hand), hand
+
+def test_hands_without_jokers_score_as_before():
+    rng = random.Random(21)
+    plain = HandEvaluator(use_disk_cache=False)
+    for size in (2, 5, 7):
+        for _ in range(300):
+            hand = rng.sample(STANDARD_CARDS, size)
+            assert evaluator.evaluate(hand) == plain.evaluate(hand), hand
+
+def test_jokers_make_the_best_hand():
+    nines = [Card(suit, "9") for suit in Card.suits[:3]]
+    assert describe(evaluator.evaluate(nines + list(JOKERS))) == ("Wildcard Hand", [9])
+    assert describe(evaluator.evaluate(nines + [Card("♣", "2"), JOKERS[0]])) == ("Four of a Kind", [9, 2])
+    spades = [Card("♠", rank) for rank in ["9", "J", "Q", "K"]]
+    assert describe(evaluator.evaluate(spades + [JOKERS[0]])) == ("Straight Flush", [9, 10, 11, 12, 13])
+    mixed = [Card("♠", "4"), Card("♦", "8"), Card("♥", "8"), Card("♣", "K")]
+    assert describe(evaluator.evaluate(mixed + [JOKERS[1]])) == ("Three of a Kind", [8, 13, 4])
+
+def test_games_with_jokers_produce_wildcard_hands():
+    game = Game(["Alice", "Bob"], include_joker=True, rng=random.Random(0), sink=NullSink(), evaluator=evaluator)
+    for player, hand in zip(game.players.values(), ([Card(suit, "A") for suit in Card.suits[:4]] + [JOKERS[0]],
+                                                    [Card("♥", rank) for rank in ["10", "J", "Q", "K", "A"]])):
+        player.take(hand)
+    assert game.determine_winner() == ("Alice", "Wildcard Hand")
+    assert game.evaluate_hand(game.players["Bob"].hand[:4] + [JOKERS[1]]) == ("Straight Flush", [10, 11, 12, 13, 14])
+
+def test_evaluate_best_scores_subsets_with_jokers():
+    hand = [Card("♠", rank) for rank in ["2", "5", "9", "J", "K"]] + [Card("♦", "9"), JOKERS[0]]
+    assert evaluator.evaluate_best(hand) == evaluator.naive_best(hand)
+    assert describe(evaluator.evaluate_best(hand)) == ("Flush", [14, 13, 11, 9, 5])